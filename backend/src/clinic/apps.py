@@ -1,4 +1,6 @@
 from django.apps import AppConfig
+from django.db import models
+from django.db.models.signals import post_delete, post_save, pre_migrate
 
 
 class ClinicConfig(AppConfig):
@@ -13,3 +15,56 @@ class ClinicConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "clinic"
+
+    def ready(self):
+        from clinic.auth.tokens import (
+            clear_token_state,
+            revoke_tokens_on_logout,
+        )
+        from clinic.dictionaries.cache import (
+            DICTIONARY_MODELS,
+            bump_dictionary_version,
+        )
+        from clinic.lookups import ILike
+        from clinic.roles.search import (
+            PROFILE_MODELS,
+            delete_profile_search_document,
+            update_address_search_documents,
+            update_profile_search_document,
+            update_user_search_document,
+        )
+
+        models.CharField.register_lookup(ILike)
+        models.TextField.register_lookup(ILike)
+        pre_migrate.connect(create_sequences_before_migrate, sender=self)
+        post_save.connect(revoke_tokens_on_logout, sender="clinic.User")
+        post_save.connect(clear_token_state, sender="clinic.User")
+        post_delete.connect(clear_token_state, sender="clinic.User")
+        post_save.connect(update_user_search_document, sender="clinic.User")
+        post_save.connect(
+            update_address_search_documents, sender="clinic.Address"
+        )
+        for profile_model in PROFILE_MODELS.values():
+            post_save.connect(
+                update_profile_search_document, sender=profile_model
+            )
+            post_delete.connect(
+                delete_profile_search_document, sender=profile_model
+            )
+        for dictionary_model in DICTIONARY_MODELS:
+            post_save.connect(bump_dictionary_version, sender=dictionary_model)
+            post_delete.connect(
+                bump_dictionary_version, sender=dictionary_model
+            )
+
+
+def create_sequences_before_migrate(sender, using, **kwargs):
+    """
+    Utworzenie sekwencji pól `AutoIncrementField` przed wykonaniem migracji.
+
+    Migracje tworzące nowe modele ustawiają `nextval(...)` jako domyślną wartość
+    kolumny, więc sekwencja musi istnieć wcześniej.
+    """
+    from clinic.fields import create_auto_increment_sequences
+
+    create_auto_increment_sequences(sender.get_models(), using=using)
@@ -0,0 +1,137 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+from clinic.auth.tokens import (
+    PROFILE_CLAIM,
+    ROLE_CLAIM,
+    get_token_state_cache_key,
+    is_token_revoked,
+)
+
+# Pola użytkownika sprawdzane przy każdym uwierzytelnieniu
+TOKEN_STATE_FIELDS = ("is_active", "role", "token_version")
+
+
+class VerifiedTokenCache:
+    """
+    Niewielka pamięć podręczna LRU zweryfikowanych tokenów dostępu.
+
+    Kluczem jest surowy token, a wpis usuwany jest najpóźniej po wygaśnięciu
+    tokena. Pamięć jest lokalna dla procesu i bezpieczna wątkowo.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.lock = threading.Lock()
+        self.tokens = OrderedDict()
+
+    def get(self, raw_token):
+        with self.lock:
+            token = self.tokens.get(raw_token)
+            if token is None:
+                return None
+
+            if token["exp"] <= time.time():
+                del self.tokens[raw_token]
+                return None
+
+            self.tokens.move_to_end(raw_token)
+            return token
+
+    def set(self, raw_token, token):
+        with self.lock:
+            self.tokens[raw_token] = token
+            self.tokens.move_to_end(raw_token)
+            while len(self.tokens) > self.maxsize:
+                self.tokens.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.tokens.clear()
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    Uwierzytelnianie JWT oparte na podpisanych oświadczeniach tokena.
+
+    Identyfikator profilu odczytywany jest z tokena (`ClinicRefreshToken`),
+    a pola potrzebne do sprawdzenia, czy token jest nadal ważny (`is_active`,
+    `role`, `token_version`), zapamiętywane są w pamięci podręcznej Django
+    na `TOKEN_STATE_CACHE_TIMEOUT` sekund. Baza danych odpytywana jest tylko
+    po wygaśnięciu wpisu. Pozostałe pola użytkownika są odroczone i wczytywane
+    jednym zapytaniem dopiero przy pierwszym odwołaniu.
+
+    Odrzucane są tokeny usuniętych i nieaktywnych użytkowników, tokeny
+    unieważnione przy wylogowaniu (`revoke_user_tokens`) oraz tokeny wydane
+    przed zmianą roli. Stan ten przechowywany jest w bazie danych, a zapis
+    użytkownika usuwa zapamiętany wpis. Procesy korzystające z innej pamięci
+    podręcznej widzą zmianę najpóźniej po `TOKEN_STATE_CACHE_TIMEOUT` sekundach.
+    Zweryfikowane podpisy tokenów przechowywane są w pamięci LRU. Tokeny bez
+    oświadczeń roli obsługiwane są jak dotychczas, z pobraniem całego
+    użytkownika z bazy danych.
+    """
+
+    token_cache = VerifiedTokenCache()
+
+    def get_validated_token(self, raw_token):
+        token = self.token_cache.get(raw_token)
+        if token is None:
+            token = super().get_validated_token(raw_token)
+            self.token_cache.set(raw_token, token)
+        return token
+
+    def get_user(self, validated_token):
+        if ROLE_CLAIM not in validated_token:
+            user = super().get_user(validated_token)
+        else:
+            user = self.get_token_user(validated_token)
+
+        if is_token_revoked(validated_token, user):
+            raise AuthenticationFailed(
+                _("Token został unieważniony."), code="token_revoked"
+            )
+
+        if ROLE_CLAIM in validated_token:
+            profile_id = validated_token.get(PROFILE_CLAIM)
+            user.profile_id = uuid.UUID(profile_id) if profile_id else None
+        return user
+
+    def get_token_user(self, validated_token):
+        """
+        Zwraca użytkownika tokena z polami potrzebnymi do sprawdzenia ważności.
+
+        Pola odczytywane są z pamięci podręcznej, a przy jej braku z bazy
+        danych. Pozostałe pola są odroczone.
+        """
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+        cache_key = get_token_state_cache_key(user_id)
+        state = cache.get(cache_key)
+        if state is None:
+            try:
+                state = self.user_model.objects.values(
+                    api_settings.USER_ID_FIELD, *TOKEN_STATE_FIELDS
+                ).get(**{api_settings.USER_ID_FIELD: user_id})
+            except self.user_model.DoesNotExist:
+                raise AuthenticationFailed(
+                    _("Nie znaleziono użytkownika."), code="user_not_found"
+                )
+            cache.set(
+                cache_key, state, timeout=settings.TOKEN_STATE_CACHE_TIMEOUT
+            )
+
+        if not state["is_active"]:
+            raise AuthenticationFailed(
+                _("Konto użytkownika jest nieaktywne."), code="user_inactive"
+            )
+        return self.user_model.from_db(
+            self.user_model.objects.db, list(state), list(state.values())
+        )
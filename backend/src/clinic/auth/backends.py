@@ -17,7 +17,7 @@ class EmailBackend(ModelBackend):
         user_model = get_user_model()
         try:
             # Próba pobrania użytkownika po polu e-mail w modelu użytkownika.
-            user = user_model.objects.get(email=username)
+            user = user_model.objects.get_by_natural_key(username)
         except user_model.DoesNotExist:
             # Jeśli użytkownik nie istnieje, zwracamy None.
             return None
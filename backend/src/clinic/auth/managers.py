@@ -1,10 +1,33 @@
 from django.contrib.auth.models import BaseUserManager
+from django.db.models.functions import Lower
+from django.db.models.lookups import Exact
 from django.utils.translation import gettext_lazy as _
 
 from clinic.auth.choices import Role
 
 
 class UserManager(BaseUserManager):
+    @classmethod
+    def normalize_email(cls, email):
+        """
+        Normalizacja adresu e-mail do małych liter (również części lokalnej).
+        """
+        return super().normalize_email(email).strip().lower()
+
+    def filter_by_email(self, email):
+        """
+        Wyszukiwanie użytkowników po adresie e-mail bez rozróżniania wielkości liter.
+
+        Warunek `LOWER(email) = ...` obsługiwany jest przez unikalny indeks
+        funkcyjny `clinic_user_email_lower_unique`.
+        """
+        return self.filter(
+            Exact(Lower("email"), self.normalize_email(email or ""))
+        )
+
+    def get_by_natural_key(self, username):
+        return self.filter_by_email(username).get()
+
     def _create_user(
         self, email, first_name, last_name, password, **extra_fields
     ):
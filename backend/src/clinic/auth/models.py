@@ -1,13 +1,17 @@
 import uuid
 
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.core.validators import MinLengthValidator
 from django.db import models
+from django.db.models.functions import Lower
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 
 from clinic.auth.choices import Role
 from clinic.auth.managers import UserManager
 from clinic.fields import AutoIncrementField
+from clinic.lookups import FullName
 from clinic.validators import FirstNameValidator, LastNameValidator
 
 
@@ -17,7 +21,6 @@ class User(AbstractBaseUser, PermissionsMixin):
     email = models.EmailField(
         _("email address"),
         max_length=255,
-        unique=True,
         validators=[MinLengthValidator(7)],
     )
     email_confirmed = models.BooleanField(_("email confirmed"), default=False)
@@ -45,6 +48,7 @@ class User(AbstractBaseUser, PermissionsMixin):
     role = models.CharField(
         _("role"), max_length=1, choices=Role.choices, default=Role.PATIENT
     )
+    token_version = models.PositiveIntegerField(_("token version"), default=0)
 
     objects = UserManager()
 
@@ -54,10 +58,65 @@ class User(AbstractBaseUser, PermissionsMixin):
     class Meta:
         verbose_name = _("user")
         verbose_name_plural = _("users")
+        constraints = (
+            models.UniqueConstraint(
+                Lower("email"), name="clinic_user_email_lower_unique"
+            ),
+        )
+        indexes = (
+            GinIndex(
+                fields=("first_name",),
+                opclasses=("gin_trgm_ops",),
+                name="clinic_user_first_name_trgm",
+            ),
+            GinIndex(
+                fields=("last_name",),
+                opclasses=("gin_trgm_ops",),
+                name="clinic_user_last_name_trgm",
+            ),
+            GinIndex(
+                fields=("email",),
+                opclasses=("gin_trgm_ops",),
+                name="clinic_user_email_trgm",
+            ),
+            GinIndex(
+                OpClass(FullName(), name="gin_trgm_ops"),
+                name="clinic_user_full_name_trgm",
+            ),
+        )
 
     @property
     def full_name(self):
         return f"{self.first_name} {self.last_name}"
 
+    @cached_property
+    def profile_id(self):
+        """
+        Identyfikator profilu roli użytkownika (pacjenta, lekarza lub pielęgniarki).
+
+        Dla administratora zwracany jest identyfikator użytkownika. Wartość może
+        zostać ustawiona z góry (np. na podstawie oświadczeń tokena JWT),
+        co pozwala uniknąć zapytania o profil.
+        """
+        if self.role == Role.PATIENT and hasattr(self, "patient"):
+            return self.patient.id
+        elif self.role == Role.DOCTOR and hasattr(self, "doctor"):
+            return self.doctor.id
+        elif self.role == Role.NURSE and hasattr(self, "nurse"):
+            return self.nurse.id
+        elif self.role == Role.ADMIN:
+            return self.id
+        return None
+
+    def refresh_from_db(self, using=None, fields=None):
+        # Odwołanie do jednego z odroczonych pól (np. użytkownika odtworzonego
+        # z tokena JWT) wczytuje od razu wszystkie odroczone pola
+        if fields is not None:
+            fields = set(fields)
+            deferred_fields = self.get_deferred_fields()
+            if fields.intersection(deferred_fields):
+                fields = fields.union(deferred_fields)
+        super().refresh_from_db(using, fields)
+
     def __str__(self):
         return f"{self.full_name} ({self.email})"
@@ -0,0 +1,48 @@
+import uuid
+from dataclasses import dataclass
+from typing import Optional
+
+from clinic.auth.choices import Role
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    Tożsamość wywołującego: użytkownik, jego rola i identyfikator profilu roli.
+
+    Wyznaczana raz na żądanie (zob. `PrincipalMixin`) i przekazywana do funkcji
+    budujących zbiory danych zależne od roli, które filtrują bezpośrednio
+    po kluczach obcych (`doctor_id`, `patient_id`) bez złączenia z tabelą
+    użytkowników.
+    """
+
+    user_id: uuid.UUID
+    role: str
+    profile_id: Optional[uuid.UUID] = None
+
+    @classmethod
+    def from_user(cls, user):
+        """
+        Tworzy principal na podstawie (uwierzytelnionego) użytkownika.
+
+        Dla użytkownika odtworzonego z tokena JWT identyfikator profilu
+        pochodzi z oświadczeń tokena, więc nie jest wykonywane żadne zapytanie.
+        """
+        if not user.is_authenticated:
+            return cls(user_id=None, role=None)
+        return cls(user_id=user.pk, role=user.role, profile_id=user.profile_id)
+
+    def get_profile_id(self, role) -> Optional[uuid.UUID]:
+        return self.profile_id if self.role == role else None
+
+    @property
+    def doctor_id(self) -> Optional[uuid.UUID]:
+        return self.get_profile_id(Role.DOCTOR)
+
+    @property
+    def nurse_id(self) -> Optional[uuid.UUID]:
+        return self.get_profile_id(Role.NURSE)
+
+    @property
+    def patient_id(self) -> Optional[uuid.UUID]:
+        return self.get_profile_id(Role.PATIENT)
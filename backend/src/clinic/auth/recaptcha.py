@@ -1,23 +1,139 @@
+import logging
+import threading
+import time
+from functools import lru_cache
+
 import requests
+from django.conf import settings
+from django.utils.module_loading import import_string
+from requests.adapters import HTTPAdapter
 
-from core import settings
+logger = logging.getLogger(__name__)
 
 
-def verify_recaptcha(response):
+class CircuitBreaker:
     """
-    Weryfikuje odpowiedź reCAPTCHA przy użyciu usługi reCAPTCHA.
+    Prosty wyłącznik obwodu chroniący przed odpytywaniem niedostępnej usługi.
+
+    Po `failure_threshold` kolejnych błędach obwód zostaje otwarty i przez
+    `reset_timeout` sekund żądania nie są wykonywane. Po tym czasie przepuszczana
+    jest jedna próba – jej powodzenie zamyka obwód, a błąd otwiera go ponownie.
+    Stan jest lokalny dla procesu i bezpieczny wątkowo.
     """
-    # Przygotowanie danych do żądania weryfikacyjnego
-    data = {
-        "secret": settings.RECAPTCHA_SECRET_KEY,  # Klucz tajny do weryfikacji po stronie serwera
-        "response": response,  # Token odpowiedzi z widżetu reCAPTCHA po stronie klienta
-    }
 
-    # Wykonanie żądania POST do usługi weryfikacji reCAPTCHA z danymi
-    response = requests.post(settings.RECAPTCHA_VERIFY_URL, data=data)
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.lock = threading.Lock()
+        self.failures = 0
+        self.opened_at = None
+
+    def allow(self) -> bool:
+        with self.lock:
+            if self.opened_at is None:
+                return True
+
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+
+            # Próba kontrolna – kolejne żądania czekają na jej wynik.
+            self.opened_at = time.monotonic()
+            return True
+
+    def record_success(self) -> None:
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self) -> None:
+        with self.lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+class GoogleRecaptchaVerifier:
+    """
+    Weryfikacja odpowiedzi reCAPTCHA w usłudze Google.
+
+    Żądania wysyłane są przez trwałą sesję HTTP (pula połączeń) z limitem czasu
+    połączenia i odczytu. Tokeny reCAPTCHA są jednorazowe, więc każdy z nich
+    weryfikowany jest w usłudze Google – wyniki nie są zapamiętywane, aby jedno
+    rozwiązanie nie mogło zostać użyte ponownie. Gdy usługa nie odpowiada,
+    wyłącznik obwodu wstrzymuje zapytania, a wynik weryfikacji zależy
+    od `RECAPTCHA_FAIL_OPEN`.
+    """
+
+    def __init__(
+        self,
+        verify_url=None,
+        secret_key=None,
+        timeout=None,
+        fail_open=None,
+        breaker=None,
+    ):
+        self.verify_url = verify_url or settings.RECAPTCHA_VERIFY_URL
+        self.secret_key = secret_key or settings.RECAPTCHA_SECRET_KEY
+        self.timeout = timeout or settings.RECAPTCHA_TIMEOUT
+        self.fail_open = (
+            settings.RECAPTCHA_FAIL_OPEN if fail_open is None else fail_open
+        )
+        self.breaker = breaker or CircuitBreaker(
+            failure_threshold=settings.RECAPTCHA_FAILURE_THRESHOLD,
+            reset_timeout=settings.RECAPTCHA_RESET_TIMEOUT,
+        )
+
+        self.session = requests.Session()
+        self.session.mount(
+            "https://", HTTPAdapter(pool_maxsize=10, max_retries=0)
+        )
+
+    def verify(self, token) -> bool:
+        if not token:
+            return False
+
+        if not self.breaker.allow():
+            return self.fail_open
 
-    # Przetworzenie odpowiedzi JSON zwróconą przez usługę reCAPTCHA
-    result = response.json()
+        try:
+            response = self.session.post(
+                self.verify_url,
+                data={"secret": self.secret_key, "response": token},
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            result = response.json()
+        except (requests.RequestException, ValueError) as e:
+            self.breaker.record_failure()
+            logger.warning(f"reCAPTCHA verification unavailable: {str(e)}")
+            return self.fail_open
 
-    # Zwrócenie  wartości 'success', która informuje, czy wyzwanie reCAPTCHA zostało zaliczone
-    return result.get("success")
+        self.breaker.record_success()
+
+        return bool(result.get("success"))
+
+
+class StubRecaptchaVerifier:
+    """
+    Lokalna weryfikacja reCAPTCHA dla testów i środowisk bez dostępu do sieci.
+
+    Akceptuje każdą niepustą odpowiedź.
+    """
+
+    def verify(self, token) -> bool:
+        return bool(token)
+
+
+@lru_cache(maxsize=None)
+def get_verifier():
+    """
+    Zwraca współdzieloną instancję klasy wskazanej w `RECAPTCHA_VERIFIER`.
+    """
+    return import_string(settings.RECAPTCHA_VERIFIER)()
+
+
+def verify_recaptcha(response):
+    """
+    Weryfikuje odpowiedź reCAPTCHA przy użyciu skonfigurowanej usługi.
+    """
+    return get_verifier().verify(response)
@@ -8,12 +8,14 @@ from django.utils.http import urlsafe_base64_decode
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 from rest_framework.exceptions import PermissionDenied
-from rest_framework.validators import UniqueValidator
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework_simplejwt.tokens import RefreshToken
 
 from clinic.auth.choices import Role
 from clinic.auth.recaptcha import verify_recaptcha
+from clinic.auth.tokens import is_token_revoked
 from clinic.roles.models import Patient
 from clinic.serializers import AddressWriteSerializer
 from clinic.validators import PhoneNumberValidator, pesel_validator
@@ -36,34 +38,34 @@ class UserProfileSerializer(UserReadSerializer):
         read_only_fields = fields
 
     def get_profile_id(self, obj):
-        if obj.role == Role.PATIENT and hasattr(obj, "patient"):
-            return obj.patient.id
-        elif obj.role == Role.DOCTOR and hasattr(obj, "doctor"):
-            return obj.doctor.id
-        elif obj.role == Role.NURSE and hasattr(obj, "nurse"):
-            return obj.nurse.id
-        elif obj.role == Role.ADMIN:
-            return obj.id
-        return None
+        return obj.profile_id
 
 
 class UserWriteSerializer(serializers.ModelSerializer):
-    email = serializers.EmailField(
-        min_length=7,
-        max_length=255,
-        validators=[
-            UniqueValidator(
-                queryset=User.objects.all(),
-                message=_("Ten adres e-mail jest już używany."),
-                lookup="iexact",
-            )
-        ],
-    )
+    email = serializers.EmailField(min_length=7, max_length=255)
 
     class Meta:
         model = User
         fields = ("email", "first_name", "last_name")
 
+    def validate_email(self, value):
+        """
+        Normalizacja adresu e-mail i sprawdzenie jego unikalności.
+
+        Adres zapisywany jest małymi literami, a unikalność sprawdzana przez
+        indeks funkcyjny na `LOWER(email)`.
+        """
+        value = User.objects.normalize_email(value)
+        users = User.objects.filter_by_email(value)
+        if self.instance is not None:
+            users = users.exclude(pk=self.instance.pk)
+
+        if users.exists():
+            raise serializers.ValidationError(
+                _("Ten adres e-mail jest już używany."), code="unique"
+            )
+        return value
+
 
 class PasswordBaseSerializer(serializers.Serializer):
     password = serializers.CharField(
@@ -257,8 +259,16 @@ class UserLoginSerializer(serializers.Serializer):
     def validate(self, data):
         """
         Szprawdzenie adresu e-mail i hasła, weryfikacja próbę logowania użytkownika.
+
+        Użytkownik (wraz z profilem roli) pobierany jest jednym zapytaniem,
+        a hasło sprawdzane dokładnie raz. Zweryfikowany użytkownik zwracany
+        jest w polu `user`, więc widok nie musi ponownie go uwierzytelniać.
         """
-        user = User.objects.filter(email=data["email"]).first()
+        user = (
+            User.objects.filter_by_email(data["email"])
+            .select_related("patient", "doctor", "nurse")
+            .first()
+        )
 
         if not user or not user.check_password(data["password"]):
             raise serializers.ValidationError(
@@ -275,6 +285,7 @@ class UserLoginSerializer(serializers.Serializer):
                 {"non_field_errors": _("Użytkownik nie jest aktywny.")}
             )
 
+        data["user"] = user
         return data
 
 
@@ -323,6 +334,30 @@ class LogoutSerializer(serializers.Serializer):
         return data
 
 
+class RevocableTokenRefreshSerializer(TokenRefreshSerializer):
+    def validate(self, attrs):
+        """
+        Odrzucenie tokenu odświeżającego unieważnionego przy wylogowaniu,
+        wydanego przed zmianą roli lub należącego do nieaktywnego użytkownika.
+        """
+        try:
+            refresh = self.token_class(attrs["refresh"])
+        except TokenError as e:
+            raise InvalidToken(e.args[0])
+
+        user = (
+            User.objects.filter(
+                pk=refresh.get(api_settings.USER_ID_CLAIM), is_active=True
+            )
+            .only("role", "token_version")
+            .first()
+        )
+        if user is None or is_token_revoked(refresh, user):
+            raise InvalidToken(_("Token został unieważniony."))
+
+        return super().validate(attrs)
+
+
 class ForceLogoutSerializer(serializers.Serializer):
     email = serializers.EmailField(required=False)
     _user = None
@@ -339,7 +374,7 @@ class ForceLogoutSerializer(serializers.Serializer):
             )
 
         try:
-            self._user = User.objects.get(email=email)
+            self._user = User.objects.filter_by_email(email).get()
         except User.DoesNotExist:
             raise serializers.ValidationError(
                 {
@@ -362,7 +397,7 @@ class ResetPasswordSerializer(serializers.Serializer):
         """
         Sprawdzenie poprawności adresu e-mail i czy użytkownik potwierdził swój adres e-mail.
         """
-        user = User.objects.filter(email=data["email"]).first()
+        user = User.objects.filter_by_email(data["email"]).first()
 
         if not user:
             raise serializers.ValidationError(
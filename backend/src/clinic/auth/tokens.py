@@ -0,0 +1,82 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import F
+from rest_framework_simplejwt.tokens import RefreshToken
+
+ROLE_CLAIM = "role"
+PROFILE_CLAIM = "profile_id"
+TOKEN_VERSION_CLAIM = "token_version"
+TOKEN_STATE_CACHE_KEY = "clinic:auth:token-state:{user_id}"
+
+
+class ClinicRefreshToken(RefreshToken):
+    """
+    Token odświeżający zawierający rolę, identyfikator profilu użytkownika
+    i wersję jego tokenów.
+
+    Oświadczenia kopiowane są do tokenów dostępu (również tych wydawanych przy
+    odświeżaniu), dzięki czemu uwierzytelnianie żądań wymaga jedynie odczytu
+    kilku kolumn użytkownika, bez zapytania o profil.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token[ROLE_CLAIM] = user.role
+        token[TOKEN_VERSION_CLAIM] = user.token_version
+        token[PROFILE_CLAIM] = (
+            str(user.profile_id) if user.profile_id else None
+        )
+        return token
+
+
+def get_token_state_cache_key(user_id) -> str:
+    return TOKEN_STATE_CACHE_KEY.format(user_id=user_id)
+
+
+def revoke_user_tokens(user_id) -> None:
+    """
+    Unieważnia wszystkie wydane tokeny użytkownika.
+
+    Numer wersji tokenów przechowywany jest w bazie danych, a zapamiętany stan
+    użytkownika usuwany z pamięci podręcznej. Procesy korzystające z innej
+    pamięci podręcznej odrzucają tokeny najpóźniej po
+    `TOKEN_STATE_CACHE_TIMEOUT` sekundach.
+    """
+    get_user_model().objects.filter(pk=user_id).update(
+        token_version=F("token_version") + 1
+    )
+    cache.delete(get_token_state_cache_key(user_id))
+
+
+def clear_token_state(sender, instance, **kwargs):
+    """
+    Usunięcie zapamiętanego stanu tokenów po zapisie lub usunięciu użytkownika
+    (np. dezaktywacji konta lub zmianie roli).
+    """
+    cache.delete(get_token_state_cache_key(instance.pk))
+
+
+def is_token_revoked(token, user) -> bool:
+    """
+    Sprawdza, czy token nie odpowiada bieżącemu stanowi użytkownika.
+
+    Token jest nieważny, jeżeli wydano go przed unieważnieniem tokenów
+    użytkownika (inna wersja) lub rola użytkownika zmieniła się od jego wydania.
+    """
+    return token.get(TOKEN_VERSION_CLAIM, 0) != user.token_version or (
+        ROLE_CLAIM in token and token[ROLE_CLAIM] != user.role
+    )
+
+
+def revoke_tokens_on_logout(sender, instance, update_fields=None, **kwargs):
+    """
+    Unieważnienie tokenów użytkownika po wylogowaniu (`is_logged_in` = False).
+    """
+    if (
+        update_fields is not None
+        and "is_logged_in" in update_fields
+        and not instance.is_logged_in
+    ):
+        revoke_user_tokens(instance.pk)
+        instance.refresh_from_db(fields=("token_version",))
@@ -1,7 +1,6 @@
 from datetime import datetime, timezone
 
 from django.conf import settings
-from django.contrib.auth import authenticate
 from django.contrib.auth.tokens import default_token_generator
 from django.db import transaction
 from django.utils.encoding import force_bytes, force_str
@@ -12,9 +11,7 @@ from rest_framework import status
 from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
 
 from clinic.auth.models import User
 from clinic.auth.serializers import (
@@ -28,13 +25,15 @@ from clinic.auth.serializers import (
     UserProfileSerializer,
     UserRegisterSerializer,
 )
+from clinic.auth.tokens import ClinicRefreshToken
 from clinic.mixins import MailSendingMixin
+from clinic.throttling import RoleRateThrottle
 
 
 class RegisterView(MailSendingMixin, APIView):
     permission_classes = (AllowAny,)
     serializer_class = UserRegisterSerializer
-    throttle_classes = (AnonRateThrottle,)
+    throttle_classes = (RoleRateThrottle,)
 
     @extend_schema(
         request=UserRegisterSerializer,
@@ -44,7 +43,7 @@ class RegisterView(MailSendingMixin, APIView):
         """
         Obsługa żądania POST rejestracji użytkownika.
 
-        Weryfikacja danych użytkownika, tworzenie konta, wysyłanie e-maila weryfikacyjnego i zwrócenie odpowiedzi.
+        Weryfikacja danych użytkownika, tworzenie konta, dodanie e-maila weryfikacyjnego do kolejki wysyłki i zwrócenie odpowiedzi.
         """
         serializer = self.serializer_class(
             data=request.data, context={"request": request}
@@ -68,7 +67,7 @@ class RegisterView(MailSendingMixin, APIView):
                         ),
                         template_name="emails/email_verification.html",
                         context={
-                            "user": user,
+                            "user": {"first_name": user.first_name},
                             "verification_link": verification_link,
                         },
                         to_email=user.email,
@@ -126,7 +125,7 @@ class VerifyEmailView(APIView):
 class LoginView(APIView):
     permission_classes = (AllowAny,)
     serializer_class = UserLoginSerializer
-    throttle_classes = (AnonRateThrottle,)
+    throttle_classes = (RoleRateThrottle,)
 
     @extend_schema(
         request=UserLoginSerializer,
@@ -167,14 +166,14 @@ class LoginView(APIView):
         serializer = self.serializer_class(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        email = serializer.validated_data["email"]
-        password = serializer.validated_data["password"]
-        user = authenticate(username=email, password=password)
+        # Hasło zostało już sprawdzone podczas walidacji – ponowne wywołanie
+        # `authenticate()` oznaczałoby drugie, kosztowne haszowanie hasła.
+        user = serializer.validated_data["user"]
 
         user.is_logged_in = True
-        user.save()
+        user.save(update_fields=("is_logged_in",))
 
-        refresh = RefreshToken.for_user(user)
+        refresh = ClinicRefreshToken.for_user(user)
         user_serializer = UserProfileSerializer(user)
 
         response_data = {
@@ -191,7 +190,7 @@ class LoginView(APIView):
 class LogoutView(APIView):
     permission_classes = (IsAuthenticated,)
     serializer_class = LogoutSerializer
-    throttle_classes = (UserRateThrottle,)
+    throttle_classes = (RoleRateThrottle,)
 
     @extend_schema(
         request=LogoutSerializer,
@@ -253,7 +252,7 @@ class ForceLogoutView(APIView):
 class ResetPasswordView(MailSendingMixin, APIView):
     permission_classes = (AllowAny,)
     serializer_class = ResetPasswordSerializer
-    throttle_classes = (AnonRateThrottle,)
+    throttle_classes = (RoleRateThrottle,)
 
     @extend_schema(
         request=ResetPasswordSerializer,
@@ -277,15 +276,16 @@ class ResetPasswordView(MailSendingMixin, APIView):
             f"{settings.FRONTEND_URL}/reset-password/{uid}/{token}"
         )
 
-        self.send_email(
-            subject=_("[Your Health Time] Resetowanie hasła"),
-            template_name="emails/reset_password.html",
-            context={"reset_password_url": reset_password_url},
-            to_email=user.email,
-        )
+        with transaction.atomic():
+            self.send_email(
+                subject=_("[Your Health Time] Resetowanie hasła"),
+                template_name="emails/reset_password.html",
+                context={"reset_password_url": reset_password_url},
+                to_email=user.email,
+            )
 
-        user.password_reset_sent_at = datetime.now(timezone.utc)
-        user.save()
+            user.password_reset_sent_at = datetime.now(timezone.utc)
+            user.save()
 
         return Response(status=status.HTTP_200_OK)
 
@@ -293,7 +293,7 @@ class ResetPasswordView(MailSendingMixin, APIView):
 class ResetPasswordConfirmView(APIView):
     permission_classes = (AllowAny,)
     serializer_class = ResetPasswordConfirmSerializer
-    throttle_classes = (AnonRateThrottle,)
+    throttle_classes = (RoleRateThrottle,)
 
     @extend_schema(
         request=ResetPasswordConfirmSerializer,
@@ -342,7 +342,7 @@ class ResetPasswordConfirmView(APIView):
 class ChangePasswordView(APIView):
     permission_classes = (IsAuthenticated,)
     serializer_class = ChangePasswordSerializer
-    throttle_classes = (UserRateThrottle,)
+    throttle_classes = (RoleRateThrottle,)
 
     @extend_schema(
         request=ChangePasswordSerializer,
@@ -0,0 +1,13 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class EmailStatus(models.TextChoices):
+    PENDING = "P", _("Pending")
+    SENT = "S", _("Sent")
+    FAILED = "F", _("Failed")
+
+
+class MatchMode(models.TextChoices):
+    ANY = "any", _("Any")
+    ALL = "all", _("All")
@@ -0,0 +1,200 @@
+import hashlib
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import OperationalError, connection, transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+from clinic.dictionaries.models import (
+    Country,
+    DictionaryVersion,
+    Disease,
+    Ingredient,
+    Medicine,
+    MedicineForm,
+    MedicineIngredient,
+    MedicineType,
+    Office,
+    OfficeType,
+    Specialization,
+)
+
+logger = logging.getLogger(__name__)
+
+DICTIONARY_RESPONSE_KEY = "clinic:dictionaries:response:{digest}"
+
+# Modele, których zmiana wpływa na odpowiedzi widoków słownikowych
+DICTIONARY_MODELS = (
+    Country,
+    Disease,
+    Ingredient,
+    Medicine,
+    MedicineForm,
+    MedicineIngredient,
+    MedicineType,
+    Office,
+    OfficeType,
+    Specialization,
+)
+
+
+class DictionaryVersionCheck:
+    """
+    Wersja słowników zapamiętana w procesie.
+
+    Wersja odczytywana jest z bazy danych najwyżej raz na
+    `DICTIONARY_VERSION_CHECK_INTERVAL` sekund, więc odpowiedź z pamięci
+    podręcznej nie wymaga zapytania do bazy. Zmiany wykonane w innych procesach
+    widoczne są najpóźniej po tym czasie. Bezpieczna wątkowo.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.version = None
+        self.checked_at = 0.0
+
+    def get(self) -> int:
+        now = time.monotonic()
+        with self.lock:
+            if (
+                self.version is not None
+                and now - self.checked_at
+                < settings.DICTIONARY_VERSION_CHECK_INTERVAL
+            ):
+                return self.version
+
+        version = DictionaryVersion.objects.get_version()
+        with self.lock:
+            self.version, self.checked_at = version, now
+        return version
+
+    def clear(self) -> None:
+        with self.lock:
+            self.version = None
+
+
+dictionary_version = DictionaryVersionCheck()
+
+
+def get_dictionary_version() -> int:
+    """
+    Zwraca bieżącą wersję słowników zapisaną w bazie danych.
+    """
+    return dictionary_version.get()
+
+
+def increment_dictionary_version() -> None:
+    """
+    Zwiększenie wersji słowników w bazie danych i odświeżenie wersji
+    zapamiętanej w bieżącym procesie.
+    """
+    DictionaryVersion.objects.bump()
+    dictionary_version.clear()
+
+
+def bump_dictionary_version(**kwargs) -> None:
+    """
+    Unieważnienie zapamiętanych odpowiedzi słowników.
+
+    Podłączona do sygnałów zapisu i usunięcia modeli słownikowych; może być
+    też wywołana bezpośrednio po zmianach pomijających sygnały
+    (np. `bulk_create`). Wersja zwiększana jest dopiero po zatwierdzeniu
+    transakcji, aby żądanie nie zapamiętało pod nową wersją danych sprzed
+    zmiany.
+    """
+    transaction.on_commit(increment_dictionary_version)
+
+
+@contextmanager
+def statement_timeout(milliseconds):
+    """
+    Ograniczenie czasu wykonywania zapytań w bloku (tylko PostgreSQL).
+    """
+    if connection.vendor != "postgresql":
+        yield
+        return
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL statement_timeout = %s", [milliseconds])
+        yield
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL statement_timeout TO DEFAULT")
+
+
+class DictionaryCacheMixin:
+    """
+    Zapamiętywanie zserializowanych odpowiedzi widoków słownikowych.
+
+    Odpowiedzi `list` i `retrieve` przechowywane są w pamięci podręcznej Django
+    osobno dla każdego adresu (ścieżki i parametrów filtrowania, sortowania
+    i paginacji) razem z wersją słowników. Wersja przechowywana jest w bazie
+    danych i sprawdzana co `DICTIONARY_VERSION_CHECK_INTERVAL` sekund, a zapis
+    lub usunięcie rekordu słownikowego ją zwiększa, więc po tym czasie każdy
+    proces pobiera aktualne dane.
+    Odpowiedź jest świeża przez `DICTIONARY_CACHE_TIMEOUT` sekund.
+
+    Starsza odpowiedź przechowywana jest do `DICTIONARY_CACHE_STALE_TIMEOUT`
+    sekund. Jeżeli odświeżenie nie zmieści się w
+    `DICTIONARY_CACHE_QUERY_TIMEOUT` milisekundach lub baza danych jest
+    niedostępna, zwracana jest ona zamiast błędu.
+    """
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+    def get_response_cache_key(self, request) -> str:
+        digest = hashlib.sha256(
+            request.build_absolute_uri().encode()
+        ).hexdigest()
+        return DICTIONARY_RESPONSE_KEY.format(digest=digest)
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        cache_key = self.get_response_cache_key(request)
+        entry = cache.get(cache_key)
+        now = time.time()
+
+        try:
+            version = get_dictionary_version()
+        except OperationalError as e:
+            if entry is None:
+                raise
+            logger.warning(f"Serving stale dictionary response: {str(e)}")
+            return Response(entry["data"])
+
+        if (
+            entry is not None
+            and entry["version"] == version
+            and now - entry["stored_at"] < settings.DICTIONARY_CACHE_TIMEOUT
+        ):
+            return Response(entry["data"])
+
+        if entry is None:
+            response = handler(request, *args, **kwargs)
+        else:
+            try:
+                with statement_timeout(
+                    settings.DICTIONARY_CACHE_QUERY_TIMEOUT
+                ):
+                    response = handler(request, *args, **kwargs)
+            except OperationalError as e:
+                logger.warning(f"Serving stale dictionary response: {str(e)}")
+                return Response(entry["data"])
+
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(
+                cache_key,
+                {"version": version, "stored_at": now, "data": response.data},
+                timeout=settings.DICTIONARY_CACHE_STALE_TIMEOUT,
+            )
+        return response
@@ -1,12 +1,15 @@
 from django_filters import rest_framework as filters
 
+from clinic.choices import MatchMode
 from clinic.dictionaries.models import (
     Country,
     Disease,
     Medicine,
+    MedicineIngredient,
     Office,
     Specialization,
 )
+from clinic.filters import MatchModeFilter, related_exists, split_values
 
 
 class BaseDictionaryFilterSet(filters.FilterSet):
@@ -38,6 +41,7 @@ class MedicineFilterSet(BaseDictionaryFilterSet):
     active_ingredients__name = filters.CharFilter(
         method="filter_by_active_ingredient"
     )
+    active_ingredients__name_match = MatchModeFilter()
 
     class Meta:
         model = Medicine
@@ -46,17 +50,26 @@ class MedicineFilterSet(BaseDictionaryFilterSet):
             "type_of_medicine__name",
             "form__name",
             "active_ingredients__name",
+            "active_ingredients__name_match",
             "readable_id",
         )
 
     def filter_by_active_ingredient(self, queryset, name, value):
         """
-        Filters drugs based on the name of the active ingredient.
+        Filters drugs containing any (or, with
+        `active_ingredients__name_match=all`, all) of the comma-separated
+        active ingredient names.
         """
-        ingredient_names = value.split(",")
         return queryset.filter(
-            medicine_ingredients__ingredient__name__in=ingredient_names
-        ).distinct()
+            *related_exists(
+                MedicineIngredient,
+                "medicine",
+                "ingredient__name",
+                split_values(value),
+                self.form.cleaned_data.get("active_ingredients__name_match")
+                or MatchMode.ANY,
+            )
+        )
 
 
 class OfficeFilterSet(filters.FilterSet):
@@ -0,0 +1,410 @@
+import csv
+import io
+import json
+import time
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.core.validators import DecimalValidator
+from django.db import connection, transaction
+
+from clinic.dictionaries.models import (
+    Ingredient,
+    Medicine,
+    MedicineForm,
+    MedicineIngredient,
+    MedicineType,
+)
+
+STAGING_TABLE = "clinic_medicine_import_staging"
+IMPORTED_INGREDIENTS_TABLE = "clinic_medicine_import_ingredients"
+STAGING_COLUMNS = (
+    "position",
+    "name",
+    "type_of_medicine",
+    "form",
+    "ingredient",
+    "quantity",
+    "unit",
+)
+CSV_COLUMNS = STAGING_COLUMNS[1:]
+# Maksymalne długości wartości tekstowych (zgodne z polami modeli)
+COLUMN_MAX_LENGTHS = {
+    "name": Medicine._meta.get_field("name").max_length,
+    "type_of_medicine": MedicineType._meta.get_field("name").max_length,
+    "form": MedicineForm._meta.get_field("name").max_length,
+    "ingredient": Ingredient._meta.get_field("name").max_length,
+    "unit": MedicineIngredient._meta.get_field("unit").max_length,
+}
+# Kolumny wymagane w każdym wierszu oraz w wierszu ze składnikiem
+REQUIRED_COLUMNS = ("name", "type_of_medicine", "form")
+INGREDIENT_COLUMNS = ("quantity", "unit")
+QUANTITY_FIELD = MedicineIngredient._meta.get_field("quantity")
+validate_quantity = DecimalValidator(
+    QUANTITY_FIELD.max_digits, QUANTITY_FIELD.decimal_places
+)
+
+
+def iter_json_records(file, chunk_size=64 * 1024):
+    """
+    Strumieniowo odczytuje kolejne obiekty z tablicy JSON.
+
+    Plik czytany jest fragmentami, a w pamięci przechowywany jest jedynie
+    nieprzetworzony fragment bufora, więc zużycie pamięci nie zależy
+    od rozmiaru pliku.
+
+    Argumenty:
+        file: Plik tekstowy zawierający tablicę JSON.
+        chunk_size: Liczba znaków odczytywanych jednorazowo.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    started = False
+
+    while True:
+        buffer = buffer.lstrip()
+        if started:
+            buffer = buffer.lstrip(",").lstrip()
+
+        if not buffer:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                raise ValueError("Unexpected end of JSON data.")
+            buffer = chunk
+            continue
+
+        if not started:
+            if buffer[0] != "[":
+                raise ValueError("JSON data must be an array of records.")
+            buffer = buffer[1:]
+            started = True
+            continue
+
+        if buffer[0] == "]":
+            return
+
+        try:
+            record, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError:
+            # Rekord nie mieści się w buforze – dołączenie kolejnego fragmentu
+            chunk = file.read(chunk_size)
+            if not chunk:
+                raise
+            buffer += chunk
+            continue
+
+        buffer = buffer[end:]
+        yield record
+
+
+def iter_json_rows(records):
+    """
+    Zamienia rekordy leków (w formacie `medicines.json`) na płaskie wiersze.
+
+    Każdy składnik aktywny daje osobny wiersz, a lek bez składników –
+    jeden wiersz z pustymi polami składnika.
+    """
+    for position, record in enumerate(records):
+        medicine = (
+            position,
+            record["name"],
+            record["type_of_medicine"],
+            record["form"],
+        )
+        ingredients = record.get("active_ingredients") or ()
+        if not ingredients:
+            yield (*medicine, None, None, None)
+
+        for ingredient in ingredients:
+            yield (
+                *medicine,
+                ingredient["name"],
+                ingredient["quantity"],
+                ingredient["unit"],
+            )
+
+
+def iter_csv_rows(file):
+    """
+    Strumieniowo odczytuje wiersze pliku CSV.
+
+    Plik musi zawierać nagłówek z kolumnami `CSV_COLUMNS`; każdy wiersz opisuje
+    jeden składnik aktywny leku (puste kolumny składnika oznaczają lek bez
+    składników).
+    """
+    reader = csv.DictReader(file)
+    missing = set(CSV_COLUMNS) - set(reader.fieldnames or ())
+    if missing:
+        raise ValueError(f"Missing CSV columns: {', '.join(sorted(missing))}.")
+
+    for position, row in enumerate(reader):
+        yield (
+            position,
+            *(row[column] or None for column in CSV_COLUMNS),
+        )
+
+
+class MedicineRegistryImporter:
+    """
+    Import rejestru leków przez tabelę pośrednią i zapytania zbiorowe.
+
+    Wiersze grupowane są w partie i kopiowane do tymczasowej tabeli pośredniej
+    poleceniem `COPY`, a następnie scalane z tabelami `MedicineType`,
+    `MedicineForm`, `Ingredient`, `Medicine` i `MedicineIngredient` kilkoma
+    zapytaniami `INSERT ... SELECT ... ON CONFLICT` – niezależnie od liczby
+    wierszy w partii. Każda partia zapisywana jest w osobnej transakcji.
+
+    Jeżeli ten sam lek (lub składnik leku) występuje w danych wielokrotnie,
+    obowiązuje jego ostatnie wystąpienie. Po zapisaniu wszystkich partii
+    usuwane są składniki zaimportowanych leków, których nie ma już w danych.
+
+    Wiersze z wartościami, których nie można zapisać w polach modeli (np. zbyt
+    długimi lub niebędącymi tekstem), są pomijane i zliczane, zamiast
+    przerywać import.
+    """
+
+    def __init__(self, batch_size=5000, progress=None):
+        """
+        Argumenty:
+            batch_size: Liczba wierszy w jednej partii.
+            progress: Funkcja wywoływana po każdej partii ze słownikiem statystyk.
+        """
+        self.batch_size = batch_size
+        self.progress = progress
+        self.stats = {
+            "rows": 0,
+            "batches": 0,
+            "medicines_created": 0,
+            "medicines_updated": 0,
+            "ingredients_created": 0,
+            "ingredients_updated": 0,
+            "ingredients_deleted": 0,
+            "rows_skipped": 0,
+            "elapsed": 0.0,
+        }
+
+    def run(self, rows) -> dict:
+        """
+        Importuje wiersze w partiach i zwraca statystyki importu.
+        """
+        started = time.monotonic()
+        rows = iter(rows)
+
+        with connection.cursor() as cursor:
+            self.create_staging_table(cursor)
+            try:
+                while batch := list(islice(rows, self.batch_size)):
+                    valid_rows = [row for row in batch if self.is_valid(row)]
+                    with transaction.atomic():
+                        self.copy_batch(cursor, valid_rows)
+                        self.merge_batch(cursor)
+
+                    self.stats["rows"] += len(valid_rows)
+                    self.stats["rows_skipped"] += len(batch) - len(valid_rows)
+                    self.stats["batches"] += 1
+                    self.stats["elapsed"] = time.monotonic() - started
+                    if self.progress:
+                        self.progress(self.stats)
+
+                with transaction.atomic():
+                    self.delete_missing_ingredients(cursor)
+            finally:
+                cursor.execute(
+                    f"DROP TABLE IF EXISTS {STAGING_TABLE}, "
+                    f"{IMPORTED_INGREDIENTS_TABLE}"
+                )
+
+        self.stats["elapsed"] = time.monotonic() - started
+        return self.stats
+
+    @staticmethod
+    def is_valid(row) -> bool:
+        """
+        Sprawdza, czy wartości wiersza mogą zostać zapisane w polach modeli.
+
+        Wartości tekstowe muszą być napisami mieszczącymi się w polach,
+        a ilość składnika – liczbą o najwyżej 9 cyfrach, w tym 3 po przecinku.
+        Wiersz ze składnikiem musi zawierać jego ilość i jednostkę.
+        """
+        values = dict(zip(STAGING_COLUMNS, row))
+        if any(values[column] is None for column in REQUIRED_COLUMNS):
+            return False
+        if values["ingredient"] is not None and any(
+            values[column] is None for column in INGREDIENT_COLUMNS
+        ):
+            return False
+
+        for column, max_length in COLUMN_MAX_LENGTHS.items():
+            value = values[column]
+            if value is not None and (
+                not isinstance(value, str) or len(value) > max_length
+            ):
+                return False
+
+        quantity = values["quantity"]
+        if quantity is None:
+            return True
+        if isinstance(quantity, bool) or not isinstance(
+            quantity, (str, int, float)
+        ):
+            return False
+        try:
+            validate_quantity(Decimal(str(quantity)))
+        except (InvalidOperation, ValidationError):
+            return False
+        return True
+
+    @staticmethod
+    def create_staging_table(cursor):
+        cursor.execute(
+            f"""
+            CREATE TEMPORARY TABLE IF NOT EXISTS {STAGING_TABLE} (
+                position bigint NOT NULL,
+                name text NOT NULL,
+                type_of_medicine text NOT NULL,
+                form text NOT NULL,
+                ingredient text,
+                quantity numeric,
+                unit text
+            );
+            CREATE TEMPORARY TABLE IF NOT EXISTS {IMPORTED_INGREDIENTS_TABLE} (
+                medicine_id uuid NOT NULL,
+                ingredient_id bigint
+            )
+            """
+        )
+
+    @staticmethod
+    def copy_batch(cursor, batch):
+        """
+        Kopiuje partię wierszy do tabeli pośredniej poleceniem `COPY`.
+        """
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(batch)
+        buffer.seek(0)
+
+        cursor.execute(f"TRUNCATE {STAGING_TABLE}")
+        cursor.copy_expert(
+            f"COPY {STAGING_TABLE} ({', '.join(STAGING_COLUMNS)}) "
+            "FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+
+    def merge_batch(self, cursor):
+        """
+        Scala zawartość tabeli pośredniej z tabelami słowników leków.
+        """
+        for model, column in (
+            (MedicineType, "type_of_medicine"),
+            (MedicineForm, "form"),
+            (Ingredient, "ingredient"),
+        ):
+            cursor.execute(
+                f"""
+                INSERT INTO {model._meta.db_table} (name)
+                SELECT DISTINCT {column} FROM {STAGING_TABLE}
+                WHERE {column} IS NOT NULL
+                ON CONFLICT (name) DO NOTHING
+                """
+            )
+
+        medicines = Medicine._meta.db_table
+        cursor.execute(
+            f"""
+            WITH merged AS (
+                INSERT INTO {medicines} (id, name, type_of_medicine_id, form_id)
+                SELECT gen_random_uuid(), staging.name, medicine_type.id,
+                       medicine_form.id
+                FROM (
+                    SELECT DISTINCT ON (name) name, type_of_medicine, form
+                    FROM {STAGING_TABLE}
+                    ORDER BY name, position DESC
+                ) AS staging
+                JOIN {MedicineType._meta.db_table} AS medicine_type
+                    ON medicine_type.name = staging.type_of_medicine
+                JOIN {MedicineForm._meta.db_table} AS medicine_form
+                    ON medicine_form.name = staging.form
+                ON CONFLICT (name) DO UPDATE SET
+                    type_of_medicine_id = EXCLUDED.type_of_medicine_id,
+                    form_id = EXCLUDED.form_id
+                WHERE ({medicines}.type_of_medicine_id, {medicines}.form_id)
+                    IS DISTINCT FROM
+                    (EXCLUDED.type_of_medicine_id, EXCLUDED.form_id)
+                RETURNING xmax = 0 AS created
+            )
+            SELECT count(*) FILTER (WHERE created),
+                   count(*) FILTER (WHERE NOT created)
+            FROM merged
+            """
+        )
+        created, updated = cursor.fetchone()
+        self.stats["medicines_created"] += created
+        self.stats["medicines_updated"] += updated
+
+        medicine_ingredients = MedicineIngredient._meta.db_table
+        cursor.execute(
+            f"""
+            WITH merged AS (
+                INSERT INTO {medicine_ingredients}
+                    (medicine_id, ingredient_id, quantity, unit)
+                SELECT DISTINCT ON (medicine.id, ingredient.id)
+                       medicine.id, ingredient.id, staging.quantity,
+                       staging.unit
+                FROM {STAGING_TABLE} AS staging
+                JOIN {medicines} AS medicine
+                    ON medicine.name = staging.name
+                JOIN {Ingredient._meta.db_table} AS ingredient
+                    ON ingredient.name = staging.ingredient
+                ORDER BY medicine.id, ingredient.id, staging.position DESC
+                ON CONFLICT (medicine_id, ingredient_id) DO UPDATE SET
+                    quantity = EXCLUDED.quantity,
+                    unit = EXCLUDED.unit
+                WHERE ({medicine_ingredients}.quantity,
+                       {medicine_ingredients}.unit)
+                    IS DISTINCT FROM (EXCLUDED.quantity, EXCLUDED.unit)
+                RETURNING xmax = 0 AS created
+            )
+            SELECT count(*) FILTER (WHERE created),
+                   count(*) FILTER (WHERE NOT created)
+            FROM merged
+            """
+        )
+        created, updated = cursor.fetchone()
+        self.stats["ingredients_created"] += created
+        self.stats["ingredients_updated"] += updated
+
+        # Składniki z danych (również ich brak) zapamiętywane są do końca
+        # importu, ponieważ wiersze jednego leku mogą trafić do kilku partii
+        cursor.execute(
+            f"""
+            INSERT INTO {IMPORTED_INGREDIENTS_TABLE} (medicine_id, ingredient_id)
+            SELECT medicine.id, ingredient.id
+            FROM {STAGING_TABLE} AS staging
+            JOIN {medicines} AS medicine
+                ON medicine.name = staging.name
+            LEFT JOIN {Ingredient._meta.db_table} AS ingredient
+                ON ingredient.name = staging.ingredient
+            """
+        )
+
+    def delete_missing_ingredients(self, cursor):
+        """
+        Usuwa składniki zaimportowanych leków nieobecne w importowanych danych.
+        """
+        medicine_ingredients = MedicineIngredient._meta.db_table
+        cursor.execute(
+            f"""
+            DELETE FROM {medicine_ingredients} AS medicine_ingredient
+            WHERE medicine_ingredient.medicine_id IN (
+                SELECT medicine_id FROM {IMPORTED_INGREDIENTS_TABLE}
+            )
+            AND NOT EXISTS (
+                SELECT 1 FROM {IMPORTED_INGREDIENTS_TABLE} AS imported
+                WHERE imported.medicine_id = medicine_ingredient.medicine_id
+                    AND imported.ingredient_id
+                        = medicine_ingredient.ingredient_id
+            )
+            """
+        )
+        self.stats["ingredients_deleted"] += cursor.rowcount
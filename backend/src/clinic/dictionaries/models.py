@@ -1,6 +1,7 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
+from clinic.managers import DictionaryVersionManager
 from clinic.models import BaseModel
 
 
@@ -115,6 +116,12 @@ class MedicineIngredient(models.Model):
     class Meta:
         verbose_name = _("medicine ingredient")
         verbose_name_plural = _("medicine ingredients")
+        constraints = (
+            models.UniqueConstraint(
+                fields=("medicine", "ingredient"),
+                name="clinic_medicine_ingredient_unique",
+            ),
+        )
 
     def __str__(self):
         return f"{self.medicine.name} - {self.ingredient.name}: {self.quantity} {self.unit}"
@@ -158,3 +165,44 @@ class Specialization(BaseModel):
 
     def __str__(self):
         return self.name
+
+
+class DataImport(models.Model):
+    """
+    Informacja o ostatnim imporcie danych słownikowych z danego źródła.
+
+    Suma kontrolna pozwala pominąć ponowne wczytywanie niezmienionych plików.
+    """
+
+    source = models.CharField(_("source"), max_length=100, unique=True)
+    checksum = models.CharField(_("checksum"), max_length=64)
+    imported_at = models.DateTimeField(_("imported at"), auto_now=True)
+
+    class Meta:
+        verbose_name = _("data import")
+        verbose_name_plural = _("data imports")
+
+    def __str__(self):
+        return f"{self.source} ({self.checksum[:12]})"
+
+
+class DictionaryVersion(models.Model):
+    """
+    Wersja danych słownikowych, zwiększana po każdej ich zmianie.
+
+    Tabela zawiera jeden wiersz współdzielony przez wszystkie procesy
+    i serwery aplikacji, więc zmiana wykonana np. przez komendę zarządzania
+    unieważnia odpowiedzi zapamiętane przez każdy z nich.
+    """
+
+    id = models.PositiveSmallIntegerField(_("id"), primary_key=True)
+    version = models.BigIntegerField(_("version"), default=0)
+
+    objects = DictionaryVersionManager()
+
+    class Meta:
+        verbose_name = _("dictionary version")
+        verbose_name_plural = _("dictionary versions")
+
+    def __str__(self):
+        return str(self.version)
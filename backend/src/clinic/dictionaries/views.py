@@ -3,6 +3,7 @@ from rest_framework import viewsets
 from rest_framework.filters import OrderingFilter
 from rest_framework.permissions import AllowAny
 
+from clinic.dictionaries.cache import DictionaryCacheMixin
 from clinic.dictionaries.filters import (
     CountryFilterSet,
     DiseaseFilterSet,
@@ -28,7 +29,7 @@ from clinic.pagination import StandardResultsSetPagination
 from clinic.permissions import IsAdmin, IsDoctor, IsNurse, IsPatient
 
 
-class CountryViewSet(viewsets.ReadOnlyModelViewSet):
+class CountryViewSet(DictionaryCacheMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Country.objects.all()
     serializer_class = CountrySerializer
     filterset_class = CountryFilterSet
@@ -39,7 +40,7 @@ class CountryViewSet(viewsets.ReadOnlyModelViewSet):
     pagination_class = StandardResultsSetPagination
 
 
-class DiseaseViewSet(viewsets.ReadOnlyModelViewSet):
+class DiseaseViewSet(DictionaryCacheMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Disease.objects.all()
     filter_backends = (DjangoFilterBackend, OrderingFilter)
     filterset_class = DiseaseFilterSet
@@ -50,7 +51,7 @@ class DiseaseViewSet(viewsets.ReadOnlyModelViewSet):
     pagination_class = StandardResultsSetPagination
 
 
-class MedicineViewSet(viewsets.ReadOnlyModelViewSet):
+class MedicineViewSet(DictionaryCacheMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Medicine.objects.all()
     filter_backends = (DjangoFilterBackend, OrderingFilter)
     filterset_class = MedicineFilterSet
@@ -66,7 +67,7 @@ class MedicineViewSet(viewsets.ReadOnlyModelViewSet):
     pagination_class = StandardResultsSetPagination
 
 
-class OfficeViewSet(viewsets.ReadOnlyModelViewSet):
+class OfficeViewSet(DictionaryCacheMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Office.objects.all()
     filter_backends = (DjangoFilterBackend, OrderingFilter)
     filterset_class = OfficeFilterSet
@@ -82,7 +83,9 @@ class OfficeViewSet(viewsets.ReadOnlyModelViewSet):
     pagination_class = StandardResultsSetPagination
 
 
-class SpecializationViewSet(viewsets.ReadOnlyModelViewSet):
+class SpecializationViewSet(
+    DictionaryCacheMixin, viewsets.ReadOnlyModelViewSet
+):
     queryset = Specialization.objects.all()
     filter_backends = (DjangoFilterBackend, OrderingFilter)
     filterset_class = SpecializationFilterSet
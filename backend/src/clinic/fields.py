@@ -1,4 +1,19 @@
-from django.db import connection, models
+from django.db import connections, models
+from django.db.models import Func, Value
+from django.db.models.expressions import DatabaseDefault
+from django.db.models.fields import NOT_PROVIDED
+
+
+class NextVal(Func):
+    """
+    Funkcja PostgreSQL `nextval('<sekwencja>')` zwracająca kolejną wartość sekwencji.
+    """
+
+    function = "nextval"
+    output_field = models.BigIntegerField()
+
+    def __init__(self, sequence_name, **extra):
+        super().__init__(Value(sequence_name), **extra)
 
 
 class AutoIncrementField(models.PositiveIntegerField):
@@ -12,10 +27,38 @@ class AutoIncrementField(models.PositiveIntegerField):
     Nazwa sekwencji jest tworzona na podstawie nazwy tabeli modelu oraz nazwy pola,
     dzięki czemu każde pole posiada własną dedykowaną sekwencję.
 
+    Sekwencja jest podpięta jako domyślna wartość kolumny (`DEFAULT nextval(...)`),
+    a wartość odczytywana jest z `INSERT ... RETURNING`. Dzięki temu zapis obiektu,
+    również przez `bulk_create`, nie wymaga osobnego zapytania o kolejną wartość.
+
     Jeżeli wartość pola została już ustawiona lub obiekt nie jest nowy (czyli `add=False`),
     pole nie jest nadpisywane i używana jest domyślna logika `pre_save`.
     """
 
+    def __init__(self, *args, sequence_default=True, **kwargs):
+        # `sequence_default=False` zapisywane jest w migracjach utworzonych
+        # przed podpięciem sekwencji, aby ich modele historyczne nie odwoływały
+        # się do sekwencji, które jeszcze nie istnieją.
+        self.sequence_default = sequence_default
+        super().__init__(*args, **kwargs)
+
+    def contribute_to_class(self, cls, name, *args, **kwargs):
+        super().contribute_to_class(cls, name, *args, **kwargs)
+        # Pole z abstrakcyjnego modelu bazowego jest kopiowane do każdego
+        # modelu konkretnego – dopiero wtedy znana jest nazwa tabeli.
+        if (
+            self.sequence_default
+            and self.db_default is NOT_PROVIDED
+            and not cls._meta.abstract
+        ):
+            self.db_default = NextVal(self.get_sequence_name())
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if not self.sequence_default:
+            kwargs["sequence_default"] = False
+        return name, path, args, kwargs
+
     def pre_save(self, model_instance, add):
         """
         Określa wartość pola tuż przed zapisaniem obiektu modelu.
@@ -28,16 +71,43 @@ class AutoIncrementField(models.PositiveIntegerField):
             Wartość, która ma zostać zapisana w tym polu.
         """
         if add and not getattr(model_instance, self.attname):
-            # Generowanie kolejną wartość sekwencji, jeśli to nowy obiekt
-            # i pole nie jest jeszcze uzupełnione.
-            with connection.cursor() as cursor:
-                sequence_name = (
-                    f"{model_instance._meta.db_table}_{self.attname}_seq"
-                )
-                cursor.execute(f"SELECT nextval('{sequence_name}')")
-                value = cursor.fetchone()[0]
-                setattr(model_instance, self.attname, value)
-                return value
+            # Wartość nadawana jest przez bazę danych z sekwencji (DEFAULT),
+            # jeśli to nowy obiekt i pole nie jest jeszcze uzupełnione.
+            return DatabaseDefault()
         else:
             # Dla istniejących obiektów lub jeśli pole już ma wartość — użycie domyślnej logiki.
             return super().pre_save(model_instance, add)
+
+    def get_sequence_name(self) -> str:
+        """
+        Zwraca nazwę sekwencji PostgreSQL powiązanej z polem.
+        """
+        return f"{self.model._meta.db_table}_{self.attname}_seq"
+
+
+def create_auto_increment_sequences(models_to_check, using="default"):
+    """
+    Tworzy brakujące sekwencje dla wszystkich pól `AutoIncrementField` podanych modeli.
+
+    Lista sekwencji wyznaczana jest na podstawie modeli, więc nowe modele
+    korzystające z pola nie wymagają ręcznej rejestracji sekwencji.
+    Wszystkie polecenia wysyłane są do bazy danych jednym zapytaniem.
+
+    Argumenty:
+        models_to_check: Iterowalny zbiór klas modeli.
+        using: Alias bazy danych.
+    """
+    connection = connections[using]
+    statements = [
+        "CREATE SEQUENCE IF NOT EXISTS %s START WITH 1 INCREMENT BY 1;"
+        % connection.ops.quote_name(field.get_sequence_name())
+        for model in models_to_check
+        if not model._meta.abstract
+        for field in model._meta.concrete_fields
+        if isinstance(field, AutoIncrementField)
+    ]
+    if not statements:
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute("\n".join(statements))
@@ -1,6 +1,9 @@
 from django.contrib.admin import SimpleListFilter
+from django.db.models import Exists, OuterRef
 from django.utils.translation import gettext_lazy as _
+from django_filters import rest_framework as filters
 
+from clinic.choices import MatchMode
 from clinic.dictionaries.models import (
     Country,
     Ingredient,
@@ -10,6 +13,7 @@ from clinic.dictionaries.models import (
     OfficeType,
     Specialization,
 )
+from clinic.treatment.choices import VisitStatus
 
 
 class ActiveIngredientAdminFilter(SimpleListFilter):
@@ -155,3 +159,81 @@ class SpecializationAdminFilter(SimpleListFilter):
         """
         if self.value():
             return queryset.filter(specializations__id=self.value())
+
+
+class VisitStatusAdminFilter(SimpleListFilter):
+    title = _("visit status")
+    parameter_name = "visit_status"
+
+    def lookups(self, request, model_admin):
+        """
+        Zwraca dostępne statusy wizyt jako (kod, nazwa).
+        """
+        return VisitStatus.choices
+
+    def queryset(self, request, queryset):
+        """
+        Filtrowanie po aktualnym statusie wizyty wyliczonym na podstawie czasu.
+        """
+        if self.value():
+            return queryset.filter_by_live_status(self.value())
+        return queryset
+
+
+class MatchModeFilter(filters.ChoiceFilter):
+    """
+    Tryb dopasowania listy wartości: `any` (dowolna z nich) lub `all` (wszystkie).
+
+    Filtr nie zawęża wyników samodzielnie – jego wartość odczytywana jest przez
+    metodę filtrującą listę wartości.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("choices", MatchMode.choices)
+        super().__init__(**kwargs)
+
+    def filter(self, qs, value):
+        return qs
+
+
+def split_values(value):
+    """
+    Podział listy wartości rozdzielonych przecinkami (bez pustych i powtórzeń).
+    """
+    return [
+        item
+        for item in dict.fromkeys(part.strip() for part in value.split(","))
+        if item
+    ]
+
+
+def related_exists(related_model, owner_field, lookup, values, match_mode):
+    """
+    Warunki `EXISTS` sprawdzające powiązane rekordy o podanych wartościach.
+
+    W trybie `any` zwracany jest jeden warunek z `IN`, a w trybie `all` osobny
+    warunek dla każdej wartości. Skorelowane podzapytania (zamiast złączenia
+    i `DISTINCT`) nie powielają wierszy i mogą korzystać z indeksów tabeli
+    powiązań.
+
+    Argumenty:
+        related_model: Model tabeli powiązań (np. tabela pośrednia M2M).
+        owner_field: Pole tabeli powiązań wskazujące na filtrowany model.
+        lookup: Ścieżka do porównywanej wartości (np. `specialization__name`).
+        values: Lista wartości.
+        match_mode: Tryb dopasowania (`MatchMode`).
+
+    Zwraca:
+        list: Warunki do przekazania do `QuerySet.filter`.
+    """
+
+    def exists(**conditions):
+        return Exists(
+            related_model.objects.filter(
+                **{owner_field: OuterRef("pk")}, **conditions
+            )
+        )
+
+    if match_mode == MatchMode.ALL:
+        return [exists(**{lookup: value}) for value in values]
+    return [exists(**{f"{lookup}__in": values})]
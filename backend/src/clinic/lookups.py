@@ -0,0 +1,37 @@
+from django.db import models
+from django.db.models import Func, Lookup
+from django.db.models.lookups import IContains
+
+
+class ILike(IContains):
+    """
+    Wyszukiwanie fragmentu tekstu bez rozróżniania wielkości liter (`ILIKE`).
+
+    W przeciwieństwie do `icontains`, które w PostgreSQL porównuje
+    `UPPER(kolumna)`, warunek `kolumna ILIKE '%...%'` może zostać obsłużony
+    przez indeks GIN `gin_trgm_ops` założony bezpośrednio na kolumnie
+    (lub wyrażeniu, np. `FullName`).
+    """
+
+    lookup_name = "ilike"
+
+    def as_postgresql(self, compiler, connection):
+        lhs_sql, lhs_params = Lookup.process_lhs(self, compiler, connection)
+        rhs_sql, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs_sql} ILIKE {rhs_sql}", (*lhs_params, *rhs_params)
+
+
+class FullName(Func):
+    """
+    Imię i nazwisko jako wyrażenie `(first_name || ' ' || last_name)`.
+
+    Operator `||` (w przeciwieństwie do `CONCAT`) jest niezmienny (IMMUTABLE),
+    dzięki czemu wyrażenie może zostać zaindeksowane.
+    """
+
+    template = "(%(expressions)s)"
+    arg_joiner = " || ' ' || "
+    output_field = models.CharField()
+
+    def __init__(self, first_name="first_name", last_name="last_name"):
+        super().__init__(first_name, last_name)
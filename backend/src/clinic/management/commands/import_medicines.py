@@ -0,0 +1,128 @@
+import os
+from typing import Optional
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError
+
+from clinic.dictionaries.cache import bump_dictionary_version
+from clinic.dictionaries.importers import (
+    MedicineRegistryImporter,
+    iter_csv_rows,
+    iter_json_records,
+    iter_json_rows,
+)
+
+
+class Command(BaseCommand):
+    """
+    Import rejestru leków z pliku JSON lub CSV.
+
+    Plik odczytywany jest strumieniowo, a rekordy zapisywane w partiach przez
+    tabelę pośrednią (`COPY`) i zapytania zbiorowe, dzięki czemu zużycie pamięci
+    nie zależy od rozmiaru rejestru. Po każdej partii wypisywany jest postęp
+    i przepustowość importu.
+    """
+
+    help = "Import rejestru leków z pliku JSON lub CSV"
+
+    formats = ("json", "csv")
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Path to the medicine registry file.")
+        parser.add_argument(
+            "--format",
+            choices=self.formats,
+            help="File format (detected from the file extension by default).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Number of rows copied and merged in a single batch.",
+        )
+
+    def get_format(self, path: str, file_format: Optional[str]) -> str:
+        """
+        Ustalenie formatu pliku na podstawie opcji lub rozszerzenia.
+        """
+        if file_format:
+            return file_format
+
+        extension = os.path.splitext(path)[1].lstrip(".").lower()
+        if extension not in self.formats:
+            raise CommandError(
+                "Cannot detect file format, use the --format option."
+            )
+        return extension
+
+    def log_progress(self, stats: dict) -> None:
+        """
+        Logowanie postępu po zaimportowaniu partii.
+        """
+        throughput = (
+            stats["rows"] / stats["elapsed"] if stats["elapsed"] else 0
+        )
+        self.stdout.write(
+            f"Batch {stats['batches']}: "
+            f"{self.style.SUCCESS(stats['rows'])} rows imported "
+            f"({throughput:.0f} rows/s)."
+        )
+
+    def log_results(self, stats: dict) -> None:
+        """
+        Logowanie podsumowania importu.
+        """
+        self.stdout.write(
+            f"Medicines: {self.style.SUCCESS(stats['medicines_created'])} "
+            f"added, {self.style.SUCCESS(stats['medicines_updated'])} updated."
+        )
+        self.stdout.write(
+            "Medicine ingredients: "
+            f"{self.style.SUCCESS(stats['ingredients_created'])} added, "
+            f"{self.style.SUCCESS(stats['ingredients_updated'])} updated, "
+            f"{self.style.SUCCESS(stats['ingredients_deleted'])} deleted."
+        )
+        if stats["rows_skipped"]:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Skipped {stats['rows_skipped']} rows with invalid "
+                    "or too long values."
+                )
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"\n\nImported {stats['rows']} rows "
+                f"in {stats['elapsed']:.2f}s.\n\n"
+            )
+        )
+
+    def handle(self, *args, **options):
+        """
+        Uruchomienie komendy zarządzającej do importu rejestru leków.
+        """
+        if options["batch_size"] < 1:
+            raise CommandError("Batch size must be a positive number.")
+
+        path = options["path"]
+        file_format = self.get_format(path, options["format"])
+        importer = MedicineRegistryImporter(
+            batch_size=options["batch_size"], progress=self.log_progress
+        )
+
+        self.stdout.write(
+            self.style.HTTP_INFO(f"\n\nImporting medicines from {path}...\n\n")
+        )
+
+        try:
+            with open(path, encoding="utf-8", newline="") as file:
+                if file_format == "csv":
+                    rows = iter_csv_rows(file)
+                else:
+                    rows = iter_json_rows(iter_json_records(file))
+                stats = importer.run(rows)
+
+        except (OSError, ValueError, KeyError, DatabaseError) as e:
+            raise CommandError(f"Medicine import failed: {e}") from e
+
+        bump_dictionary_version()
+        self.log_results(stats)
@@ -1,15 +1,19 @@
+import hashlib
 import json
 import os
 from gettext import ngettext
-from typing import Any, Dict, Optional, Type
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
 
 from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
 from django.db.models import Model
 from django_countries.data import COUNTRIES
 
+from clinic.dictionaries.cache import bump_dictionary_version
 from clinic.dictionaries.models import (
     Country,
+    DataImport,
     Disease,
     Ingredient,
     Medicine,
@@ -27,7 +31,10 @@ class Command(BaseCommand):
     Wczytywanie danych do modeli: Specialization, Disease, Medicine, Office, Country.
 
     Odczytywanie danych z plików JSON i zapisywanie ich do bazy danych.
-    Jeśli rekord już istnieje (na podstawie nazwy), zostaje pominięty.
+    Dane każdego modelu porównywane są z istniejącymi rekordami jednym zapytaniem,
+    a nowe lub zmienione rekordy zapisywane są zbiorczo (`bulk_create`
+    z `update_conflicts`). Źródła, których suma kontrolna nie zmieniła się
+    od ostatniego importu, są pomijane.
     """
 
     help = "Wczytywanie danych do słowników z plików JSON"
@@ -40,6 +47,15 @@ class Command(BaseCommand):
         Office: "offices.json",
     }
 
+    countries_source = "django_countries"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Reload data even if the source has not changed since the last import.",
+        )
+
     def load_data(
         self, model: Type[Model], defaults: Optional[Dict[str, Any]] = None
     ) -> None:
@@ -53,129 +69,269 @@ class Command(BaseCommand):
         if defaults is None:
             defaults = {}
 
+        source = self.data_paths[model]
         file_path = os.path.join(
             settings.BASE_DIR,
             "src",
             "clinic",
             "dictionaries",
             "data",
-            self.data_paths[model],
+            source,
         )
 
-        new_objects_count = 0
-        existing_objects_count = 0
-
         try:
-            with open(file_path, "r") as file:
-                data = json.load(file)
-                for item in data:
-                    if model == Medicine:
-                        created = self.load_medicine(item, defaults)
-                    elif model == Office:
-                        created = self.load_office(item, defaults)
-                    else:
-                        created = self.load_generic_model(
-                            model, item, defaults
-                        )
-
-                    if created:
-                        new_objects_count += 1
-                    else:
-                        existing_objects_count += 1
-
-            self.log_results(model, new_objects_count, existing_objects_count)
+            with open(file_path, "rb") as file:
+                content = file.read()
+            data = json.loads(content)
 
         except (FileNotFoundError, json.JSONDecodeError) as e:
             self.stderr.write(self.style.ERROR(f"Error loading data: {e}\n\n"))
             raise CommandError("Error loading data") from e
 
-    def load_medicine(
-        self, item: Dict[str, Any], defaults: Dict[str, Any]
-    ) -> bool:
+        checksum = hashlib.sha256(content).hexdigest()
+        if self.is_unchanged(source, checksum):
+            self.log_skipped(model)
+            return
+
+        with transaction.atomic():
+            if model == Medicine:
+                self.load_medicines(data, defaults)
+            elif model == Office:
+                self.load_offices(data, defaults)
+            else:
+                self.load_generic_model(model, data, defaults)
+
+            self.save_checksum(source, checksum)
+
+    def load_medicines(
+        self, data: List[Dict[str, Any]], defaults: Dict[str, Any]
+    ) -> None:
         """
-        Wczytywanie pojedynczego rekordu leku.
+        Wczytywanie leków wraz z ich typami, formami i składnikami.
         """
-        type_obj, _ = MedicineType.objects.get_or_create(
-            name=item["type_of_medicine"]
+        types = self.upsert(
+            MedicineType,
+            ({"name": item["type_of_medicine"]} for item in data),
+            unique_fields=("name",),
         )
-        form_obj, _ = MedicineForm.objects.get_or_create(name=item["form"])
-
-        medicine, created = Medicine.objects.get_or_create(
-            name=item["name"],
-            defaults={
-                **defaults,
-                "type_of_medicine": type_obj,
-                "form": form_obj,
-            },
+        forms = self.upsert(
+            MedicineForm,
+            ({"name": item["form"]} for item in data),
+            unique_fields=("name",),
         )
-
-        for ingredient_data in item["active_ingredients"]:
-            ingredient, _ = Ingredient.objects.get_or_create(
-                name=ingredient_data["name"]
-            )
-            MedicineIngredient.objects.update_or_create(
-                medicine=medicine,
-                ingredient=ingredient,
-                defaults={
+        ingredients = self.upsert(
+            Ingredient,
+            (
+                {"name": ingredient_data["name"]}
+                for item in data
+                for ingredient_data in item["active_ingredients"]
+            ),
+            unique_fields=("name",),
+        )
+        medicines = self.upsert(
+            Medicine,
+            (
+                {
+                    **defaults,
+                    "name": item["name"],
+                    "type_of_medicine_id": types[(item["type_of_medicine"],)],
+                    "form_id": forms[(item["form"],)],
+                }
+                for item in data
+            ),
+            unique_fields=("name",),
+            update_fields=("type_of_medicine_id", "form_id"),
+        )
+        self.upsert(
+            MedicineIngredient,
+            (
+                {
+                    "medicine_id": medicines[(item["name"],)],
+                    "ingredient_id": ingredients[(ingredient_data["name"],)],
                     "quantity": ingredient_data["quantity"],
                     "unit": ingredient_data["unit"],
-                },
-            )
-
-        return created
+                }
+                for item in data
+                for ingredient_data in item["active_ingredients"]
+            ),
+            unique_fields=("medicine_id", "ingredient_id"),
+            update_fields=("quantity", "unit"),
+        )
 
-    def load_office(
-        self, item: Dict[str, Any], defaults: Dict[str, Any]
-    ) -> bool:
+    def load_offices(
+        self, data: List[Dict[str, Any]], defaults: Dict[str, Any]
+    ) -> None:
         """
-        Wczytywanie pojedynczego rekordu gabinetu.
+        Wczytywanie gabinetów wraz z ich typami.
         """
-        type_obj, _ = OfficeType.objects.get_or_create(
-            name=item["office_type"]
+        types = self.upsert(
+            OfficeType,
+            ({"name": item["office_type"]} for item in data),
+            unique_fields=("name",),
         )
-        _, created = Office.objects.get_or_create(
-            office_type=type_obj,
-            floor=item["floor"],
-            room_number=item["room_number"],
-            defaults=defaults,
+        self.upsert(
+            Office,
+            (
+                {
+                    **defaults,
+                    "office_type_id": types[(item["office_type"],)],
+                    "floor": item["floor"],
+                    "room_number": item["room_number"],
+                }
+                for item in data
+            ),
+            unique_fields=("office_type_id", "floor", "room_number"),
         )
-        return created
 
     def load_generic_model(
         self,
         model: Type[Model],
-        item: Dict[str, Any],
+        data: List[Dict[str, Any]],
         defaults: Dict[str, Any],
-    ) -> bool:
+    ) -> None:
         """
         Wczytywanie ogólnego modelu słownikowego (np. choroby, specjalizacji).
         """
-        _, created = model.objects.get_or_create(
-            name=item["name"], defaults={**defaults, **item}
+        rows = [{**defaults, **item} for item in data]
+        update_fields = tuple(
+            sorted({field for row in rows for field in row} - {"name"})
+        )
+        self.upsert(
+            model,
+            rows,
+            unique_fields=("name",),
+            update_fields=update_fields,
         )
-        return created
 
     def load_countries(self) -> None:
         """
         Wczytywanie danych krajów z django_countries.
         """
-        new_objects_count = 0
-        existing_objects_count = 0
+        rows = [
+            {"code": code, "name": str(name)}
+            for code, name in COUNTRIES.items()
+        ]
+        checksum = hashlib.sha256(
+            json.dumps(rows, sort_keys=True).encode()
+        ).hexdigest()
+
+        if self.is_unchanged(self.countries_source, checksum):
+            self.log_skipped(Country)
+            return
+
+        with transaction.atomic():
+            self.upsert(
+                Country,
+                rows,
+                unique_fields=("code",),
+                update_fields=("name",),
+            )
+            self.save_checksum(self.countries_source, checksum)
+
+    def upsert(
+        self,
+        model: Type[Model],
+        rows: Iterable[Dict[str, Any]],
+        unique_fields: Tuple[str, ...],
+        update_fields: Tuple[str, ...] = (),
+    ) -> Dict[Tuple[Any, ...], Any]:
+        """
+        Zbiorczy zapis nowych i zmienionych rekordów modelu.
+
+        Istniejące rekordy pobierane są jednym zapytaniem i porównywane
+        z danymi źródłowymi, a do bazy danych trafiają wyłącznie rekordy nowe
+        lub zmienione – jednym zapytaniem `INSERT ... ON CONFLICT DO UPDATE`.
+        Rekordy bez pól do aktualizacji są wyłącznie dodawane.
 
-        for code, name in COUNTRIES.items():
-            country, created = Country.objects.get_or_create(
-                code=code, name=name
+        Argumenty:
+            model: Model Django do załadowania danych.
+            rows: Rekordy jako słowniki (klucze to nazwy kolumn modelu).
+            unique_fields: Pola jednoznacznie identyfikujące rekord.
+            update_fields: Pola aktualizowane w istniejących rekordach.
+
+        Zwraca:
+            dict: Mapa wartości pól `unique_fields` na klucz główny rekordu.
+        """
+        opts = model._meta
+        rows_by_key = {}
+        for row in rows:
+            row = {
+                field: opts.get_field(field).to_python(value)
+                for field, value in row.items()
+            }
+            rows_by_key[tuple(row[field] for field in unique_fields)] = row
+
+        existing = {
+            tuple(values[field] for field in unique_fields): values
+            for values in model.objects.values(
+                "pk", *unique_fields, *update_fields
             )
+        }
+
+        new_rows, changed_rows = [], []
+        for key, row in rows_by_key.items():
+            current = existing.get(key)
+            if current is None:
+                new_rows.append(row)
+            elif any(current[field] != row[field] for field in update_fields):
+                # `bulk_create` nie nadpisuje ustawionego klucza głównego
+                # kluczem istniejącego rekordu, więc zmieniony rekord musi
+                # zachować swój dotychczasowy klucz
+                changed_rows.append({**row, "pk": current["pk"]})
+
+        objects = [model(**row) for row in new_rows + changed_rows]
+        if objects and update_fields:
+            model.objects.bulk_create(
+                objects,
+                update_conflicts=True,
+                unique_fields=unique_fields,
+                update_fields=update_fields,
+            )
+        elif objects:
+            model.objects.bulk_create(objects)
+
+        self.log_results(
+            model,
+            len(new_rows),
+            len(rows_by_key) - len(new_rows) - len(changed_rows),
+            len(changed_rows),
+        )
 
-            if created:
-                new_objects_count += 1
-            else:
-                existing_objects_count += 1
+        primary_keys = {key: values["pk"] for key, values in existing.items()}
+        primary_keys.update(
+            (tuple(getattr(obj, field) for field in unique_fields), obj.pk)
+            for obj in objects
+        )
+        return primary_keys
+
+    def is_unchanged(self, source: str, checksum: str) -> bool:
+        """
+        Sprawdzenie, czy źródło danych nie zmieniło się od ostatniego importu.
+        """
+        return not self.force and self.checksums.get(source) == checksum
+
+    def save_checksum(self, source: str, checksum: str) -> None:
+        """
+        Zapisanie sumy kontrolnej zaimportowanego źródła danych.
+        """
+        DataImport.objects.update_or_create(
+            source=source, defaults={"checksum": checksum}
+        )
 
-        self.log_results(Country, new_objects_count, existing_objects_count)
+    def log_skipped(self, model: Type[Model]) -> None:
+        """
+        Logowanie pominięcia niezmienionego źródła danych.
+        """
+        self.stdout.write(
+            f"{self.style.NOTICE(model.__name__)} source has not changed, skipping.\n"
+        )
 
     def log_results(
-        self, model: Type[Model], new_count: int, existing_count: int
+        self,
+        model: Type[Model],
+        new_count: int,
+        existing_count: int,
+        updated_count: int = 0,
     ) -> None:
         """
         Logowanie wyników po załadowaniu danych.
@@ -187,6 +343,11 @@ class Command(BaseCommand):
                 f"Added {self.style.SUCCESS(new_count)} new {model_name} objects."
             )
 
+        if updated_count > 0:
+            self.stdout.write(
+                f"Updated {self.style.SUCCESS(updated_count)} {model_name} objects."
+            )
+
         if existing_count > 0:
             model_name_plural = ngettext(
                 f"{model._meta.verbose_name}",
@@ -201,6 +362,11 @@ class Command(BaseCommand):
         """
         Uruchomienie komendy zarządzającej do wczytania danych z plików JSON.
         """
+        self.force = kwargs.get("force", False)
+        self.checksums = dict(
+            DataImport.objects.values_list("source", "checksum")
+        )
+
         self.stdout.write(
             self.style.HTTP_INFO("\n\nStarting data loading...\n\n")
         )
@@ -211,6 +377,7 @@ class Command(BaseCommand):
             self.load_data(Medicine)
             self.load_data(Office)
             self.load_countries()
+            bump_dictionary_version()
 
             self.stdout.write(
                 self.style.SUCCESS("\n\nData loading process completed.\n\n")
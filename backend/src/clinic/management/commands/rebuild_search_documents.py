@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from clinic.roles.models import PersonSearchDocument
+from clinic.roles.search import PROFILE_MODELS, refresh_search_documents
+
+
+class Command(BaseCommand):
+    """
+    Odbudowa dokumentów wyszukiwania osób.
+
+    Dokumenty aktualizowane są na bieżąco przy zapisie użytkowników, profili
+    i adresów. Komenda służy do ich odtworzenia po operacjach pomijających
+    sygnały Django (np. `bulk_create` lub zmiany wykonane bezpośrednio w bazie).
+    """
+
+    help = "Odbudowa dokumentów wyszukiwania osób"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of profiles loaded and saved in a single batch.",
+        )
+
+    def handle(self, *args, **options):
+        """
+        Uruchomienie komendy zarządzającej do odbudowy dokumentów wyszukiwania.
+        """
+        with transaction.atomic():
+            PersonSearchDocument.objects.all().delete()
+            for role, model in PROFILE_MODELS.items():
+                refreshed = refresh_search_documents(
+                    model.objects.all(), batch_size=options["batch_size"]
+                )
+                self.stdout.write(
+                    f"{role.label}: {self.style.SUCCESS(refreshed)} "
+                    "search documents."
+                )
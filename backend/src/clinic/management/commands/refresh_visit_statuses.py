@@ -0,0 +1,63 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from clinic.treatment.models import Visit
+
+
+class Command(BaseCommand):
+    """
+    Aktualizacja statusów wizyt na podstawie aktualnego czasu.
+
+    Komenda przesuwa wizyty między statusami SCHEDULED → IN_PROGRESS → COMPLETED
+    zbiorczymi zapytaniami UPDATE. Może zostać uruchomiona jednorazowo (np. z crona)
+    lub jako proces działający w tle z opcją `--loop`.
+    """
+
+    help = "Aktualizacja statusów wizyt na podstawie aktualnego czasu"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Run continuously, refreshing statuses every --interval seconds.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=60,
+            help="Number of seconds between refreshes in --loop mode.",
+        )
+
+    def refresh(self) -> None:
+        """
+        Jednorazowe przeliczenie statusów wszystkich wizyt.
+        """
+        updated = Visit.objects.refresh_visit_statuses()
+
+        if updated:
+            self.stdout.write(
+                f"Updated status of {self.style.SUCCESS(updated)} visits."
+            )
+
+    def handle(self, *args, **options):
+        """
+        Uruchomienie komendy zarządzającej do aktualizacji statusów wizyt.
+        """
+        if not options["loop"]:
+            self.refresh()
+            return
+
+        self.stdout.write(
+            self.style.HTTP_INFO(
+                f"Refreshing visit statuses every {options['interval']}s..."
+            )
+        )
+        try:
+            while True:
+                self.refresh()
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            self.stdout.write(
+                self.style.WARNING("Visit status worker stopped.")
+            )
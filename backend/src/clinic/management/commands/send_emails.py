@@ -0,0 +1,156 @@
+import time
+
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from clinic.choices import EmailStatus
+from clinic.models import EMAIL_SEND_LEASE, OutboxEmail
+
+RESULT_FIELDS = (
+    "status",
+    "attempts",
+    "next_attempt_at",
+    "last_error",
+    "sent_at",
+)
+
+
+class Command(BaseCommand):
+    """
+    Wysyłka wiadomości e-mail z kolejki (`OutboxEmail`).
+
+    Komenda zajmuje partię wiadomości, których termin wysyłki minął, renderuje
+    ich szablony i wysyła je przez jedno połączenie z serwerem pocztowym.
+    Zajęcie wiadomości (przesunięcie terminu o `EMAIL_SEND_LEASE`) zatwierdzane
+    jest w krótkiej transakcji z `SKIP LOCKED`, więc można uruchomić kilka
+    procesów naraz. Wysyłka odbywa się poza transakcją, a wynik zapisywany jest
+    osobno dla każdej wiadomości – po przerwaniu procesu ponownie wysyłane są
+    tylko wiadomości bez zapisanego wyniku (po upływie czasu zajęcia).
+    Nieudane wysyłki ponawiane są z wykładniczo rosnącym odstępem.
+    Może zostać uruchomiona jednorazowo (np. z crona) lub jako proces działający
+    w tle z opcją `--loop`.
+    """
+
+    help = "Wysyłka wiadomości e-mail z kolejki"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Run continuously, sending queued emails every --interval seconds.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=5,
+            help="Number of seconds between queue checks in --loop mode.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Maximum number of emails sent over a single connection.",
+        )
+
+    def send_batch(self, emails: list[OutboxEmail]) -> int:
+        """
+        Wysłanie partii wiadomości przez jedno połączenie SMTP.
+
+        Zwraca liczbę wysłanych wiadomości. Błąd pojedynczej wiadomości nie
+        przerywa wysyłki pozostałych.
+        """
+        sent = 0
+        connection = get_connection()
+        try:
+            connection.open()
+        except Exception as e:
+            for email in emails:
+                email.mark_failed_attempt(e, timezone.now())
+                email.save(update_fields=RESULT_FIELDS)
+            return sent
+
+        try:
+            for email in emails:
+                try:
+                    message = EmailMessage(
+                        email.subject,
+                        render_to_string(email.template_name, email.context),
+                        to=[email.to_email],
+                        connection=connection,
+                    )
+                    message.content_subtype = "html"
+                    message.send()
+                except Exception as e:
+                    email.mark_failed_attempt(e, timezone.now())
+                else:
+                    email.status = EmailStatus.SENT
+                    email.sent_at = timezone.now()
+                    sent += 1
+                email.save(update_fields=RESULT_FIELDS)
+        finally:
+            connection.close()
+
+        return sent
+
+    def claim_batch(self, batch_size: int) -> list[OutboxEmail]:
+        """
+        Zajęcie partii zaległych wiadomości na czas wysyłki.
+
+        Termin kolejnej próby przesuwany jest o `EMAIL_SEND_LEASE`, dzięki
+        czemu inne procesy pomijają zajęte wiadomości także po zatwierdzeniu
+        transakcji.
+        """
+        with transaction.atomic():
+            emails = list(
+                OutboxEmail.objects.due().select_for_update(skip_locked=True)[
+                    :batch_size
+                ]
+            )
+            if emails:
+                OutboxEmail.objects.filter(
+                    pk__in=[email.pk for email in emails]
+                ).update(next_attempt_at=timezone.now() + EMAIL_SEND_LEASE)
+        return emails
+
+    def dispatch(self, batch_size: int) -> int:
+        """
+        Wysłanie jednej partii zaległych wiadomości.
+        """
+        emails = self.claim_batch(batch_size)
+        if not emails:
+            return 0
+
+        sent = self.send_batch(emails)
+
+        failed = len(emails) - sent
+        self.stdout.write(
+            f"Sent {self.style.SUCCESS(sent)} emails"
+            + (f", {self.style.ERROR(failed)} failed." if failed else ".")
+        )
+        return len(emails)
+
+    def handle(self, *args, **options):
+        """
+        Uruchomienie komendy zarządzającej do wysyłki wiadomości e-mail.
+        """
+        batch_size = options["batch_size"]
+
+        if not options["loop"]:
+            while self.dispatch(batch_size) == batch_size:
+                pass
+            return
+
+        self.stdout.write(
+            self.style.HTTP_INFO(
+                f"Sending queued emails every {options['interval']}s..."
+            )
+        )
+        try:
+            while True:
+                if self.dispatch(batch_size) < batch_size:
+                    time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING("Email worker stopped."))
@@ -0,0 +1,91 @@
+from django.db import connection, models
+from django.utils import timezone
+
+from clinic.choices import EmailStatus
+
+
+class ThrottleCounterManager(models.Manager):
+    def hit(self, key: str, window_start: int) -> int:
+        """
+        Zlicza żądanie w oknie czasowym i zwraca liczbę żądań w tym oknie.
+
+        Licznik aktualizowany jest jednym zapytaniem `INSERT ... ON CONFLICT
+        DO UPDATE`, które blokuje wiersz klucza, więc równoległe żądania
+        (również z różnych procesów i serwerów) są zliczane poprawnie.
+        Rozpoczęcie nowego okna zeruje licznik.
+
+        Argumenty:
+            key: Klucz ograniczenia (zakres i identyfikator wywołującego).
+            window_start: Początek bieżącego okna (znacznik czasu w sekundach).
+        """
+        table = self.model._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {table} (key, window_start, count)
+                VALUES (%s, %s, 1)
+                ON CONFLICT (key) DO UPDATE SET
+                    count = CASE
+                        WHEN {table}.window_start = EXCLUDED.window_start
+                        THEN {table}.count + 1
+                        ELSE 1
+                    END,
+                    window_start = EXCLUDED.window_start
+                RETURNING count
+                """,
+                (key, window_start),
+            )
+            return cursor.fetchone()[0]
+
+    def delete_expired(self, before: int) -> int:
+        """
+        Usuwa liczniki okien rozpoczętych przed podanym znacznikiem czasu.
+
+        Zwraca liczbę usuniętych wierszy.
+        """
+        deleted, _rows = self.filter(window_start__lt=before).delete()
+        return deleted
+
+
+class DictionaryVersionManager(models.Manager):
+    VERSION_ID = 1
+
+    def get_version(self) -> int:
+        """
+        Zwraca bieżącą wersję słowników (0, jeśli nie była jeszcze zmieniana).
+        """
+        version = (
+            self.filter(pk=self.VERSION_ID)
+            .values_list("version", flat=True)
+            .first()
+        )
+        return version or 0
+
+    def bump(self) -> None:
+        """
+        Zwiększa wersję słowników jednym zapytaniem `INSERT ... ON CONFLICT
+        DO UPDATE`, tworząc wiersz wersji przy pierwszej zmianie.
+        """
+        table = self.model._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {table} (id, version)
+                VALUES (%s, 1)
+                ON CONFLICT (id) DO UPDATE SET version = {table}.version + 1
+                """,
+                (self.VERSION_ID,),
+            )
+
+
+class OutboxEmailQuerySet(models.QuerySet):
+    def due(self, now=None):
+        """
+        Zwraca wiadomości oczekujące na wysyłkę, których termin próby już minął.
+        """
+        if now is None:
+            now = timezone.now()
+
+        return self.filter(
+            status=EmailStatus.PENDING, next_attempt_at__lte=now
+        ).order_by("next_attempt_at", "pk")
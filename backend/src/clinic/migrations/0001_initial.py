@@ -34,7 +34,9 @@ class Migration(migrations.Migration):
                 (
                     "readable_id",
                     clinic.fields.AutoIncrementField(
-                        unique=True, verbose_name="readable id"
+                        sequence_default=False,
+                        unique=True,
+                        verbose_name="readable id",
                     ),
                 ),
                 (
@@ -68,7 +70,9 @@ class Migration(migrations.Migration):
                 (
                     "readable_id",
                     clinic.fields.AutoIncrementField(
-                        unique=True, verbose_name="readable id"
+                        sequence_default=False,
+                        unique=True,
+                        verbose_name="readable id",
                     ),
                 ),
                 (
@@ -122,7 +126,9 @@ class Migration(migrations.Migration):
                 (
                     "readable_id",
                     clinic.fields.AutoIncrementField(
-                        unique=True, verbose_name="readable id"
+                        sequence_default=False,
+                        unique=True,
+                        verbose_name="readable id",
                     ),
                 ),
                 (
@@ -224,7 +230,9 @@ class Migration(migrations.Migration):
                 (
                     "readable_id",
                     clinic.fields.AutoIncrementField(
-                        unique=True, verbose_name="readable id"
+                        sequence_default=False,
+                        unique=True,
+                        verbose_name="readable id",
                     ),
                 ),
                 (
@@ -264,7 +272,9 @@ class Migration(migrations.Migration):
                 (
                     "readable_id",
                     clinic.fields.AutoIncrementField(
-                        unique=True, verbose_name="readable id"
+                        sequence_default=False,
+                        unique=True,
+                        verbose_name="readable id",
                     ),
                 ),
                 (
@@ -508,7 +518,9 @@ class Migration(migrations.Migration):
                 (
                     "readable_id",
                     clinic.fields.AutoIncrementField(
-                        unique=True, verbose_name="readable id"
+                        sequence_default=False,
+                        unique=True,
+                        verbose_name="readable id",
                     ),
                 ),
                 (
@@ -672,7 +684,9 @@ class Migration(migrations.Migration):
                 (
                     "readable_id",
                     clinic.fields.AutoIncrementField(
-                        unique=True, verbose_name="readable id"
+                        sequence_default=False,
+                        unique=True,
+                        verbose_name="readable id",
                     ),
                 ),
                 (
@@ -720,7 +734,9 @@ class Migration(migrations.Migration):
                 (
                     "readable_id",
                     clinic.fields.AutoIncrementField(
-                        unique=True, verbose_name="readable id"
+                        sequence_default=False,
+                        unique=True,
+                        verbose_name="readable id",
                     ),
                 ),
                 ("floor", models.IntegerField(verbose_name="floor")),
@@ -758,7 +774,9 @@ class Migration(migrations.Migration):
                 (
                     "readable_id",
                     clinic.fields.AutoIncrementField(
-                        unique=True, verbose_name="readable id"
+                        sequence_default=False,
+                        unique=True,
+                        verbose_name="readable id",
                     ),
                 ),
                 (
@@ -838,7 +856,9 @@ class Migration(migrations.Migration):
                 (
                     "readable_id",
                     clinic.fields.AutoIncrementField(
-                        unique=True, verbose_name="readable id"
+                        sequence_default=False,
+                        unique=True,
+                        verbose_name="readable id",
                     ),
                 ),
                 (
@@ -935,7 +955,9 @@ class Migration(migrations.Migration):
                 (
                     "readable_id",
                     clinic.fields.AutoIncrementField(
-                        unique=True, verbose_name="readable id"
+                        sequence_default=False,
+                        unique=True,
+                        verbose_name="readable id",
                     ),
                 ),
                 ("date", models.DateTimeField(verbose_name="visit date")),
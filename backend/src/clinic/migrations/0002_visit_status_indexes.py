@@ -0,0 +1,26 @@
+# Generated by Django 5.0 on 2026-10-18 08:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("clinic", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="visit",
+            index=models.Index(
+                fields=["visit_status", "date"],
+                name="clinic_visit_status_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="visit",
+            index=models.Index(
+                fields=["visit_status", "predicted_end_date"],
+                name="clinic_visit_status_end_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.0 on 2026-10-18 08:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("clinic", "0002_visit_status_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="visit",
+            index=models.Index(fields=["date"], name="clinic_visit_date_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="visit",
+            index=models.Index(
+                fields=["predicted_end_date"], name="clinic_visit_end_date_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.0 on 2026-10-18 08:13
+
+import django.contrib.postgres.constraints
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.db import migrations
+
+import clinic.treatment.managers
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("clinic", "0003_visit_date_indexes"),
+    ]
+
+    operations = [
+        BtreeGistExtension(),
+        migrations.AddConstraint(
+            model_name="visit",
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(
+                expressions=(
+                    (
+                        clinic.treatment.managers.TsTzRange(
+                            "date", "predicted_end_date"
+                        ),
+                        "&&",
+                    ),
+                    ("doctor", "="),
+                ),
+                name="clinic_visit_doctor_no_overlap",
+                violation_error_message="Lekarz ma nakładającą się wizytę.",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="visit",
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(
+                expressions=(
+                    (
+                        clinic.treatment.managers.TsTzRange(
+                            "date", "predicted_end_date"
+                        ),
+                        "&&",
+                    ),
+                    ("office", "="),
+                ),
+                name="clinic_visit_office_no_overlap",
+                violation_error_message="Gabinet nie jest dostępny w wybranym czasie.",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="visit",
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(
+                expressions=(
+                    (
+                        clinic.treatment.managers.TsTzRange(
+                            "date", "predicted_end_date"
+                        ),
+                        "&&",
+                    ),
+                    ("patient", "="),
+                ),
+                name="clinic_visit_patient_no_overlap",
+                violation_error_message="Pacjent ma nakładającą się wizytę.",
+            ),
+        ),
+    ]
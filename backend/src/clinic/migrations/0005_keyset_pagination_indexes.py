@@ -0,0 +1,30 @@
+# Generated by Django 5.0 on 2026-10-18 08:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("clinic", "0004_visit_overlap_constraints"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="visit",
+            name="clinic_visit_date_idx",
+        ),
+        migrations.AddIndex(
+            model_name="prescription",
+            index=models.Index(
+                fields=["issue_date", "readable_id"],
+                name="clinic_prescr_issue_rid_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="visit",
+            index=models.Index(
+                fields=["date", "readable_id"],
+                name="clinic_visit_date_rid_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.0 on 2026-10-18 08:20
+
+import django.contrib.postgres.constraints
+import django.core.validators
+from django.db import migrations, models
+
+import clinic.treatment.managers
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("clinic", "0005_keyset_pagination_indexes"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=(
+                "CREATE SEQUENCE IF NOT EXISTS clinic_prescription_code_seq "
+                "MINVALUE 0 MAXVALUE 9999 START WITH 0 CYCLE;"
+            ),
+            reverse_sql="DROP SEQUENCE IF EXISTS clinic_prescription_code_seq;",
+        ),
+        migrations.AlterField(
+            model_name="prescription",
+            name="prescription_code",
+            field=models.CharField(
+                blank=True,
+                max_length=4,
+                validators=[
+                    django.core.validators.RegexValidator(
+                        code="invalid_prescription_code",
+                        message="Kod recepty musi składać się z 4 cyfr.",
+                        regex="^\\d{4}$",
+                    )
+                ],
+                verbose_name="prescription code",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="prescription",
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(
+                expressions=(
+                    (
+                        clinic.treatment.managers.DateRange(
+                            "issue_date", "expiry_date"
+                        ),
+                        "&&",
+                    ),
+                    ("prescription_code", "="),
+                ),
+                name="clinic_prescription_active_code_unique",
+                violation_error_message="Kod recepty jest już używany przez aktywną receptę.",
+            ),
+        ),
+    ]
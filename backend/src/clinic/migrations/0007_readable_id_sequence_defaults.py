@@ -0,0 +1,152 @@
+# Generated by Django 5.0 on 2026-10-18 08:24
+
+from django.db import migrations
+
+import clinic.fields
+
+
+def create_readable_id_sequences(apps, schema_editor):
+    """
+    Utworzenie sekwencji pól `AutoIncrementField`, zanim zostaną użyte
+    jako domyślne wartości kolumn.
+    """
+    for model in apps.get_app_config("clinic").get_models():
+        for field in model._meta.concrete_fields:
+            if isinstance(field, clinic.fields.AutoIncrementField):
+                schema_editor.execute(
+                    "CREATE SEQUENCE IF NOT EXISTS %s START WITH 1 INCREMENT BY 1"
+                    % schema_editor.quote_name(field.get_sequence_name())
+                )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("clinic", "0006_prescription_code_allocator"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            create_readable_id_sequences, migrations.RunPython.noop
+        ),
+        migrations.AlterField(
+            model_name="country",
+            name="readable_id",
+            field=clinic.fields.AutoIncrementField(
+                db_default=clinic.fields.NextVal(
+                    "clinic_country_readable_id_seq"
+                ),
+                unique=True,
+                verbose_name="readable id",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="disease",
+            name="readable_id",
+            field=clinic.fields.AutoIncrementField(
+                db_default=clinic.fields.NextVal(
+                    "clinic_disease_readable_id_seq"
+                ),
+                unique=True,
+                verbose_name="readable id",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="doctor",
+            name="readable_id",
+            field=clinic.fields.AutoIncrementField(
+                db_default=clinic.fields.NextVal(
+                    "clinic_doctor_readable_id_seq"
+                ),
+                unique=True,
+                verbose_name="readable id",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="medicine",
+            name="readable_id",
+            field=clinic.fields.AutoIncrementField(
+                db_default=clinic.fields.NextVal(
+                    "clinic_medicine_readable_id_seq"
+                ),
+                unique=True,
+                verbose_name="readable id",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="nurse",
+            name="readable_id",
+            field=clinic.fields.AutoIncrementField(
+                db_default=clinic.fields.NextVal(
+                    "clinic_nurse_readable_id_seq"
+                ),
+                unique=True,
+                verbose_name="readable id",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="office",
+            name="readable_id",
+            field=clinic.fields.AutoIncrementField(
+                db_default=clinic.fields.NextVal(
+                    "clinic_office_readable_id_seq"
+                ),
+                unique=True,
+                verbose_name="readable id",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="patient",
+            name="readable_id",
+            field=clinic.fields.AutoIncrementField(
+                db_default=clinic.fields.NextVal(
+                    "clinic_patient_readable_id_seq"
+                ),
+                unique=True,
+                verbose_name="readable id",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="prescription",
+            name="readable_id",
+            field=clinic.fields.AutoIncrementField(
+                db_default=clinic.fields.NextVal(
+                    "clinic_prescription_readable_id_seq"
+                ),
+                unique=True,
+                verbose_name="readable id",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="specialization",
+            name="readable_id",
+            field=clinic.fields.AutoIncrementField(
+                db_default=clinic.fields.NextVal(
+                    "clinic_specialization_readable_id_seq"
+                ),
+                unique=True,
+                verbose_name="readable id",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="user",
+            name="readable_id",
+            field=clinic.fields.AutoIncrementField(
+                db_default=clinic.fields.NextVal(
+                    "clinic_user_readable_id_seq"
+                ),
+                unique=True,
+                verbose_name="readable id",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="visit",
+            name="readable_id",
+            field=clinic.fields.AutoIncrementField(
+                db_default=clinic.fields.NextVal(
+                    "clinic_visit_readable_id_seq"
+                ),
+                unique=True,
+                verbose_name="readable id",
+            ),
+        ),
+    ]
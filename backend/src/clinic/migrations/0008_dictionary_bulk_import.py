@@ -0,0 +1,53 @@
+# Generated by Django 5.0 on 2026-10-18 08:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("clinic", "0007_readable_id_sequence_defaults"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DataImport",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "source",
+                    models.CharField(
+                        max_length=100, unique=True, verbose_name="source"
+                    ),
+                ),
+                (
+                    "checksum",
+                    models.CharField(max_length=64, verbose_name="checksum"),
+                ),
+                (
+                    "imported_at",
+                    models.DateTimeField(
+                        auto_now=True, verbose_name="imported at"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "data import",
+                "verbose_name_plural": "data imports",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="medicineingredient",
+            constraint=models.UniqueConstraint(
+                fields=("medicine", "ingredient"),
+                name="clinic_medicine_ingredient_unique",
+            ),
+        ),
+    ]
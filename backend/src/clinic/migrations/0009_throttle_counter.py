@@ -0,0 +1,40 @@
+# Generated by Django 5.0 on 2026-10-18 08:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("clinic", "0008_dictionary_bulk_import"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ThrottleCounter",
+            fields=[
+                (
+                    "key",
+                    models.CharField(
+                        max_length=255,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="key",
+                    ),
+                ),
+                (
+                    "window_start",
+                    models.BigIntegerField(verbose_name="window start"),
+                ),
+                (
+                    "count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="count"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "throttle counter",
+                "verbose_name_plural": "throttle counters",
+            },
+        ),
+    ]
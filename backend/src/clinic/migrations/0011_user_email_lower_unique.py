@@ -0,0 +1,50 @@
+# Generated by Django 5.0 on 2026-10-18 08:48
+
+import django.db.models.functions.text
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+
+def normalize_emails(apps, schema_editor):
+    """
+    Zapisanie istniejących adresów e-mail małymi literami przed utworzeniem
+    indeksu unikalnego na `LOWER(email)`.
+
+    Jeśli adresy różniące się tylko wielkością liter należą do kilku kont,
+    migracja jest przerywana z listą takich adresów – konta trzeba scalić
+    lub zmienić ręcznie.
+    """
+    User = apps.get_model("clinic", "User")
+    duplicates = list(
+        User.objects.values(lower_email=Lower("email"))
+        .annotate(count=Count("pk"))
+        .filter(count__gt=1)
+        .order_by("lower_email")
+        .values_list("lower_email", flat=True)
+    )
+    if duplicates:
+        raise RuntimeError(
+            "Cannot add a case-insensitive unique constraint on user emails, "
+            "the following addresses are used by more than one account: "
+            + ", ".join(duplicates)
+        )
+    User.objects.exclude(email=Lower("email")).update(email=Lower("email"))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("clinic", "0010_outbox_email"),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_emails, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="user",
+            constraint=models.UniqueConstraint(
+                django.db.models.functions.text.Lower("email"),
+                name="clinic_user_email_lower_unique",
+            ),
+        ),
+    ]
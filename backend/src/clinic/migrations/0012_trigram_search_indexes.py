@@ -0,0 +1,75 @@
+# Generated by Django 5.0 on 2026-10-18 08:51
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+import clinic.lookups
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("clinic", "0011_user_email_lower_unique"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name="doctor",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["job_execution_number"],
+                name="clinic_doctor_job_number_trgm",
+                opclasses=("gin_trgm_ops",),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="nurse",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["nursing_license_number"],
+                name="clinic_nurse_license_trgm",
+                opclasses=("gin_trgm_ops",),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="patient",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["pesel"],
+                name="clinic_patient_pesel_trgm",
+                opclasses=("gin_trgm_ops",),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["first_name"],
+                name="clinic_user_first_name_trgm",
+                opclasses=("gin_trgm_ops",),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["last_name"],
+                name="clinic_user_last_name_trgm",
+                opclasses=("gin_trgm_ops",),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["email"],
+                name="clinic_user_email_trgm",
+                opclasses=("gin_trgm_ops",),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    clinic.lookups.FullName(), name="gin_trgm_ops"
+                ),
+                name="clinic_user_full_name_trgm",
+            ),
+        ),
+    ]
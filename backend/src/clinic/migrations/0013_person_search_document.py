@@ -0,0 +1,123 @@
+# Generated by Django 5.0 on 2026-10-18 08:54
+
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# Utworzenie dokumentów wyszukiwania dla istniejących profili
+POPULATE_SEARCH_DOCUMENTS = """
+INSERT INTO clinic_personsearchdocument (
+    id, user_id, role, readable_id, full_name, email,
+    pesel, license_number, city, document
+)
+SELECT
+    profile.id, u.id, profile.role, profile.readable_id,
+    u.first_name || ' ' || u.last_name, u.email,
+    profile.pesel, profile.license_number, profile.city,
+    concat_ws(
+        ' ', u.first_name || ' ' || u.last_name, u.email,
+        NULLIF(profile.pesel, ''), NULLIF(profile.license_number, ''),
+        NULLIF(profile.city, '')
+    )
+FROM (
+    SELECT p.id, p.user_id, 'P' AS role, p.readable_id, p.pesel,
+        '' AS license_number, a.city
+    FROM clinic_patient p
+    JOIN clinic_address a ON a.id = p.address_id
+    UNION ALL
+    SELECT d.id, d.user_id, 'D', d.readable_id, '', d.job_execution_number, ''
+    FROM clinic_doctor d
+    UNION ALL
+    SELECT n.id, n.user_id, 'N', n.readable_id, '', n.nursing_license_number, ''
+    FROM clinic_nurse n
+) profile
+JOIN clinic_user u ON u.id = profile.user_id
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("clinic", "0012_trigram_search_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PersonSearchDocument",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        primary_key=True, serialize=False, verbose_name="id"
+                    ),
+                ),
+                (
+                    "role",
+                    models.CharField(
+                        choices=[
+                            ("P", "Patient"),
+                            ("N", "Nurse"),
+                            ("D", "Doctor"),
+                            ("A", "Admin"),
+                        ],
+                        max_length=1,
+                        verbose_name="role",
+                    ),
+                ),
+                (
+                    "readable_id",
+                    models.PositiveIntegerField(verbose_name="readable id"),
+                ),
+                (
+                    "full_name",
+                    models.CharField(max_length=61, verbose_name="full name"),
+                ),
+                (
+                    "email",
+                    models.EmailField(
+                        max_length=255, verbose_name="email address"
+                    ),
+                ),
+                (
+                    "pesel",
+                    models.CharField(
+                        blank=True, max_length=11, verbose_name="PESEL"
+                    ),
+                ),
+                (
+                    "license_number",
+                    models.CharField(
+                        blank=True, max_length=7, verbose_name="license number"
+                    ),
+                ),
+                (
+                    "city",
+                    models.CharField(
+                        blank=True, max_length=50, verbose_name="city"
+                    ),
+                ),
+                ("document", models.TextField(verbose_name="document")),
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="search_document",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="user",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "person search document",
+                "verbose_name_plural": "person search documents",
+                "indexes": [
+                    django.contrib.postgres.indexes.GinIndex(
+                        fields=["document"],
+                        name="clinic_search_document_trgm",
+                        opclasses=("gin_trgm_ops",),
+                    )
+                ],
+            },
+        ),
+        migrations.RunSQL(POPULATE_SEARCH_DOCUMENTS, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-18 09:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("clinic", "0013_person_search_document"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="prescription",
+            index=models.Index(
+                fields=["prescription_code"], name="clinic_prescr_code_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0 on 2026-10-18 09:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("clinic", "0014_prescription_code_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="token_version",
+            field=models.PositiveIntegerField(
+                default=0, verbose_name="token version"
+            ),
+        ),
+    ]
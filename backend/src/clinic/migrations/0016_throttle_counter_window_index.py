@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-18 09:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("clinic", "0015_user_token_version"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="throttlecounter",
+            index=models.Index(
+                fields=["window_start"], name="clinic_throttle_window_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.0 on 2026-10-18 09:41
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("clinic", "0016_throttle_counter_window_index"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="user",
+            name="email",
+            field=models.EmailField(
+                max_length=255,
+                validators=[django.core.validators.MinLengthValidator(7)],
+                verbose_name="email address",
+            ),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.0 on 2026-10-18 09:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("clinic", "0017_user_email_drop_unique_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DictionaryVersion",
+            fields=[
+                (
+                    "id",
+                    models.PositiveSmallIntegerField(
+                        primary_key=True, serialize=False, verbose_name="id"
+                    ),
+                ),
+                (
+                    "version",
+                    models.BigIntegerField(default=0, verbose_name="version"),
+                ),
+            ],
+            options={
+                "verbose_name": "dictionary version",
+                "verbose_name_plural": "dictionary versions",
+            },
+        ),
+    ]
@@ -1,11 +1,13 @@
 import logging
 
 from django.contrib.admin import ModelAdmin
-from django.core.mail import EmailMessage
-from django.template.loader import render_to_string
+from django.utils.functional import cached_property
 from django.utils.translation import gettext as _
 from rest_framework import serializers
 
+from clinic.auth.principal import Principal
+from clinic.models import OutboxEmail
+
 # Konfiguracja loggera dla tego modułu
 logger = logging.getLogger(__name__)
 
@@ -14,31 +16,35 @@ class MailSendingMixin:
     """
     Mixin dodający możliwość wysyłania wiadomości e-mail.
 
-    Ten mixin udostępnia metodę do wysyłania e-maila z wykorzystaniem szablonu i kontekstu.
-    Obsługuje również wyjątki, które mogą wystąpić podczas wysyłania wiadomości, i loguje je.
+    Wiadomości nie są wysyłane w trakcie obsługi żądania – trafiają do kolejki
+    (`OutboxEmail`) w bieżącej transakcji i są wysyłane przez komendę
+    `send_emails`. Dzięki temu czas odpowiedzi nie zależy od serwera pocztowego,
+    a wiadomość zostaje wysłana tylko wtedy, gdy transakcja zostanie zatwierdzona.
     """
 
     def send_email(self, subject, template_name, context, to_email):
         """
-        Renderuje szablon e-maila z kontekstem i wysyła wiadomość.
+        Dodaje wiadomość e-mail do kolejki wysyłki.
 
         Argumenty:
             subject (str): Temat wiadomości.
             template_name (str): Ścieżka do szablonu e-maila.
-            context (dict): Kontekst używany do renderowania szablonu.
+            context (dict): Kontekst szablonu (musi dać się zapisać jako JSON).
             to_email (str): Adres e-mail odbiorcy.
 
         Wyjątki:
-            serializers.ValidationError: W przypadku błędu podczas wysyłania e-maila.
+            serializers.ValidationError: W przypadku błędu podczas zapisu wiadomości.
         """
         try:
-            message = render_to_string(template_name, context)
-            email_message = EmailMessage(subject, message, to=[to_email])
-            email_message.content_subtype = "html"
-            email_message.send()
+            OutboxEmail.objects.create(
+                subject=str(subject),
+                template_name=template_name,
+                context=context,
+                to_email=to_email,
+            )
         except Exception as e:
             logger.error(
-                f"Error sending email to {to_email}: {str(e)}", exc_info=True
+                f"Error queueing email to {to_email}: {str(e)}", exc_info=True
             )
 
             raise serializers.ValidationError(
@@ -50,6 +56,19 @@ class MailSendingMixin:
             )
 
 
+class PrincipalMixin:
+    """
+    Mixin widoku udostępniający tożsamość wywołującego jako `principal`.
+
+    Instancja widoku tworzona jest dla każdego żądania, więc principal
+    (rola i identyfikator profilu użytkownika) wyznaczany jest raz na żądanie.
+    """
+
+    @cached_property
+    def principal(self):
+        return Principal.from_user(self.request.user)
+
+
 class FullnameAdminMixin(ModelAdmin):
     """
     Mixin dodający wyświetlanie imienia i nazwiska powiązanego użytkownika w panelu admina Django.
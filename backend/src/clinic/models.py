@@ -1,11 +1,16 @@
 import uuid
+from datetime import timedelta
 
 from django.core.validators import MinLengthValidator
 from django.db import models
+from django.db.models import Q
+from django.utils.timezone import now
 from django.utils.translation import gettext_lazy as _
 
 from clinic.auth.models import User  # noqa: F401
+from clinic.choices import EmailStatus
 from clinic.fields import AutoIncrementField
+from clinic.managers import OutboxEmailQuerySet, ThrottleCounterManager
 from clinic.validators import (
     ApartmentNumberValidator,
     CityValidator,
@@ -77,3 +82,101 @@ class Address(models.Model):
             address += f"/{self.apartment_number}"
         address += f", {self.post_code} {self.city}, {country_name}"
         return address
+
+
+class ThrottleCounter(models.Model):
+    """
+    Licznik żądań w bieżącym oknie czasowym ograniczenia częstotliwości.
+
+    Każdy klucz (zakres i identyfikator wywołującego) ma jeden wiersz, więc
+    rozmiar tabeli nie zależy od liczby żądań. Wiersze zakończonych okien
+    usuwane są okresowo przez `RoleRateThrottle`. Tabela współdzielona jest
+    przez wszystkie procesy i serwery aplikacji.
+    """
+
+    key = models.CharField(_("key"), max_length=255, primary_key=True)
+    window_start = models.BigIntegerField(_("window start"))
+    count = models.PositiveIntegerField(_("count"), default=0)
+
+    objects = ThrottleCounterManager()
+
+    class Meta:
+        verbose_name = _("throttle counter")
+        verbose_name_plural = _("throttle counters")
+        indexes = (
+            models.Index(
+                fields=("window_start",), name="clinic_throttle_window_idx"
+            ),
+        )
+
+    def __str__(self):
+        return f"{self.key}: {self.count}"
+
+
+EMAIL_MAX_ATTEMPTS = 5
+EMAIL_RETRY_DELAY = timedelta(minutes=1)
+EMAIL_MAX_RETRY_DELAY = timedelta(hours=1)
+# Czas, na jaki wiadomość jest zajmowana przez proces wysyłający
+EMAIL_SEND_LEASE = timedelta(minutes=10)
+
+
+class OutboxEmail(models.Model):
+    """
+    Wiadomość e-mail oczekująca w kolejce wysyłki (outbox).
+
+    Wiadomość zapisywana jest w tej samej transakcji co zmiana, której dotyczy,
+    a wysyłana później przez komendę `send_emails`. Treść renderowana jest
+    z szablonu i kontekstu dopiero podczas wysyłki, dlatego kontekst musi dać się
+    zapisać jako JSON.
+    """
+
+    subject = models.CharField(_("subject"), max_length=255)
+    template_name = models.CharField(_("template name"), max_length=255)
+    context = models.JSONField(_("context"), default=dict, blank=True)
+    to_email = models.EmailField(_("recipient"), max_length=255)
+    status = models.CharField(
+        _("status"),
+        max_length=1,
+        choices=EmailStatus.choices,
+        default=EmailStatus.PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(_("attempts"), default=0)
+    next_attempt_at = models.DateTimeField(_("next attempt at"), default=now)
+    last_error = models.TextField(_("last error"), blank=True)
+    created_at = models.DateTimeField(_("created at"), auto_now_add=True)
+    sent_at = models.DateTimeField(_("sent at"), null=True, blank=True)
+
+    objects = OutboxEmailQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = _("outbox email")
+        verbose_name_plural = _("outbox emails")
+        indexes = (
+            models.Index(
+                fields=("next_attempt_at",),
+                condition=Q(status=EmailStatus.PENDING),
+                name="clinic_outbox_pending_idx",
+            ),
+        )
+
+    def __str__(self):
+        return f"{self.subject} ({self.to_email})"
+
+    def mark_failed_attempt(self, error, now) -> None:
+        """
+        Odnotowuje nieudaną próbę wysyłki i wyznacza termin kolejnej.
+
+        Odstęp między próbami rośnie wykładniczo (1, 2, 4, ... minut, najwyżej
+        godzina). Po `EMAIL_MAX_ATTEMPTS` próbach wiadomość oznaczana jest jako
+        niewysłana.
+        """
+        self.attempts += 1
+        self.last_error = str(error)
+        if self.attempts >= EMAIL_MAX_ATTEMPTS:
+            self.status = EmailStatus.FAILED
+            return
+
+        delay = min(
+            EMAIL_RETRY_DELAY * 2 ** (self.attempts - 1), EMAIL_MAX_RETRY_DELAY
+        )
+        self.next_attempt_at = now + delay
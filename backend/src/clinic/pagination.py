@@ -1,5 +1,419 @@
+import base64
+import hashlib
+import json
+from collections import OrderedDict
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import connections
+from django.db.models import Q
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.filters import OrderingFilter
 from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+TIE_BREAKER_FIELD = "readable_id"
+COUNT_CACHE_KEY = "clinic:count:{digest}"
+
+
+class ExactCount:
+    """
+    Dokładna liczba rekordów wyznaczana zapytaniem `COUNT(*)`.
+    """
+
+    def get_count(self, queryset, paginator) -> int:
+        return queryset.count()
+
+
+class EstimatedCount(ExactCount):
+    """
+    Liczba rekordów szacowana przez planer PostgreSQL.
+
+    Szacunek odczytywany jest z planu `EXPLAIN` zapytania (bez sortowania
+    i złączeń z `select_related`), który opiera się na statystykach tabel
+    (`reltuples`) i selektywności filtrów. Jeżeli szacunek nie przekracza
+    `threshold`, wykonywane jest dokładne zapytanie `COUNT(*)`, więc małe zbiory
+    wyników mają zawsze dokładną liczbę.
+    """
+
+    def __init__(self, threshold=10000):
+        self.threshold = threshold
+
+    def get_count(self, queryset, paginator) -> int:
+        estimate = self.estimate(queryset)
+        if estimate is not None and estimate > self.threshold:
+            return estimate
+        return super().get_count(queryset, paginator)
+
+    def estimate(self, queryset) -> int | None:
+        if connections[queryset.db].vendor != "postgresql":
+            return None
+
+        plan = json.loads(
+            queryset.select_related(None).order_by().explain(format="json")
+        )
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class CachedCount(ExactCount):
+    """
+    Dokładna liczba rekordów zapamiętywana na `timeout` sekund.
+
+    Klucz wyznaczany jest na podstawie ścieżki, użytkownika i parametrów
+    zapytania z pominięciem parametrów paginacji i sortowania, dzięki czemu
+    kolejne strony tej samej listy korzystają z jednego wyniku `COUNT(*)`.
+    """
+
+    def __init__(self, timeout=30):
+        self.timeout = timeout
+
+    def get_count(self, queryset, paginator) -> int:
+        cache_key = self.get_cache_key(paginator)
+        count = cache.get(cache_key)
+        if count is None:
+            count = super().get_count(queryset, paginator)
+            cache.set(cache_key, count, timeout=self.timeout)
+        return count
+
+    def get_cache_key(self, paginator) -> str:
+        request = paginator.request
+        ignored = {
+            paginator.limit_query_param,
+            paginator.offset_query_param,
+            paginator.count_query_param,
+            api_settings.ORDERING_PARAM,
+        }
+        params = sorted(
+            (key, value)
+            for key, values in request.query_params.lists()
+            if key not in ignored
+            for value in values
+        )
+        payload = json.dumps(
+            [request.path, str(request.user.pk), params],
+            separators=(",", ":"),
+        )
+        digest = hashlib.sha256(payload.encode()).hexdigest()
+        return COUNT_CACHE_KEY.format(digest=digest)
 
 
 class StandardResultsSetPagination(LimitOffsetPagination):
+    """
+    Paginacja limit/offset z opcjonalnym trybem kursorowym (keyset).
+
+    Tryb kursorowy włączany jest parametrem `?pagination=cursor` (lub przekazaniem
+    `?cursor=`) w widokach, które definiują atrybut `cursor_ordering_fields`.
+    Kolejna strona wyznaczana jest warunkiem na wartościach pól sortowania
+    ostatniego rekordu, a nie przez OFFSET, więc koszt pobrania strony nie zależy
+    od jej numeru. W tym trybie nie jest wykonywane zapytanie `COUNT(*)`.
+
+    Sposób wyznaczania liczby rekordów określa atrybut widoku `count_strategy`
+    (domyślnie `ExactCount`). Parametr `?count=false` pomija liczbę rekordów
+    – pobierany jest wtedy jeden rekord więcej niż limit, aby ustalić,
+    czy istnieje kolejna strona.
+
+    Kolejność zawsze uzupełniana jest o pole `readable_id`, dzięki czemu jest
+    jednoznaczna i kursory pozostają stabilne.
+    """
+
     max_limit = 100
+    pagination_query_param = "pagination"
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+    default_count_strategy = ExactCount()
+    invalid_cursor_message = _("Nieprawidłowy kursor.")
+    invalid_ordering_message = _(
+        "Paginacja kursorowa nie obsługuje sortowania po polu {field}."
+    )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.view = view
+        self.use_cursor = self.is_cursor_requested(request, view)
+        self.use_count = self.is_count_requested(request)
+        if self.use_cursor:
+            return self.paginate_queryset_by_cursor(queryset, request, view)
+        if not self.use_count:
+            return self.paginate_queryset_without_count(queryset, request)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_count(self, queryset):
+        strategy = getattr(
+            self.view, "count_strategy", self.default_count_strategy
+        )
+        return strategy.get_count(queryset, self)
+
+    def get_next_link(self):
+        if self.use_count:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(
+            url, self.offset_query_param, self.offset + self.limit
+        )
+
+    def get_paginated_response(self, data):
+        if not self.use_cursor and self.use_count:
+            return super().get_paginated_response(data)
+
+        if not self.use_cursor:
+            return Response(
+                OrderedDict(
+                    (
+                        ("next", self.get_next_link()),
+                        ("previous", self.get_previous_link()),
+                        ("results", data),
+                    )
+                )
+            )
+
+        return Response(
+            OrderedDict(
+                (
+                    ("next", self.get_next_cursor_link()),
+                    ("previous", self.get_previous_cursor_link()),
+                    ("results", data),
+                )
+            )
+        )
+
+    def get_paginated_response_schema(self, schema):
+        paginated_schema = super().get_paginated_response_schema(schema)
+        # W trybie kursorowym i z `?count=false` pole `count` nie jest zwracane
+        paginated_schema.pop("required", None)
+        return paginated_schema
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view) + [
+            {
+                "name": self.count_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Set to `false` to omit the total count.",
+                "schema": {"type": "boolean"},
+            },
+        ]
+        if not getattr(view, "cursor_ordering_fields", None):
+            return parameters
+
+        return parameters + [
+            {
+                "name": self.pagination_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Set to `cursor` to use keyset pagination.",
+                "schema": {"type": "string", "enum": ["cursor"]},
+            },
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            },
+        ]
+
+    def is_cursor_requested(self, request, view):
+        """
+        Sprawdza, czy w żądaniu wybrano paginację kursorową.
+        """
+        if not getattr(view, "cursor_ordering_fields", None):
+            return False
+
+        return (
+            request.query_params.get(self.pagination_query_param) == "cursor"
+            or self.cursor_query_param in request.query_params
+        )
+
+    def is_count_requested(self, request):
+        """
+        Sprawdza, czy klient nie zrezygnował z liczby rekordów.
+        """
+        value = request.query_params.get(self.count_query_param, "")
+        return value.lower() not in ("false", "0")
+
+    def paginate_queryset_without_count(self, queryset, request):
+        """
+        Zwraca stronę wyników limit/offset bez zapytania `COUNT(*)`.
+        """
+        self.request = request
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+
+        self.offset = self.get_offset(request)
+        results = list(queryset[self.offset : self.offset + self.limit + 1])
+        self.has_next = len(results) > self.limit
+        return results[: self.limit]
+
+    def paginate_queryset_by_cursor(self, queryset, request, view):
+        """
+        Zwraca stronę wyników wskazaną kursorem.
+
+        Pobierany jest jeden rekord więcej niż limit, aby ustalić,
+        czy istnieje kolejna strona.
+        """
+        self.request = request
+        self.limit = self.get_limit(request) or self.max_limit
+        self.ordering = self.get_cursor_ordering(request, queryset, view)
+
+        values, reverse = self.decode_cursor(request, queryset.model)
+        ordering = self.ordering
+        if reverse:
+            ordering = tuple(self.invert(field) for field in ordering)
+
+        queryset = queryset.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(
+                self.get_keyset_condition(ordering, values)
+            )
+
+        results = list(queryset[: self.limit + 1])
+        has_more = len(results) > self.limit
+        results = results[: self.limit]
+
+        if reverse:
+            results.reverse()
+            self.has_next = values is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = values is not None
+
+        self.page = results
+        return results
+
+    def get_cursor_ordering(self, request, queryset, view):
+        """
+        Wyznacza kolejność sortowania dla paginacji kursorowej.
+
+        Pierwsze pole pochodzi z parametru `ordering` (lub domyślnej kolejności
+        widoku) i musi należeć do `cursor_ordering_fields`. Kolejność jest
+        uzupełniana o `readable_id` w tym samym kierunku.
+        """
+        ordering = None
+        for backend in view.filter_backends:
+            if issubclass(backend, OrderingFilter):
+                ordering = backend().get_ordering(request, queryset, view)
+                break
+
+        field = (ordering or (TIE_BREAKER_FIELD,))[0]
+        field_name = field.lstrip("-")
+        if field_name not in view.cursor_ordering_fields:
+            raise ValidationError(
+                {
+                    "ordering": [
+                        self.invalid_ordering_message.format(field=field_name)
+                    ]
+                }
+            )
+
+        if field_name == TIE_BREAKER_FIELD:
+            return (field,)
+
+        descending = field.startswith("-")
+        return (
+            field,
+            f"-{TIE_BREAKER_FIELD}" if descending else TIE_BREAKER_FIELD,
+        )
+
+    @staticmethod
+    def invert(field):
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+    @staticmethod
+    def get_keyset_condition(ordering, values):
+        """
+        Buduje warunek wybierający rekordy występujące po wskazanej pozycji.
+
+        Dla sortowania (pole, readable_id) warunek ma postać
+        `pole >= v AND (pole > v OR readable_id > r)`, dzięki czemu pierwsza
+        część może zostać obsłużona przez indeks na sortowanym polu.
+        """
+        descending = ordering[0].startswith("-")
+        after, after_or_equal = ("lt", "lte") if descending else ("gt", "gte")
+        names = tuple(field.lstrip("-") for field in ordering)
+
+        if len(names) == 1:
+            return Q(**{f"{names[0]}__{after}": values[0]})
+
+        return Q(**{f"{names[0]}__{after_or_equal}": values[0]}) & (
+            Q(**{f"{names[0]}__{after}": values[0]})
+            | Q(**{names[0]: values[0], f"{names[1]}__{after}": values[1]})
+        )
+
+    def encode_cursor(self, instance, reverse):
+        values = tuple(
+            getattr(instance, field.lstrip("-")) for field in self.ordering
+        )
+        payload = {
+            "o": self.ordering,
+            "v": tuple(
+                value.isoformat() if hasattr(value, "isoformat") else value
+                for value in values
+            ),
+            "r": reverse,
+        }
+        encoded = base64.urlsafe_b64encode(
+            json.dumps(payload, separators=(",", ":")).encode()
+        ).decode()
+        return replace_query_param(
+            self.request.build_absolute_uri(), self.cursor_query_param, encoded
+        )
+
+    def decode_cursor(self, request, model):
+        """
+        Odczytuje pozycję i kierunek z parametru `cursor`.
+
+        Kursor utworzony dla innej kolejności sortowania lub zawierający
+        wartości niepasujące do typów pól sortowania (również puste – pola
+        sortowania nie przyjmują wartości NULL) jest odrzucany.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            ordering = tuple(payload["o"])
+            values = tuple(payload["v"])
+            reverse = bool(payload["r"])
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if (
+            ordering != tuple(self.ordering)
+            or len(values) != len(ordering)
+            or None in values
+        ):
+            raise NotFound(self.invalid_cursor_message)
+
+        try:
+            values = tuple(
+                model._meta.get_field(field.lstrip("-")).to_python(value)
+                for field, value in zip(ordering, values)
+            )
+        except (DjangoValidationError, TypeError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return values, reverse
+
+    def get_next_cursor_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_cursor_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(
+                self.request.build_absolute_uri(), self.cursor_query_param
+            )
+        return self.encode_cursor(self.page[0], reverse=True)
@@ -1,15 +1,22 @@
-from django.db.models import Value
-from django.db.models.functions import Concat
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db.models import Q
 from django_filters import rest_framework as filters
 
+from clinic.auth.choices import Role
+from clinic.choices import MatchMode
+from clinic.filters import MatchModeFilter, related_exists, split_values
+from clinic.lookups import FullName
 from clinic.roles.choices import Gender
-from clinic.roles.models import Doctor, Nurse, Patient
+from clinic.roles.models import Doctor, Nurse, Patient, PersonSearchDocument
+
+# Krótsze fragmenty nie mogą zostać wyszukane przez indeks trigramowy
+SEARCH_TERM_MIN_LENGTH = 3
 
 
 class BaseUserFilterSet(filters.FilterSet):
-    user__first_name = filters.CharFilter(lookup_expr="icontains")
-    user__last_name = filters.CharFilter(lookup_expr="icontains")
-    user__email = filters.CharFilter(lookup_expr="icontains")
+    user__first_name = filters.CharFilter(lookup_expr="ilike")
+    user__last_name = filters.CharFilter(lookup_expr="ilike")
+    user__email = filters.CharFilter(lookup_expr="ilike")
     readable_id = filters.NumberFilter()
     user__full_name = filters.CharFilter(method="filter_by_full_name")
 
@@ -22,20 +29,17 @@ class BaseUserFilterSet(filters.FilterSet):
         )
 
     def filter_by_full_name(self, queryset, name, value):
-        return queryset.annotate(
-            full_name=Concat(
-                "user__first_name",
-                Value(" "),
-                "user__last_name",
-            )
-        ).filter(full_name__icontains=value)
+        return queryset.alias(
+            full_name=FullName("user__first_name", "user__last_name")
+        ).filter(full_name__ilike=value)
 
 
 class DoctorFilterSet(BaseUserFilterSet):
-    job_execution_number = filters.CharFilter(lookup_expr="icontains")
+    job_execution_number = filters.CharFilter(lookup_expr="ilike")
     specializations__name = filters.CharFilter(
         method="filter_by_specializations_name"
     )
+    specializations__name_match = MatchModeFilter()
 
     readable_id = filters.NumberFilter()
 
@@ -44,18 +48,28 @@ class DoctorFilterSet(BaseUserFilterSet):
         fields = BaseUserFilterSet.Meta.fields + (
             "job_execution_number",
             "specializations__name",
+            "specializations__name_match",
         )
 
     def filter_by_specializations_name(self, queryset, name, value):
         """
-        Filters doctors based on the names of specializations.
+        Filters doctors having any (or, with `specializations__name_match=all`,
+        all) of the comma-separated specialization names.
         """
-        names = value.split(",")
-        return queryset.filter(specializations__name__in=names).distinct()
+        return queryset.filter(
+            *related_exists(
+                Doctor.specializations.through,
+                "doctor",
+                "specialization__name",
+                split_values(value),
+                self.form.cleaned_data.get("specializations__name_match")
+                or MatchMode.ANY,
+            )
+        )
 
 
 class NurseFilterSet(BaseUserFilterSet):
-    nursing_license_number = filters.CharFilter(lookup_expr="icontains")
+    nursing_license_number = filters.CharFilter(lookup_expr="ilike")
 
     class Meta:
         model = Nurse
@@ -63,7 +77,7 @@ class NurseFilterSet(BaseUserFilterSet):
 
 
 class PatientFilterSet(BaseUserFilterSet):
-    pesel = filters.CharFilter(lookup_expr="icontains")
+    pesel = filters.CharFilter(lookup_expr="ilike")
     birth_date = filters.DateFromToRangeFilter()
     gender = filters.ChoiceFilter(choices=Gender.choices)
 
@@ -74,3 +88,48 @@ class PatientFilterSet(BaseUserFilterSet):
             "birth_date",
             "gender",
         )
+
+
+class PersonSearchFilterSet(filters.FilterSet):
+    q = filters.CharFilter(
+        method="filter_by_query",
+        required=True,
+        min_length=SEARCH_TERM_MIN_LENGTH,
+    )
+    role = filters.ChoiceFilter(
+        choices=[
+            (value, label)
+            for value, label in Role.choices
+            if value != Role.ADMIN
+        ]
+    )
+
+    class Meta:
+        model = PersonSearchDocument
+        fields = ("q", "role")
+
+    def filter_by_query(self, queryset, name, value):
+        """
+        Wyszukiwanie dokumentów zawierających każde słowo zapytania,
+        uszeregowanych według podobieństwa trigramowego do całego zapytania.
+
+        Słowa krótsze niż trzy znaki są pomijane, ponieważ nie mogą zostać
+        obsłużone przez indeks trigramowy.
+        """
+        terms = [
+            term
+            for term in value.split()
+            if len(term) >= SEARCH_TERM_MIN_LENGTH
+        ]
+        if not terms:
+            return queryset.none()
+
+        condition = Q()
+        for term in terms:
+            condition &= Q(document__ilike=term)
+
+        return (
+            queryset.filter(condition)
+            .annotate(rank=TrigramWordSimilarity(value, "document"))
+            .order_by("-rank", "full_name", "pk")
+        )
@@ -1,9 +1,11 @@
 import datetime
 
+from django.contrib.postgres.indexes import GinIndex
 from django.core.validators import MinLengthValidator
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
+from clinic.auth.choices import Role
 from clinic.auth.models import User
 from clinic.dictionaries.models import Specialization
 from clinic.models import Address, BaseModel
@@ -38,6 +40,13 @@ class Doctor(BaseModel):
     class Meta:
         verbose_name = _("doctor")
         verbose_name_plural = _("doctors")
+        indexes = (
+            GinIndex(
+                fields=("job_execution_number",),
+                opclasses=("gin_trgm_ops",),
+                name="clinic_doctor_job_number_trgm",
+            ),
+        )
 
     def delete(self, *args, **kwargs):
         user = self.user
@@ -66,6 +75,13 @@ class Nurse(BaseModel):
     class Meta:
         verbose_name = _("nurse")
         verbose_name_plural = _("nurses")
+        indexes = (
+            GinIndex(
+                fields=("nursing_license_number",),
+                opclasses=("gin_trgm_ops",),
+                name="clinic_nurse_license_trgm",
+            ),
+        )
 
     def delete(self, *args, **kwargs):
         user = self.user
@@ -114,6 +130,13 @@ class Patient(BaseModel):
     class Meta:
         verbose_name = _("patient")
         verbose_name_plural = _("patients")
+        indexes = (
+            GinIndex(
+                fields=("pesel",),
+                opclasses=("gin_trgm_ops",),
+                name="clinic_patient_pesel_trgm",
+            ),
+        )
 
     def save(self, *args, **kwargs):
         self.gender = (
@@ -168,3 +191,47 @@ class Patient(BaseModel):
 
     def __str__(self):
         return f"{self.user.full_name} ({self.pesel})"
+
+
+class PersonSearchDocument(models.Model):
+    """
+    Zdenormalizowany dokument wyszukiwania osoby (pacjenta, lekarza lub pielęgniarki).
+
+    Dokument przechowuje dane z tabel użytkownika, profilu roli i adresu,
+    a pole `document` łączy je w jeden tekst objęty indeksem trigramowym.
+    Identyfikator dokumentu jest identyfikatorem profilu roli. Dokumenty
+    aktualizowane są przy zapisie powiązanych obiektów
+    (`clinic.roles.search`).
+    """
+
+    id = models.UUIDField(_("id"), primary_key=True)
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        related_name="search_document",
+        verbose_name=_("user"),
+    )
+    role = models.CharField(_("role"), max_length=1, choices=Role.choices)
+    readable_id = models.PositiveIntegerField(_("readable id"))
+    full_name = models.CharField(_("full name"), max_length=61)
+    email = models.EmailField(_("email address"), max_length=255)
+    pesel = models.CharField(_("PESEL"), max_length=11, blank=True)
+    license_number = models.CharField(
+        _("license number"), max_length=7, blank=True
+    )
+    city = models.CharField(_("city"), max_length=50, blank=True)
+    document = models.TextField(_("document"))
+
+    class Meta:
+        verbose_name = _("person search document")
+        verbose_name_plural = _("person search documents")
+        indexes = (
+            GinIndex(
+                fields=("document",),
+                opclasses=("gin_trgm_ops",),
+                name="clinic_search_document_trgm",
+            ),
+        )
+
+    def __str__(self):
+        return f"{self.full_name} ({self.get_role_display()})"
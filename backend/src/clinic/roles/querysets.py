@@ -1,22 +1,49 @@
+from django.db.models import Q
+
 from clinic.auth.choices import Role
-from clinic.roles.models import Doctor, Nurse, Patient
+from clinic.roles.models import Doctor, Nurse, Patient, PersonSearchDocument
 
 
-def get_doctor_queryset(user):
-    if user.role in (Role.DOCTOR, Role.ADMIN, Role.NURSE):
+def get_doctor_queryset(principal):
+    if principal.role in (Role.DOCTOR, Role.ADMIN, Role.NURSE):
         return Doctor.objects.all()
 
     return Doctor.objects.none()
 
 
-def get_nurse_queryset(user):
-    if user.role in (Role.ADMIN, Role.DOCTOR, Role.NURSE):
+def get_nurse_queryset(principal):
+    if principal.role in (Role.ADMIN, Role.DOCTOR, Role.NURSE):
         return Nurse.objects.all()
     return Nurse.objects.none()
 
 
-def get_patient_queryset(user):
-    if user.role in (Role.ADMIN, Role.DOCTOR, Role.NURSE):
+def get_patient_queryset(principal):
+    if principal.role in (Role.ADMIN, Role.DOCTOR, Role.NURSE):
         return Patient.objects.all()
 
-    return Patient.objects.filter(user=user)
+    return Patient.objects.filter(pk=principal.patient_id)
+
+
+def get_person_search_queryset(principal):
+    """
+    Dokumenty wyszukiwania osób widocznych dla użytkownika.
+
+    Zakres wyznaczany jest regułami `get_*_queryset` dla każdej roli.
+    Gdy reguła nie zawęża wyników, warunek ogranicza się do roli dokumentu,
+    dzięki czemu wyszukiwanie personelu nie wymaga podzapytań.
+    """
+    condition = Q(pk__in=[])
+    for role, queryset in (
+        (Role.PATIENT, get_patient_queryset(principal)),
+        (Role.DOCTOR, get_doctor_queryset(principal)),
+        (Role.NURSE, get_nurse_queryset(principal)),
+    ):
+        if queryset.query.is_empty():
+            continue
+
+        role_condition = Q(role=role)
+        if queryset.query.has_filters():
+            role_condition &= Q(pk__in=queryset.values("pk"))
+        condition |= role_condition
+
+    return PersonSearchDocument.objects.filter(condition)
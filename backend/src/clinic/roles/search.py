@@ -0,0 +1,137 @@
+from itertools import islice
+
+from clinic.auth.choices import Role
+from clinic.roles.models import Doctor, Nurse, Patient, PersonSearchDocument
+
+PROFILE_MODELS = {
+    Role.PATIENT: Patient,
+    Role.DOCTOR: Doctor,
+    Role.NURSE: Nurse,
+}
+PROFILE_ROLES = {model: role for role, model in PROFILE_MODELS.items()}
+
+# Pola użytkownika, których zmiana wymaga aktualizacji dokumentu
+USER_SEARCH_FIELDS = frozenset(("first_name", "last_name", "email", "role"))
+
+DOCUMENT_FIELDS = (
+    "user",
+    "role",
+    "readable_id",
+    "full_name",
+    "email",
+    "pesel",
+    "license_number",
+    "city",
+    "document",
+)
+
+
+def build_search_document(profile, role) -> PersonSearchDocument:
+    """
+    Utworzenie dokumentu wyszukiwania na podstawie profilu roli.
+    """
+    pesel = license_number = city = ""
+    if role == Role.PATIENT:
+        pesel = profile.pesel
+        city = profile.address.city
+    elif role == Role.DOCTOR:
+        license_number = profile.job_execution_number
+    elif role == Role.NURSE:
+        license_number = profile.nursing_license_number
+
+    user = profile.user
+    document = PersonSearchDocument(
+        id=profile.id,
+        user=user,
+        role=role,
+        readable_id=profile.readable_id,
+        full_name=user.full_name,
+        email=user.email,
+        pesel=pesel,
+        license_number=license_number,
+        city=city,
+    )
+    document.document = " ".join(
+        value
+        for value in (
+            document.full_name,
+            document.email,
+            document.pesel,
+            document.license_number,
+            document.city,
+        )
+        if value
+    )
+    return document
+
+
+def refresh_search_documents(queryset, batch_size=1000) -> int:
+    """
+    Utworzenie lub aktualizacja dokumentów wyszukiwania profili z querysetu.
+
+    Profile pobierane są partiami razem z użytkownikiem (i adresem pacjenta),
+    a dokumenty zapisywane jednym zapytaniem `INSERT ... ON CONFLICT` na partię.
+    Zwraca liczbę zapisanych dokumentów.
+    """
+    role = PROFILE_ROLES[queryset.model]
+    related = ("user", "address") if role == Role.PATIENT else ("user",)
+    profiles = queryset.select_related(*related).iterator(
+        chunk_size=batch_size
+    )
+
+    refreshed = 0
+    while batch := list(islice(profiles, batch_size)):
+        PersonSearchDocument.objects.bulk_create(
+            [build_search_document(profile, role) for profile in batch],
+            update_conflicts=True,
+            unique_fields=("id",),
+            update_fields=DOCUMENT_FIELDS,
+        )
+        refreshed += len(batch)
+    return refreshed
+
+
+def update_profile_search_document(sender, instance, **kwargs):
+    """
+    Aktualizacja dokumentu wyszukiwania po zapisie profilu roli.
+    """
+    refresh_search_documents(sender.objects.filter(pk=instance.pk))
+
+
+def delete_profile_search_document(sender, instance, **kwargs):
+    """
+    Usunięcie dokumentu wyszukiwania po usunięciu profilu roli.
+    """
+    PersonSearchDocument.objects.filter(pk=instance.pk).delete()
+
+
+def update_user_search_document(
+    sender, instance, update_fields=None, **kwargs
+):
+    """
+    Aktualizacja dokumentu wyszukiwania po zmianie danych użytkownika.
+
+    Zapis innych pól (np. `is_logged_in` przy logowaniu) nie zmienia dokumentu.
+    """
+    if update_fields is not None and not USER_SEARCH_FIELDS.intersection(
+        update_fields
+    ):
+        return
+
+    model = PROFILE_MODELS.get(instance.role)
+    if model is not None:
+        refresh_search_documents(model.objects.filter(user_id=instance.pk))
+
+
+def update_address_search_documents(sender, instance, created=False, **kwargs):
+    """
+    Aktualizacja dokumentów wyszukiwania pacjentów po zmianie adresu.
+
+    Nowy adres nie jest jeszcze przypisany do żadnego pacjenta – dokument
+    zostaje zaktualizowany przy zapisie pacjenta, do którego adres zostanie
+    przypisany.
+    """
+    if not created:
+        refresh_search_documents(
+            Patient.objects.filter(address_id=instance.pk)
+        )
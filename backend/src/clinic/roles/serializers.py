@@ -2,7 +2,7 @@ from rest_framework import serializers
 
 from clinic.auth.serializers import UserReadSerializer
 from clinic.dictionaries.serializers import SpecializationSerializer
-from clinic.roles.models import Doctor, Nurse, Patient
+from clinic.roles.models import Doctor, Nurse, Patient, PersonSearchDocument
 from clinic.serializers import AddressReadSerializer, AddressWriteSerializer
 
 
@@ -144,3 +144,19 @@ class PatientWriteSerializer(PatientBaseSerializer):
         # Zwrócenie reprezentacji szczegółowej pacjenta po zapisie
         serializer = PatientDetailSerializer(instance)
         return serializer.data
+
+
+class PersonSearchSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = PersonSearchDocument
+        fields = (
+            "id",
+            "readable_id",
+            "role",
+            "full_name",
+            "email",
+            "pesel",
+            "license_number",
+            "city",
+        )
+        read_only_fields = fields
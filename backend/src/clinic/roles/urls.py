@@ -1,12 +1,18 @@
 from django.urls import include, path
 from rest_framework.routers import SimpleRouter
 
-from clinic.roles.views import DoctorViewSet, NurseViewSet, PatientViewSet
+from clinic.roles.views import (
+    DoctorViewSet,
+    NurseViewSet,
+    PatientViewSet,
+    PersonSearchViewSet,
+)
 
 router = SimpleRouter()
 router.register(r"doctors", DoctorViewSet, basename="doctor")
 router.register(r"nurses", NurseViewSet, basename="nurse")
 router.register(r"patients", PatientViewSet, basename="patient")
+router.register(r"search", PersonSearchViewSet, basename="person-search")
 
 urlpatterns = [
     path("", include(router.urls)),
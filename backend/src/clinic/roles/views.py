@@ -1,22 +1,25 @@
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema
-from rest_framework import viewsets
+from rest_framework import mixins, viewsets
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.filters import OrderingFilter
 
 from clinic.auth.choices import Role
+from clinic.mixins import PrincipalMixin
 from clinic.pagination import StandardResultsSetPagination
 from clinic.permissions import IsAdmin, IsDoctor, IsNurse, IsPatient
 from clinic.roles.filters import (
     DoctorFilterSet,
     NurseFilterSet,
     PatientFilterSet,
+    PersonSearchFilterSet,
 )
 from clinic.roles.models import Doctor, Nurse, Patient
 from clinic.roles.querysets import (
     get_doctor_queryset,
     get_nurse_queryset,
     get_patient_queryset,
+    get_person_search_queryset,
 )
 from clinic.roles.serializers import (
     DoctorReadSerializer,
@@ -25,6 +28,7 @@ from clinic.roles.serializers import (
     PatientDetailSerializer,
     PatientListSerializer,
     PatientWriteSerializer,
+    PersonSearchSerializer,
 )
 from clinic.throttling import DoctorRateThrottle, PatientRateThrottle
 
@@ -34,7 +38,7 @@ from clinic.throttling import DoctorRateThrottle, PatientRateThrottle
     request=DoctorWriteSerializer,
     responses={200: DoctorReadSerializer},
 )
-class DoctorViewSet(viewsets.ModelViewSet):
+class DoctorViewSet(PrincipalMixin, viewsets.ModelViewSet):
     permission_classes = (IsNurse | IsDoctor | IsAdmin,)
     queryset = Doctor.objects.all()
     filter_backends = (DjangoFilterBackend, OrderingFilter)
@@ -48,6 +52,7 @@ class DoctorViewSet(viewsets.ModelViewSet):
         "readable_id",
     )
     pagination_class = StandardResultsSetPagination
+    cursor_ordering_fields = ("readable_id",)
     http_method_names = ("get", "patch", "delete", "head", "options")
 
     def get_serializer_class(self):
@@ -69,16 +74,19 @@ class DoctorViewSet(viewsets.ModelViewSet):
         return super().get_throttles()
 
     def get_queryset(self):
-        return get_doctor_queryset(self.request.user)
+        return get_doctor_queryset(self.principal)
 
     def partial_update(self, request, *args, **kwargs):
         instance = self.get_object()
-        if request.user.role == Role.DOCTOR and request.user != instance.user:
+        if (
+            self.principal.role == Role.DOCTOR
+            and instance.pk != self.principal.doctor_id
+        ):
             raise PermissionDenied
         return super().partial_update(request, *args, **kwargs)
 
 
-class NurseViewSet(viewsets.ReadOnlyModelViewSet):
+class NurseViewSet(PrincipalMixin, viewsets.ReadOnlyModelViewSet):
     serializer_class = NurseSerializer
     permission_classes = (IsNurse | IsDoctor | IsAdmin,)
     queryset = Nurse.objects.all()
@@ -93,9 +101,10 @@ class NurseViewSet(viewsets.ReadOnlyModelViewSet):
         "readable_id",
     )
     pagination_class = StandardResultsSetPagination
+    cursor_ordering_fields = ("readable_id",)
 
     def get_queryset(self):
-        return get_nurse_queryset(self.request.user)
+        return get_nurse_queryset(self.principal)
 
 
 @extend_schema(
@@ -103,7 +112,7 @@ class NurseViewSet(viewsets.ReadOnlyModelViewSet):
     request=PatientWriteSerializer,
     responses={200: PatientDetailSerializer},
 )
-class PatientViewSet(viewsets.ModelViewSet):
+class PatientViewSet(PrincipalMixin, viewsets.ModelViewSet):
     permission_classes = (IsPatient | IsNurse | IsDoctor | IsAdmin,)
     queryset = Patient.objects.all()
     filter_backends = (DjangoFilterBackend, OrderingFilter)
@@ -117,6 +126,7 @@ class PatientViewSet(viewsets.ModelViewSet):
         "readable_id",
     )
     pagination_class = StandardResultsSetPagination
+    cursor_ordering_fields = ("readable_id",)
     http_method_names = ("get", "patch", "head", "options")
 
     def get_serializer_class(self):
@@ -135,7 +145,7 @@ class PatientViewSet(viewsets.ModelViewSet):
         return super().get_permissions()
 
     def get_queryset(self):
-        return get_patient_queryset(self.request.user)
+        return get_patient_queryset(self.principal)
 
     def get_throttles(self):
         if self.action == "partial_update":
@@ -144,9 +154,27 @@ class PatientViewSet(viewsets.ModelViewSet):
 
     def partial_update(self, request, *args, **kwargs):
         instance = self.get_object()
-        if (
-            instance.user.role == Role.PATIENT
-            and instance.user != request.user
-        ):
+        if instance.pk != self.principal.patient_id:
             raise PermissionDenied
         return super().partial_update(request, *args, **kwargs)
+
+
+class PersonSearchViewSet(
+    PrincipalMixin, mixins.ListModelMixin, viewsets.GenericViewSet
+):
+    """
+    Wspólne wyszukiwanie pacjentów, lekarzy i pielęgniarek.
+
+    Wyniki pochodzą z dokumentów wyszukiwania (`PersonSearchDocument`),
+    są uszeregowane według trafności i ograniczone do osób widocznych
+    dla użytkownika.
+    """
+
+    serializer_class = PersonSearchSerializer
+    permission_classes = (IsPatient | IsNurse | IsDoctor | IsAdmin,)
+    filter_backends = (DjangoFilterBackend,)
+    filterset_class = PersonSearchFilterSet
+    pagination_class = StandardResultsSetPagination
+
+    def get_queryset(self):
+        return get_person_search_queryset(self.principal)
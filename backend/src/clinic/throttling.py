@@ -1,13 +1,94 @@
-from rest_framework.throttling import UserRateThrottle
+import random
 
+from rest_framework.throttling import SimpleRateThrottle
 
-class DoctorRateThrottle(UserRateThrottle):
+from clinic.auth.choices import Role
+from clinic.models import ThrottleCounter
+
+
+class RoleRateThrottle(SimpleRateThrottle):
+    """
+    Ograniczenie częstotliwości żądań zależne od roli użytkownika.
+
+    Zakres (a więc limit z `DEFAULT_THROTTLE_RATES`) wybierany jest na podstawie
+    roli użytkownika, a dla niezalogowanych – `anon`. Żądania zliczane są
+    w stałych oknach czasowych w tabeli `ThrottleCounter`, jedną atomową
+    operacją na żądanie, więc limity obowiązują łącznie dla wszystkich
+    procesów i serwerów aplikacji.
+
+    Średnio co `cleanup_interval` żądań usuwane są liczniki okien dłuższych
+    niż najdłuższy skonfigurowany okres, aby tabela nie rosła z liczbą
+    adresów IP i użytkowników.
+    """
+
+    cleanup_interval = 100
+
+    role_scopes = {
+        Role.DOCTOR: "doctor",
+        Role.NURSE: "nurse",
+        Role.PATIENT: "patient",
+        Role.ADMIN: "user",
+    }
+
+    def __init__(self):
+        # Zakres, a więc i limit, ustalany jest dopiero na podstawie żądania
+        pass
+
+    def get_scope(self, request):
+        if self.scope:
+            return self.scope
+        if not request.user.is_authenticated:
+            return "anon"
+        return self.role_scopes.get(request.user.role, "user")
+
+    def get_cache_key(self, request, view):
+        if request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return f"throttle:{self.get_scope(request)}:{ident}"
+
+    def allow_request(self, request, view):
+        rate = self.THROTTLE_RATES.get(self.get_scope(request))
+        if rate is None:
+            return True
+
+        self.num_requests, self.duration = self.parse_rate(rate)
+        self.now = self.timer()
+        window_start = int(self.now // self.duration * self.duration)
+        self.window_end = window_start + self.duration
+
+        count = ThrottleCounter.objects.hit(
+            self.get_cache_key(request, view), window_start
+        )
+        if random.randrange(self.cleanup_interval) == 0:
+            self.delete_expired_counters()
+        return count <= self.num_requests
+
+    def delete_expired_counters(self) -> int:
+        """
+        Usuwa liczniki okien, które zakończyły się dla każdego z limitów.
+        """
+        longest_duration = max(
+            self.parse_rate(rate)[1]
+            for rate in self.THROTTLE_RATES.values()
+            if rate is not None
+        )
+        return ThrottleCounter.objects.delete_expired(
+            int(self.now) - longest_duration
+        )
+
+    def wait(self):
+        return max(self.window_end - self.now, 0)
+
+
+class DoctorRateThrottle(RoleRateThrottle):
     scope = "doctor"
 
 
-class NurseRateThrottle(UserRateThrottle):
+class NurseRateThrottle(RoleRateThrottle):
     scope = "nurse"
 
 
-class PatientRateThrottle(UserRateThrottle):
+class PatientRateThrottle(RoleRateThrottle):
     scope = "patient"
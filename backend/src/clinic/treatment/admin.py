@@ -5,7 +5,8 @@ from django.urls import reverse
 from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
 
-from clinic.filters import MedicineAdminFilter
+from clinic.filters import MedicineAdminFilter, VisitStatusAdminFilter
+from clinic.treatment.choices import VisitStatus
 from clinic.treatment.models import Dosage, Prescription, Visit
 
 
@@ -13,7 +14,7 @@ class VisitAdminConfig(admin.ModelAdmin):
     model = Visit
     search_fields = ("doctor__job_execution_number", "patient__pesel")
     list_filter = (
-        "visit_status",
+        VisitStatusAdminFilter,
         "date",
         "disease",
         "office",
@@ -27,7 +28,7 @@ class VisitAdminConfig(admin.ModelAdmin):
         "doctor",
         "date",
         "predicted_end_date",
-        "visit_status",
+        "get_visit_status",
         "office",
         "is_remote",
         "disease",
@@ -52,13 +53,19 @@ class VisitAdminConfig(admin.ModelAdmin):
         ),
     )
 
+    def get_visit_status(self, obj):
+        return VisitStatus(obj.live_visit_status).label
+
+    get_visit_status.short_description = _("visit status")
+    get_visit_status.admin_order_field = "live_visit_status"
+
     def get_queryset(self, request):
         """
         Nadpisanie metody get_queryset w celu:
         1. Dodania adnotacji z pełnymi imionami i nazwiskami lekarza oraz pacjenta.
-        2. Dynamicznego przeliczenia statusów wizyt na podstawie aktualnego czasu.
+        2. Wyliczenia aktualnego statusu wizyty w zapytaniu (bez zapisu do bazy).
         """
-        queryset = super().get_queryset(request)
+        queryset = super().get_queryset(request).with_live_status()
         queryset = queryset.annotate(
             # Konkatenacja imienia i nazwiska lekarza w celu uzyskania pełnego imienia i nazwiska.
             full_name_doctor=Concat(
@@ -75,16 +82,6 @@ class VisitAdminConfig(admin.ModelAdmin):
                 output_field=CharField(),
             ),
         )
-
-        # Aktualizacja statusów wizyt w locie, jeśli wymagają zmiany
-        to_update = []
-        for visit in queryset:
-            if visit.refresh_visit_status_based_on_time():
-                to_update.append(visit)
-
-        if to_update:
-            Visit.objects.bulk_update(to_update, ["visit_status"])
-
         return queryset
 
     def get_search_results(self, request, queryset, search_term):
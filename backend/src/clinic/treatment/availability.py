@@ -0,0 +1,227 @@
+import heapq
+from collections import defaultdict
+from datetime import datetime, time, timedelta, timezone
+from itertools import islice
+
+from django.db.models import Q
+from django.utils.timezone import localtime, make_aware
+
+from clinic.dictionaries.models import Office
+from clinic.roles.models import Doctor
+from clinic.treatment.models import Visit
+
+
+def merge_intervals(intervals):
+    """
+    Scala nachodzące na siebie lub stykające się przedziały [start, end).
+
+    Argumenty:
+        intervals: Iterowalny zbiór par (start, end).
+
+    Zwraca:
+        list: Posortowana lista rozłącznych przedziałów.
+    """
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return [tuple(interval) for interval in merged]
+
+
+def subtract_intervals(windows, busy):
+    """
+    Odejmuje zajęte przedziały od okien czasowych w jednym przebiegu.
+
+    Obie listy muszą być posortowane i rozłączne (np. wynik `merge_intervals`).
+    """
+    free = []
+    busy_index = 0
+
+    for window_start, window_end in windows:
+        cursor = window_start
+
+        # Pominięcie zajętości kończących się przed bieżącym oknem
+        while busy_index < len(busy) and busy[busy_index][1] <= cursor:
+            busy_index += 1
+
+        index = busy_index
+        while index < len(busy) and busy[index][0] < window_end:
+            busy_start, busy_end = busy[index]
+            if busy_start > cursor:
+                free.append((cursor, busy_start))
+            cursor = max(cursor, busy_end)
+            index += 1
+
+        if cursor < window_end:
+            free.append((cursor, window_end))
+
+    return free
+
+
+def intersect_intervals(first, second):
+    """
+    Wyznacza część wspólną dwóch posortowanych list rozłącznych przedziałów.
+    """
+    result = []
+    i = j = 0
+
+    while i < len(first) and j < len(second):
+        start = max(first[i][0], second[j][0])
+        end = min(first[i][1], second[j][1])
+        if start < end:
+            result.append((start, end))
+
+        if first[i][1] < second[j][1]:
+            i += 1
+        else:
+            j += 1
+
+    return result
+
+
+def build_windows(date_from, date_to, opening_time=None, closing_time=None):
+    """
+    Buduje okna czasowe, w których można umawiać wizyty.
+
+    Jeżeli podano godziny otwarcia, zakres dzielony jest na dzienne okna
+    (w strefie czasowej aplikacji), w przeciwnym razie zwracany jest cały zakres.
+    """
+    if opening_time is None and closing_time is None:
+        return [(date_from, date_to)]
+
+    opening_time = opening_time or time.min
+    closing_time = closing_time or time.max
+
+    windows = []
+    day = localtime(date_from).date()
+    last_day = localtime(date_to).date()
+
+    while day <= last_day:
+        start = max(make_aware(datetime.combine(day, opening_time)), date_from)
+        end = min(make_aware(datetime.combine(day, closing_time)), date_to)
+        if start < end:
+            windows.append((start, end))
+        day += timedelta(days=1)
+
+    return windows
+
+
+def find_free_slots(
+    date_from,
+    date_to,
+    duration_in_minutes,
+    specialization=None,
+    office_type=None,
+    patient=None,
+    opening_time=None,
+    closing_time=None,
+    limit=50,
+):
+    """
+    Wyszukuje wolne terminy, w których dostępni są jednocześnie lekarz i gabinet.
+
+    Wszystkie wizyty kolidujące z zakresem pobierane są jednym zapytaniem,
+    a następnie grupowane i scalane w pamięci w posortowane listy przedziałów
+    zajętości dla każdego lekarza, gabinetu (oraz opcjonalnie pacjenta).
+    Wolne terminy wyznaczane są przez odejmowanie i przecinanie tych list,
+    bez odpytywania bazy danych dla poszczególnych kandydatów.
+
+    Argumenty:
+        date_from, date_to: Zakres wyszukiwania.
+        duration_in_minutes: Wymagany czas trwania wizyty.
+        specialization: Nazwa specjalizacji lekarza (opcjonalnie).
+        office_type: Nazwa typu gabinetu (opcjonalnie).
+        patient: Pacjent, którego wizyty również należy uwzględnić (opcjonalnie).
+        opening_time, closing_time: Dzienne godziny przyjęć (opcjonalnie).
+        limit: Maksymalna liczba zwracanych terminów.
+
+    Zwraca:
+        list: Najwcześniejsze wolne terminy jako słowniki z kluczami
+        `doctor`, `office`, `start` i `end`.
+    """
+    # Wizyty muszą być umawiane w przyszłości
+    date_from = max(date_from, datetime.now(timezone.utc))
+    duration = timedelta(minutes=duration_in_minutes)
+
+    doctors = Doctor.objects.all()
+    if specialization:
+        doctors = doctors.filter(specializations__name=specialization)
+    doctor_ids = list(
+        doctors.order_by("readable_id").values_list("id", flat=True)
+    )
+
+    offices = Office.objects.all()
+    if office_type:
+        offices = offices.filter(office_type__name=office_type)
+    office_ids = list(
+        offices.order_by("readable_id").values_list("id", flat=True)
+    )
+
+    if not doctor_ids or not office_ids or date_from >= date_to:
+        return []
+
+    busy_condition = Q(doctor_id__in=doctor_ids) | Q(office_id__in=office_ids)
+    if patient:
+        busy_condition |= Q(patient=patient)
+
+    busy_visits = (
+        Visit.objects.overlapping(date_from, date_to)
+        .filter(busy_condition)
+        .values_list(
+            "doctor_id",
+            "office_id",
+            "patient_id",
+            "date",
+            "predicted_end_date",
+        )
+    )
+
+    doctor_busy = defaultdict(list)
+    office_busy = defaultdict(list)
+    patient_busy = []
+    for doctor_id, office_id, patient_id, start, end in busy_visits:
+        doctor_busy[doctor_id].append((start, end))
+        office_busy[office_id].append((start, end))
+        if patient and patient_id == patient.pk:
+            patient_busy.append((start, end))
+
+    windows = build_windows(date_from, date_to, opening_time, closing_time)
+    if patient:
+        windows = subtract_intervals(windows, merge_intervals(patient_busy))
+
+    def free_for(busy_by_resource, resource_id):
+        return subtract_intervals(
+            windows, merge_intervals(busy_by_resource[resource_id])
+        )
+
+    office_free = {
+        office_id: free_for(office_busy, office_id) for office_id in office_ids
+    }
+
+    def slots_for(doctor_id):
+        doctor_free = free_for(doctor_busy, doctor_id)
+        pair_slots = (
+            (start, doctor_id, office_id, end)
+            for office_id in office_ids
+            for start, end in intersect_intervals(
+                doctor_free, office_free[office_id]
+            )
+            if end - start >= duration
+        )
+        return sorted(pair_slots, key=lambda slot: slot[0])
+
+    # Scalanie posortowanych list terminów i pobranie tylko najwcześniejszych
+    earliest_slots = islice(
+        heapq.merge(
+            *(slots_for(doctor_id) for doctor_id in doctor_ids),
+            key=lambda slot: slot[0],
+        ),
+        limit,
+    )
+    return [
+        {"doctor": doctor_id, "office": office_id, "start": start, "end": end}
+        for start, doctor_id, office_id, end in earliest_slots
+    ]
@@ -1,24 +1,25 @@
-from django.db.models import Value
-from django.db.models.functions import Concat
+from django.db.models import Exists, OuterRef
 from django_filters import rest_framework as filters
+from rest_framework.filters import OrderingFilter
 
+from clinic.lookups import FullName
 from clinic.treatment.choices import VisitStatus
-from clinic.treatment.models import Prescription, Visit
+from clinic.treatment.models import Dosage, Prescription, Visit
 
 
 class BaseTreatmentFilterSet(filters.FilterSet):
-    patient__user__first_name = filters.CharFilter(lookup_expr="icontains")
-    patient__user__last_name = filters.CharFilter(lookup_expr="icontains")
+    patient__user__first_name = filters.CharFilter(lookup_expr="ilike")
+    patient__user__last_name = filters.CharFilter(lookup_expr="ilike")
     patient__user__full_name = filters.CharFilter(
         method="filter_by_patient_full_name"
     )
-    patient__pesel = filters.CharFilter(lookup_expr="icontains")
-    doctor__user__first_name = filters.CharFilter(lookup_expr="icontains")
-    doctor__user__last_name = filters.CharFilter(lookup_expr="icontains")
+    patient__pesel = filters.CharFilter(lookup_expr="ilike")
+    doctor__user__first_name = filters.CharFilter(lookup_expr="ilike")
+    doctor__user__last_name = filters.CharFilter(lookup_expr="ilike")
     doctor__user__full_name = filters.CharFilter(
         method="filter_by_doctor_full_name"
     )
-    doctor__job_execution_number = filters.CharFilter(lookup_expr="icontains")
+    doctor__job_execution_number = filters.CharFilter(lookup_expr="ilike")
     readable_id = filters.NumberFilter()
 
     class Meta:
@@ -33,28 +34,26 @@ class BaseTreatmentFilterSet(filters.FilterSet):
         )
 
     def filter_by_patient_full_name(self, queryset, name, value):
-        return queryset.annotate(
-            patient_full_name=Concat(
-                "patient__user__first_name",
-                Value(" "),
-                "patient__user__last_name",
+        return queryset.alias(
+            patient_full_name=FullName(
+                "patient__user__first_name", "patient__user__last_name"
             )
-        ).filter(patient_full_name__icontains=value)
+        ).filter(patient_full_name__ilike=value)
 
     def filter_by_doctor_full_name(self, queryset, name, value):
-        return queryset.annotate(
-            doctor_full_name=Concat(
-                "doctor__user__first_name",
-                Value(" "),
-                "doctor__user__last_name",
+        return queryset.alias(
+            doctor_full_name=FullName(
+                "doctor__user__first_name", "doctor__user__last_name"
             )
-        ).filter(doctor_full_name__icontains=value)
+        ).filter(doctor_full_name__ilike=value)
 
 
 class VisitFilter(BaseTreatmentFilterSet):
     date = filters.DateTimeFromToRangeFilter()
     duration_in_minutes = filters.RangeFilter()
-    visit_status = filters.ChoiceFilter(choices=VisitStatus.choices)
+    visit_status = filters.ChoiceFilter(
+        choices=VisitStatus.choices, method="filter_by_visit_status"
+    )
     office__office_type__name = filters.CharFilter(lookup_expr="icontains")
     office__floor = filters.RangeFilter()
     office__room_number = filters.RangeFilter()
@@ -76,13 +75,41 @@ class VisitFilter(BaseTreatmentFilterSet):
             "created_at",
         )
 
+    def filter_by_visit_status(self, queryset, name, value):
+        """
+        Filtrowanie wizyt po aktualnym statusie wyliczonym na podstawie czasu
+        wizyty.
+        """
+        return queryset.filter_by_live_status(value)
+
+
+class VisitOrderingFilter(OrderingFilter):
+    """
+    Sortowanie wizyt, w którym `visit_status` zastępowany jest statusem
+    wyliczanym w zapytaniu SQL.
+    """
+
+    ordering_aliases = {"visit_status": "live_visit_status"}
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return ordering
+
+        aliased_ordering = []
+        for term in ordering:
+            prefix = "-" if term.startswith("-") else ""
+            field = term.lstrip("-")
+            aliased_ordering.append(
+                prefix + self.ordering_aliases.get(field, field)
+            )
+        return aliased_ordering
+
 
 class PrescriptionFilter(BaseTreatmentFilterSet):
     issue_date = filters.DateFromToRangeFilter()
     expiry_date = filters.DateFromToRangeFilter()
-    medicine = filters.CharFilter(
-        field_name="dosages__medicine__name", lookup_expr="icontains"
-    )
+    medicine = filters.CharFilter(method="filter_by_medicine")
     visit = filters.ModelChoiceFilter(
         queryset=Visit.objects.all(),
         field_name="visit",
@@ -101,3 +128,18 @@ class PrescriptionFilter(BaseTreatmentFilterSet):
             "prescription_code",
             "description",
         )
+
+    def filter_by_medicine(self, queryset, name, value):
+        """
+        Filtrowanie recept zawierających dawkowanie leku, którego nazwa zawiera
+        podaną wartość. Każda recepta zwracana jest raz, niezależnie od liczby
+        pasujących dawkowań.
+        """
+        return queryset.filter(
+            Exists(
+                Dosage.objects.filter(
+                    prescription=OuterRef("pk"),
+                    medicine__name__icontains=value,
+                )
+            )
+        )
@@ -0,0 +1,262 @@
+from datetime import datetime, timezone
+
+from django.contrib.postgres.fields import (
+    DateRangeField,
+    DateTimeRangeField,
+    RangeBoundary,
+)
+from django.db import connection, models
+from django.db.backends.postgresql.psycopg_any import DateTimeTZRange
+from django.db.models import (
+    Case,
+    CharField,
+    Count,
+    Func,
+    Prefetch,
+    Q,
+    Value,
+    When,
+)
+from django.db.models.functions import Now
+
+from clinic.treatment.choices import VisitStatus
+
+
+class TsTzRange(Func):
+    """
+    Funkcja PostgreSQL `tstzrange(start, end, '[)')` budująca przedział czasu wizyty.
+    """
+
+    function = "TSTZRANGE"
+    output_field = DateTimeRangeField()
+
+    def __init__(self, start, end, **extra):
+        super().__init__(start, end, RangeBoundary(), **extra)
+
+
+class DateRange(Func):
+    """
+    Funkcja PostgreSQL `daterange(start, end, '[]')` budująca okres ważności recepty.
+    """
+
+    function = "DATERANGE"
+    output_field = DateRangeField()
+
+    def __init__(self, start, end, **extra):
+        super().__init__(
+            start,
+            end,
+            RangeBoundary(inclusive_lower=True, inclusive_upper=True),
+            **extra,
+        )
+
+
+PRESCRIPTION_CODE_SEQUENCE = "clinic_prescription_code_seq"
+PRESCRIPTION_CODE_SPACE = 10_000
+# Mnożnik względnie pierwszy z PRESCRIPTION_CODE_SPACE – przekształcenie
+# afiniczne jest wtedy permutacją zbioru kodów, więc kolejne wartości sekwencji
+# dają różne (i niepowiązane na pierwszy rzut oka) kody.
+PRESCRIPTION_CODE_MULTIPLIER = 7919
+PRESCRIPTION_CODE_OFFSET = 4051
+
+
+def permute_prescription_code(value: int) -> str:
+    """
+    Zamienia wartość sekwencji na 4-cyfrowy kod recepty.
+    """
+    code = (
+        value * PRESCRIPTION_CODE_MULTIPLIER + PRESCRIPTION_CODE_OFFSET
+    ) % PRESCRIPTION_CODE_SPACE
+    return f"{code:04d}"
+
+
+class VisitQuerySet(models.QuerySet):
+    @staticmethod
+    def live_status_q(status, now=None) -> Q:
+        """
+        Zwraca warunek wybierający wizyty, które w danej chwili mają wskazany status.
+
+        Warunek opiera się wyłącznie na porównaniach zakresowych pól `date`
+        i `predicted_end_date`, dzięki czemu może korzystać z ich indeksów.
+
+        Argumenty:
+            status: Jeden ze statusów `VisitStatus`.
+            now: Moment odniesienia (domyślnie `now()` po stronie bazy danych).
+        """
+        if now is None:
+            now = Now()
+
+        if status == VisitStatus.SCHEDULED:
+            return Q(date__gt=now)
+        if status == VisitStatus.IN_PROGRESS:
+            return Q(date__lte=now, predicted_end_date__gt=now)
+        return Q(predicted_end_date__lte=now)
+
+    def with_live_status(self, now=None):
+        """
+        Dodaje adnotację `live_visit_status` z aktualnym statusem wizyty.
+
+        Status wyliczany jest w SQL (`CASE WHEN`) na podstawie pól `date`,
+        `predicted_end_date` i bieżącego czasu, więc jest zawsze poprawny,
+        niezależnie od wartości zapisanej w kolumnie `visit_status`.
+        """
+        return self.annotate(
+            live_visit_status=Case(
+                *(
+                    When(self.live_status_q(status, now), then=Value(status))
+                    for status in (
+                        VisitStatus.SCHEDULED,
+                        VisitStatus.IN_PROGRESS,
+                    )
+                ),
+                default=Value(VisitStatus.COMPLETED),
+                output_field=CharField(max_length=1),
+            )
+        )
+
+    def with_read_relations(self):
+        """
+        Plan pobierania danych dla `VisitReadSerializer`.
+
+        Relacje jeden-do-jednego i wiele-do-jednego (lekarz, pacjent z adresem,
+        gabinet, choroba) dołączane są złączeniami, a specjalizacje lekarzy
+        pobierane jednym dodatkowym zapytaniem, dzięki czemu liczba zapytań
+        nie zależy od liczby wizyt na stronie.
+        """
+        return self.select_related(
+            "doctor__user",
+            "patient__user",
+            "patient__address__country",
+            "office__office_type",
+            "disease",
+        ).prefetch_related("doctor__specializations")
+
+    def filter_by_live_status(self, status, now=None):
+        """
+        Filtruje wizyty po aktualnym (wyliczonym z czasu) statusie.
+        """
+        return self.filter(self.live_status_q(status, now))
+
+    def overlapping(self, start, end):
+        """
+        Zwraca wizyty, których przedział czasu nachodzi na przedział [start, end).
+
+        Porównanie wykonywane jest operatorem `&&` na wyrażeniu `tstzrange`,
+        obsługiwanym przez indeksy GiST ograniczeń wykluczających modelu `Visit`.
+        """
+        return self.annotate(
+            period=TsTzRange("date", "predicted_end_date")
+        ).filter(period__overlap=DateTimeTZRange(start, end))
+
+    def count_conflicts(self, start, end, doctor, office, patient):
+        """
+        Zlicza kolizje terminu dla lekarza, gabinetu i pacjenta w jednym zapytaniu.
+
+        Zwraca:
+            dict: Liczba nakładających się wizyt dla kluczy `doctor`, `office` i `patient`.
+        """
+        return (
+            self.overlapping(start, end)
+            .filter(Q(doctor=doctor) | Q(office=office) | Q(patient=patient))
+            .aggregate(
+                doctor=Count("pk", filter=Q(doctor=doctor)),
+                office=Count("pk", filter=Q(office=office)),
+                patient=Count("pk", filter=Q(patient=patient)),
+            )
+        )
+
+    def refresh_visit_statuses(self, now=None) -> int:
+        """
+        Przesuwa statusy wizyt zgodnie z upływem czasu (SCHEDULED → IN_PROGRESS → COMPLETED).
+
+        Aktualizacja wykonywana jest zbiorczo, dwoma zapytaniami UPDATE po stronie bazy danych,
+        bez wczytywania wizyt do pamięci. Warunki oparte są na polach `visit_status`, `date`
+        oraz `predicted_end_date`, dla których zdefiniowane są indeksy.
+
+        Argumenty:
+            now: Moment, względem którego wyznaczane są statusy (domyślnie bieżący czas UTC).
+
+        Zwraca:
+            int: Liczba wizyt, których status uległ zmianie.
+        """
+        if now is None:
+            now = datetime.now(timezone.utc)
+
+        # Wizyty, które już się zakończyły (również te, które pominęły etap "w trakcie")
+        completed = self.filter(
+            visit_status__in=(VisitStatus.SCHEDULED, VisitStatus.IN_PROGRESS),
+            predicted_end_date__lte=now,
+        ).update(visit_status=VisitStatus.COMPLETED)
+
+        # Wizyty, które rozpoczęły się, ale jeszcze trwają
+        in_progress = self.filter(
+            visit_status=VisitStatus.SCHEDULED,
+            date__lte=now,
+            predicted_end_date__gt=now,
+        ).update(visit_status=VisitStatus.IN_PROGRESS)
+
+        return completed + in_progress
+
+
+class PrescriptionQuerySet(models.QuerySet):
+    def allocate_codes(self, count=1) -> list:
+        """
+        Przydziela kody dla nowych recept bez sprawdzania istniejących kodów.
+
+        Kody wyznaczane są z cyklicznej sekwencji PostgreSQL przekształconej
+        permutacją `permute_prescription_code`, więc ten sam kod pojawia się
+        ponownie dopiero po wykorzystaniu całej puli 10 000 kodów. Wszystkie
+        wartości pobierane są jednym zapytaniem (`nextval` z `generate_series`).
+
+        Argumenty:
+            count: Liczba kodów do przydzielenia.
+
+        Zwraca:
+            list: Lista kodów recept.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT nextval(%s) FROM generate_series(1, %s)",
+                (PRESCRIPTION_CODE_SEQUENCE, count),
+            )
+            return [permute_prescription_code(row[0]) for row in cursor]
+
+    def with_read_relations(self):
+        """
+        Plan pobierania danych dla `PrescriptionReadSerializer`.
+
+        Pacjent i lekarz dołączani są złączeniami zarówno bezpośrednio, jak i przez
+        wizytę (z której pochodzą dane, gdy recepta jest z nią powiązana).
+        Dawkowania wraz z lekami, ich typem, formą i składnikami pobierane są
+        dwoma dodatkowymi zapytaniami, niezależnie od liczby leków na recepcie.
+        """
+        dosage_model = self.model._meta.get_field("dosages").related_model
+        medicine_model = dosage_model._meta.get_field("medicine").related_model
+        medicine_ingredient_model = medicine_model._meta.get_field(
+            "medicine_ingredients"
+        ).related_model
+
+        return self.select_related(
+            "patient__user",
+            "patient__address__country",
+            "doctor__user",
+            "visit__patient__user",
+            "visit__patient__address__country",
+            "visit__doctor__user",
+        ).prefetch_related(
+            "doctor__specializations",
+            "visit__doctor__specializations",
+            Prefetch(
+                "dosages",
+                queryset=dosage_model.objects.select_related(
+                    "medicine__type_of_medicine", "medicine__form"
+                ).prefetch_related(
+                    Prefetch(
+                        "medicine__medicine_ingredients",
+                        queryset=medicine_ingredient_model.objects.select_related(
+                            "ingredient"
+                        ),
+                    )
+                ),
+            ),
+        )
@@ -1,12 +1,19 @@
-import random
 from datetime import datetime, timedelta, timezone
 
-from django.db import models
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import RangeOperators
+from django.db import IntegrityError, models, transaction
 from django.utils.translation import gettext_lazy as _
 from rest_framework.exceptions import ValidationError
 
 from clinic.models import BaseModel
 from clinic.treatment.choices import VisitStatus
+from clinic.treatment.managers import (
+    DateRange,
+    PrescriptionQuerySet,
+    TsTzRange,
+    VisitQuerySet,
+)
 from clinic.validators import PrescriptionCodeValidator
 
 
@@ -50,6 +57,8 @@ class Visit(BaseModel):
     predicted_end_date = models.DateTimeField(_("predicted end date"))
     created_at = models.DateTimeField(_("created at"), auto_now_add=True)
 
+    objects = VisitQuerySet.as_manager()
+
     def save(self, *args, **kwargs):
         self.predicted_end_date = self.date + timedelta(
             minutes=self.duration_in_minutes
@@ -63,6 +72,10 @@ class Visit(BaseModel):
         else:
             self.visit_status = VisitStatus.COMPLETED
 
+        # Adnotacja z `with_live_status` mogła zostać wyliczona przed zmianą daty
+        if hasattr(self, "live_visit_status"):
+            self.live_visit_status = self.visit_status
+
         super().save(*args, **kwargs)
 
     def refresh_visit_status_based_on_time(self) -> bool:
@@ -94,6 +107,50 @@ class Visit(BaseModel):
     class Meta:
         verbose_name = _("visit")
         verbose_name_plural = _("visits")
+        indexes = (
+            models.Index(
+                fields=("visit_status", "date"),
+                name="clinic_visit_status_date_idx",
+            ),
+            models.Index(
+                fields=("visit_status", "predicted_end_date"),
+                name="clinic_visit_status_end_idx",
+            ),
+            # Indeks obsługujący również paginację kursorową (date, readable_id)
+            models.Index(
+                fields=("date", "readable_id"),
+                name="clinic_visit_date_rid_idx",
+            ),
+            models.Index(
+                fields=("predicted_end_date",),
+                name="clinic_visit_end_date_idx",
+            ),
+        )
+        # Ograniczenia wykluczające (GiST, btree_gist) gwarantujące na poziomie bazy danych,
+        # że terminy wizyt lekarza, gabinetu i pacjenta nie nachodzą na siebie.
+        constraints = tuple(
+            ExclusionConstraint(
+                name=f"clinic_visit_{field}_no_overlap",
+                expressions=(
+                    (
+                        TsTzRange("date", "predicted_end_date"),
+                        RangeOperators.OVERLAPS,
+                    ),
+                    (field, RangeOperators.EQUAL),
+                ),
+                violation_error_message=message,
+            )
+            for field, message in (
+                ("doctor", _("Lekarz ma nakładającą się wizytę.")),
+                ("office", _("Gabinet nie jest dostępny w wybranym czasie.")),
+                ("patient", _("Pacjent ma nakładającą się wizytę.")),
+            )
+        )
+
+
+ACTIVE_PRESCRIPTION_CODE_CONSTRAINT = "clinic_prescription_active_code_unique"
+PRESCRIPTION_CODE_ATTEMPTS = 10
+PRESCRIPTION_VALIDITY_PERIOD = timedelta(days=30)
 
 
 class Prescription(BaseModel):
@@ -102,7 +159,6 @@ class Prescription(BaseModel):
         max_length=4,
         validators=(PrescriptionCodeValidator,),
         blank=True,
-        unique=True,
     )
     issue_date = models.DateField(_("issue date"), auto_now_add=True)
     expiry_date = models.DateField(_("expiry date"), null=True)
@@ -138,26 +194,59 @@ class Prescription(BaseModel):
         null=True,
     )
 
-    def generate_unique_prescription_code(self) -> str:
-        for i in range(10):
-            code = f"{random.randint(0, 9999):04d}"
-            if not Prescription.objects.filter(
-                prescription_code=code
-            ).exists():
-                return code
-        raise ValidationError(
-            _("Nie udało się wygenerować unikalnego kodu recepty.")
-        )
+    objects = PrescriptionQuerySet.as_manager()
+
+    @property
+    def effective_patient(self):
+        """
+        Pacjent recepty – w przypadku recepty powiązanej z wizytą pacjent z wizyty.
+        """
+        return self.visit.patient if self.visit_id else self.patient
+
+    @property
+    def effective_doctor(self):
+        """
+        Lekarz recepty – w przypadku recepty powiązanej z wizytą lekarz z wizyty.
+        """
+        return self.visit.doctor if self.visit_id else self.doctor
 
     def save(self, *args, **kwargs):
         if not self.issue_date:
             self.issue_date = datetime.now(timezone.utc).date()
 
-        if not self.prescription_code:
-            self.prescription_code = self.generate_unique_prescription_code()
+        self.expiry_date = self.issue_date + PRESCRIPTION_VALIDITY_PERIOD
 
-        self.expiry_date = self.issue_date + timedelta(days=30)
-        super().save(*args, **kwargs)
+        if self.prescription_code:
+            return super().save(*args, **kwargs)
+
+        # Kod przydzielany jest z sekwencji bez sprawdzania istniejących recept.
+        # Kolizja z aktywną receptą (np. z kodem nadanym przed wprowadzeniem
+        # sekwencji) jest zgłaszana przez ograniczenie wykluczające – dopiero
+        # wtedy pobierany jest kolejny kod, aby nie zużywać puli kodów.
+        for _attempt in range(PRESCRIPTION_CODE_ATTEMPTS):
+            (self.prescription_code,) = Prescription.objects.allocate_codes()
+            try:
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError as error:
+                if not self.is_active_code_violation(error):
+                    raise
+
+        self.prescription_code = ""
+        raise ValidationError(
+            _("Nie udało się wygenerować unikalnego kodu recepty.")
+        )
+
+    @staticmethod
+    def is_active_code_violation(error) -> bool:
+        """
+        Sprawdza, czy błąd wynika z powtórzenia kodu aktywnej recepty.
+        """
+        diag = getattr(error.__cause__, "diag", None)
+        return (
+            getattr(diag, "constraint_name", None)
+            == ACTIVE_PRESCRIPTION_CODE_CONSTRAINT
+        )
 
     def __str__(self):
         patient_str = f"Patient: {self.patient}"
@@ -169,6 +258,33 @@ class Prescription(BaseModel):
     class Meta:
         verbose_name = _("prescription")
         verbose_name_plural = _("prescriptions")
+        indexes = (
+            models.Index(
+                fields=("issue_date", "readable_id"),
+                name="clinic_prescr_issue_rid_idx",
+            ),
+            models.Index(
+                fields=("prescription_code",),
+                name="clinic_prescr_code_idx",
+            ),
+        )
+        # Kod recepty musi być unikalny tylko wśród recept, których okresy ważności
+        # się pokrywają – po upływie `expiry_date` kod może zostać użyty ponownie.
+        constraints = (
+            ExclusionConstraint(
+                name=ACTIVE_PRESCRIPTION_CODE_CONSTRAINT,
+                expressions=(
+                    (
+                        DateRange("issue_date", "expiry_date"),
+                        RangeOperators.OVERLAPS,
+                    ),
+                    ("prescription_code", RangeOperators.EQUAL),
+                ),
+                violation_error_message=_(
+                    "Kod recepty jest już używany przez aktywną receptę."
+                ),
+            ),
+        )
 
 
 class Dosage(models.Model):
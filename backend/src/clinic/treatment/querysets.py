@@ -2,19 +2,21 @@ from clinic.auth.choices import Role
 from clinic.treatment.models import Prescription, Visit
 
 
-def get_visit_queryset(user):
-    if user.role in (Role.ADMIN, Role.NURSE):
-        return Visit.objects.all()
-    elif user.role == Role.DOCTOR:
-        return Visit.objects.filter(doctor__user=user)
-    elif user.role == Role.PATIENT:
-        return Visit.objects.filter(patient__user=user)
-    return Visit.objects.none()
+def get_visit_queryset(principal):
+    queryset = Visit.objects.with_live_status()
 
+    if principal.role in (Role.ADMIN, Role.NURSE):
+        return queryset
+    elif principal.role == Role.DOCTOR:
+        return queryset.filter(doctor_id=principal.doctor_id)
+    elif principal.role == Role.PATIENT:
+        return queryset.filter(patient_id=principal.patient_id)
+    return queryset.none()
 
-def get_prescription_queryset(user):
-    if user.role in (Role.ADMIN, Role.DOCTOR):
+
+def get_prescription_queryset(principal):
+    if principal.role in (Role.ADMIN, Role.DOCTOR):
         return Prescription.objects.all()
-    elif user.role == Role.PATIENT:
-        return Prescription.objects.filter(patient__user=user)
+    elif principal.role == Role.PATIENT:
+        return Prescription.objects.filter(patient_id=principal.patient_id)
     return Prescription.objects.none()
@@ -1,5 +1,6 @@
 from datetime import datetime, timedelta, timezone
 
+from django.db import IntegrityError, transaction
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
@@ -9,12 +10,19 @@ from clinic.dictionaries.serializers import (
     MedicineNoFormSerializer,
     OfficeSerializer,
 )
+from clinic.roles.models import Patient
 from clinic.roles.serializers import (
     DoctorReadSerializer,
     PatientListSerializer,
 )
 from clinic.treatment.choices import VisitStatus
-from clinic.treatment.models import Dosage, Prescription, Visit
+from clinic.treatment.models import (
+    PRESCRIPTION_CODE_ATTEMPTS,
+    PRESCRIPTION_VALIDITY_PERIOD,
+    Dosage,
+    Prescription,
+    Visit,
+)
 
 
 class VisitReadSerializer(serializers.ModelSerializer):
@@ -27,6 +35,15 @@ class VisitReadSerializer(serializers.ModelSerializer):
         model = Visit
         fields = "__all__"
 
+    def to_representation(self, instance):
+        representation = super().to_representation(instance)
+        # Status wyliczony w zapytaniu (`with_live_status`) ma pierwszeństwo
+        # przed wartością zapisaną w bazie, która mogła się zdezaktualizować.
+        live_visit_status = getattr(instance, "live_visit_status", None)
+        if live_visit_status:
+            representation["visit_status"] = live_visit_status
+        return representation
+
 
 class VisitWriteSerializer(serializers.ModelSerializer):
     def validate_duration_in_minutes(self, value):
@@ -39,6 +56,11 @@ class VisitWriteSerializer(serializers.ModelSerializer):
     def validate(self, data):
         current_time = datetime.now(timezone.utc)
 
+        # Zapisany status mógł się zdezaktualizować od ostatniego przebiegu
+        # komendy `refresh_visit_statuses` – przeliczenie go w pamięci.
+        if self.instance:
+            self.instance.refresh_visit_status_based_on_time()
+
         # Walidacja uniemożliwiająca modyfikację wizyty będącej w trakcie lub zakończonej
         if self.instance and self.instance.visit_status in [
             VisitStatus.IN_PROGRESS,
@@ -87,17 +109,23 @@ class VisitWriteSerializer(serializers.ModelSerializer):
         end_time = start_time + timedelta(
             minutes=data.get("duration_in_minutes")
         )
-        overlapping_visits = Visit.objects.filter(
-            date__lt=end_time, predicted_end_date__gt=start_time
-        ).exclude(pk=self.instance.pk if self.instance else None)
+        conflicts = Visit.objects.exclude(
+            pk=self.instance.pk if self.instance else None
+        ).count_conflicts(
+            start_time,
+            end_time,
+            doctor=data.get("doctor"),
+            office=data.get("office"),
+            patient=data.get("patient"),
+        )
 
         # Sprawdzenie kolidujących wizyt dla lekarza, gabinetu i pacjenta
-        if overlapping_visits.filter(doctor=data.get("doctor")).exists():
+        if conflicts["doctor"]:
             raise serializers.ValidationError(
                 {"non_field_errors": _("Lekarz ma nakładającą się wizytę.")}
             )
 
-        if overlapping_visits.filter(office=data.get("office")).exists():
+        if conflicts["office"]:
             raise serializers.ValidationError(
                 {
                     "non_field_errors": _(
@@ -106,13 +134,52 @@ class VisitWriteSerializer(serializers.ModelSerializer):
                 }
             )
 
-        if overlapping_visits.filter(patient=data.get("patient")).exists():
+        if conflicts["patient"]:
             raise serializers.ValidationError(
                 {"non_field_errors": _("Pacjent ma nakładającą się wizytę.")}
             )
 
         return super().validate(data)
 
+    def create(self, validated_data):
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError as error:
+            raise self.get_overlap_error(error) from error
+
+    def update(self, instance, validated_data):
+        try:
+            with transaction.atomic():
+                return super().update(instance, validated_data)
+        except IntegrityError as error:
+            raise self.get_overlap_error(error) from error
+
+    @staticmethod
+    def get_overlap_error(error):
+        """
+        Zamiana naruszenia ograniczenia wykluczającego na błąd walidacji.
+
+        Chroni przed równoczesnymi rezerwacjami, które przeszły walidację,
+        ale zostały odrzucone przez bazę danych. Komunikat błędu pochodzi
+        z ograniczenia zdefiniowanego w modelu `Visit`.
+
+        Argumenty:
+            error (IntegrityError): Błąd zgłoszony przez bazę danych.
+
+        Zwraca:
+            Exception: Błąd walidacji lub oryginalny wyjątek, jeśli dotyczy innego ograniczenia.
+        """
+        diag = getattr(error.__cause__, "diag", None)
+        constraint_name = getattr(diag, "constraint_name", None)
+
+        for constraint in Visit._meta.constraints:
+            if constraint.name == constraint_name:
+                return serializers.ValidationError(
+                    {"non_field_errors": [constraint.violation_error_message]}
+                )
+        return error
+
     def to_representation(self, instance):
         serializer = VisitReadSerializer(instance)
         return serializer.data
@@ -129,22 +196,83 @@ class VisitWriteSerializer(serializers.ModelSerializer):
         )
 
 
+class VisitAvailabilityQuerySerializer(serializers.Serializer):
+    """
+    Parametry wyszukiwania wolnych terminów wizyt.
+    """
+
+    MAX_RANGE = timedelta(days=31)
+
+    date_from = serializers.DateTimeField()
+    date_to = serializers.DateTimeField()
+    duration_in_minutes = serializers.IntegerField(default=30)
+    specialization = serializers.CharField(required=False)
+    office_type = serializers.CharField(required=False)
+    patient = serializers.PrimaryKeyRelatedField(
+        queryset=Patient.objects.all(), required=False
+    )
+    opening_time = serializers.TimeField(required=False)
+    closing_time = serializers.TimeField(required=False)
+    limit = serializers.IntegerField(default=50, min_value=1, max_value=500)
+
+    def validate_duration_in_minutes(self, value):
+        if not (5 <= value <= 180):
+            raise serializers.ValidationError(
+                _("Czas trwania wizyty musi wynosić od 5 do 180 minut.")
+            )
+        return value
+
+    def validate(self, data):
+        if data["date_from"] >= data["date_to"]:
+            raise serializers.ValidationError(
+                {
+                    "non_field_errors": _(
+                        "Data początkowa musi być wcześniejsza niż data końcowa."
+                    )
+                }
+            )
+
+        if data["date_to"] - data["date_from"] > self.MAX_RANGE:
+            raise serializers.ValidationError(
+                {
+                    "non_field_errors": _(
+                        "Zakres wyszukiwania nie może przekraczać 31 dni."
+                    )
+                }
+            )
+
+        opening_time = data.get("opening_time")
+        closing_time = data.get("closing_time")
+        if opening_time and closing_time and opening_time >= closing_time:
+            raise serializers.ValidationError(
+                {
+                    "non_field_errors": _(
+                        "Godzina otwarcia musi być wcześniejsza niż godzina zamknięcia."
+                    )
+                }
+            )
+
+        return data
+
+
+class VisitAvailabilitySlotSerializer(serializers.Serializer):
+    """
+    Wolny termin, w którym dostępni są jednocześnie lekarz i gabinet.
+    """
+
+    doctor = serializers.UUIDField()
+    office = serializers.UUIDField()
+    start = serializers.DateTimeField()
+    end = serializers.DateTimeField()
+
+
 class DosageReadSerializer(serializers.ModelSerializer):
     medicine = MedicineNoFormSerializer()
+    form = MedicineFormSerializer(source="medicine.form")
 
     class Meta:
         model = Dosage
-        fields = ("medicine", "amount", "frequency")
-
-    def to_representation(self, instance):
-        representation = super().to_representation(instance)
-        # Założenie: instancja modelu Medicine zawiera atrybut `form`
-        # Dodanie zserializowanej formy leku za pomocą MedicineFormSerializer
-        form_representation = MedicineFormSerializer(
-            instance.medicine.form
-        ).data
-        representation["form"] = form_representation
-        return representation
+        fields = ("medicine", "amount", "frequency", "form")
 
 
 class DosageWriteSerializer(serializers.ModelSerializer):
@@ -163,27 +291,11 @@ class DosageWriteSerializer(serializers.ModelSerializer):
 
 
 class PrescriptionReadSerializer(serializers.ModelSerializer):
-    doctor = DoctorReadSerializer()
-    patient = PatientListSerializer()
+    # Dla recepty powiązanej z wizytą dane pacjenta i lekarza pochodzą z wizyty
+    doctor = DoctorReadSerializer(source="effective_doctor")
+    patient = PatientListSerializer(source="effective_patient")
     dosages = DosageReadSerializer(many=True)
 
-    def to_representation(self, instance):
-        data = super().to_representation(instance)
-
-        # Jeśli recepta powiązana z wizytą – nadpisanie danych pacjenta i lekarza danymi z wizyty
-        if instance.visit:
-            from clinic.roles.serializers import (
-                DoctorReadSerializer,
-                PatientListSerializer,
-            )
-
-            data["patient"] = PatientListSerializer(
-                instance.visit.patient
-            ).data
-            data["doctor"] = DoctorReadSerializer(instance.visit.doctor).data
-
-        return data
-
     class Meta:
         model = Prescription
         fields = (
@@ -238,8 +350,10 @@ class PrescriptionWriteSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         dosages_data = validated_data.pop("dosages")
         prescription = Prescription.objects.create(**validated_data)
-        for dosage_data in dosages_data:
-            Dosage.objects.create(prescription=prescription, **dosage_data)
+        Dosage.objects.bulk_create(
+            Dosage(prescription=prescription, **dosage_data)
+            for dosage_data in dosages_data
+        )
 
         return prescription
 
@@ -257,3 +371,73 @@ class PrescriptionWriteSerializer(serializers.ModelSerializer):
             "expiry_date",
             "prescription_code",
         )
+
+
+class PrescriptionBatchSerializer(serializers.Serializer):
+    """
+    Wystawienie wielu recept w jednej transakcji.
+
+    Każda recepta walidowana jest tak jak przy pojedynczym wystawieniu, a błędy
+    zwracane są osobno dla każdej pozycji listy. Recepty i dawkowania zapisywane
+    są zbiorczo (`bulk_create`), kody recept przydzielane są jednym zapytaniem
+    dla całej partii, a identyfikatory `readable_id` nadaje baza danych.
+    """
+
+    MAX_BATCH_SIZE = 100
+
+    prescriptions = PrescriptionWriteSerializer(
+        many=True, allow_empty=False, max_length=MAX_BATCH_SIZE
+    )
+
+    def create(self, validated_data):
+        items = validated_data["prescriptions"]
+        issue_date = datetime.now(timezone.utc).date()
+        prescriptions = [
+            Prescription(
+                issue_date=issue_date,
+                expiry_date=issue_date + PRESCRIPTION_VALIDITY_PERIOD,
+                **{
+                    field: value
+                    for field, value in item.items()
+                    if field != "dosages"
+                },
+            )
+            for item in items
+        ]
+
+        with transaction.atomic():
+            self.bulk_create_with_codes(prescriptions)
+            Dosage.objects.bulk_create(
+                Dosage(prescription=prescription, **dosage_data)
+                for prescription, item in zip(prescriptions, items)
+                for dosage_data in item["dosages"]
+            )
+
+        return prescriptions
+
+    @staticmethod
+    def bulk_create_with_codes(prescriptions):
+        """
+        Zapis recept z kodami przydzielonymi dla całej partii.
+
+        Jeżeli któryś z kodów jest używany przez aktywną receptę (nadaną przed
+        wprowadzeniem sekwencji kodów), cała partia otrzymuje nowe kody.
+        """
+        for _attempt in range(PRESCRIPTION_CODE_ATTEMPTS):
+            codes = Prescription.objects.allocate_codes(len(prescriptions))
+            for prescription, code in zip(prescriptions, codes):
+                prescription.prescription_code = code
+            try:
+                with transaction.atomic():
+                    return Prescription.objects.bulk_create(prescriptions)
+            except IntegrityError as error:
+                if not Prescription.is_active_code_violation(error):
+                    raise
+
+        raise serializers.ValidationError(
+            {
+                "non_field_errors": _(
+                    "Nie udało się wygenerować unikalnego kodu recepty."
+                )
+            }
+        )
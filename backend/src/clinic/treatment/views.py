@@ -1,22 +1,37 @@
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema
-from rest_framework import viewsets
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.filters import OrderingFilter
+from rest_framework.response import Response
 
 from clinic.auth.choices import Role
-from clinic.pagination import StandardResultsSetPagination
+from clinic.mixins import PrincipalMixin
+from clinic.pagination import (
+    CachedCount,
+    EstimatedCount,
+    StandardResultsSetPagination,
+)
 from clinic.permissions import IsAdmin, IsDoctor, IsNurse, IsPatient
 from clinic.throttling import DoctorRateThrottle, NurseRateThrottle
-from clinic.treatment.filters import PrescriptionFilter, VisitFilter
+from clinic.treatment.availability import find_free_slots
+from clinic.treatment.filters import (
+    PrescriptionFilter,
+    VisitFilter,
+    VisitOrderingFilter,
+)
 from clinic.treatment.models import Prescription, Visit
 from clinic.treatment.querysets import (
     get_prescription_queryset,
     get_visit_queryset,
 )
 from clinic.treatment.serializers import (
+    PrescriptionBatchSerializer,
     PrescriptionReadSerializer,
     PrescriptionWriteSerializer,
+    VisitAvailabilityQuerySerializer,
+    VisitAvailabilitySlotSerializer,
     VisitReadSerializer,
     VisitWriteSerializer,
 )
@@ -27,10 +42,10 @@ from clinic.treatment.serializers import (
     request=VisitWriteSerializer,
     responses={200: VisitReadSerializer},
 )
-class VisitViewSet(viewsets.ModelViewSet):
+class VisitViewSet(PrincipalMixin, viewsets.ModelViewSet):
     permission_classes = (IsNurse | IsDoctor | IsAdmin | IsPatient,)
     queryset = Visit.objects.all()
-    filter_backends = (DjangoFilterBackend, OrderingFilter)
+    filter_backends = (DjangoFilterBackend, VisitOrderingFilter)
     filterset_class = VisitFilter
     ordering = ("readable_id",)
     ordering_fields = (
@@ -50,10 +65,17 @@ class VisitViewSet(viewsets.ModelViewSet):
         "disease__name",
     )
     pagination_class = StandardResultsSetPagination
+    cursor_ordering_fields = ("readable_id", "date")
+    count_strategy = EstimatedCount(threshold=10000)
     http_method_names = ("get", "post", "delete", "patch", "head", "options")
 
     def get_permissions(self):
-        if self.action in ("create", "destroy", "partial_update"):
+        if self.action in (
+            "create",
+            "destroy",
+            "partial_update",
+            "availability",
+        ):
             self.permission_classes = (IsNurse | IsAdmin,)
         return super().get_permissions()
 
@@ -63,15 +85,9 @@ class VisitViewSet(viewsets.ModelViewSet):
         return VisitWriteSerializer
 
     def get_queryset(self):
-        queryset = get_visit_queryset(self.request.user)
-        to_update = []
-
-        for visit in queryset:
-            if visit.refresh_visit_status_based_on_time():
-                to_update.append(visit)
-
-        if to_update:
-            Visit.objects.bulk_update(to_update, ["visit_status"])
+        queryset = get_visit_queryset(self.principal)
+        if self.action in ("list", "retrieve"):
+            return queryset.with_read_relations()
         return queryset
 
     def get_throttles(self):
@@ -79,13 +95,30 @@ class VisitViewSet(viewsets.ModelViewSet):
             self.throttle_classes = (NurseRateThrottle,)
         return super().get_throttles()
 
+    @extend_schema(
+        parameters=[VisitAvailabilityQuerySerializer],
+        responses={200: VisitAvailabilitySlotSerializer(many=True)},
+    )
+    @action(detail=False, methods=("get",))
+    def availability(self, request):
+        """
+        Wyszukiwanie wolnych terminów wizyt dla lekarzy i gabinetów.
+        """
+        query_serializer = VisitAvailabilityQuerySerializer(
+            data=request.query_params
+        )
+        query_serializer.is_valid(raise_exception=True)
+
+        slots = find_free_slots(**query_serializer.validated_data)
+        return Response(VisitAvailabilitySlotSerializer(slots, many=True).data)
+
 
 @extend_schema(
     methods=("post",),
     request=PrescriptionWriteSerializer,
     responses={200: PrescriptionReadSerializer},
 )
-class PrescriptionViewSet(viewsets.ModelViewSet):
+class PrescriptionViewSet(PrincipalMixin, viewsets.ModelViewSet):
     permission_classes = (IsNurse | IsDoctor | IsAdmin | IsPatient,)
     queryset = Prescription.objects.all()
     filter_backends = (DjangoFilterBackend, OrderingFilter)
@@ -105,10 +138,12 @@ class PrescriptionViewSet(viewsets.ModelViewSet):
         "description",
     )
     pagination_class = StandardResultsSetPagination
+    cursor_ordering_fields = ("readable_id", "issue_date")
+    count_strategy = CachedCount(timeout=30)
     http_method_names = ("get", "post", "delete", "head", "options")
 
     def get_permissions(self):
-        if self.action in ("create", "destroy"):
+        if self.action in ("create", "destroy", "batch"):
             self.permission_classes = (IsDoctor | IsAdmin,)
         return super().get_permissions()
 
@@ -118,18 +153,44 @@ class PrescriptionViewSet(viewsets.ModelViewSet):
         return PrescriptionWriteSerializer
 
     def get_queryset(self):
-        return get_prescription_queryset(self.request.user)
+        queryset = get_prescription_queryset(self.principal)
+        if self.action in ("list", "retrieve"):
+            return queryset.with_read_relations()
+        return queryset
 
     def get_throttles(self):
-        if self.action == "create":
+        if self.action in ("create", "batch"):
             self.throttle_classes = (DoctorRateThrottle,)
         return super().get_throttles()
 
+    @extend_schema(
+        request=PrescriptionBatchSerializer,
+        responses={201: PrescriptionReadSerializer(many=True)},
+    )
+    @action(detail=False, methods=("post",))
+    def batch(self, request):
+        """
+        Wystawienie wielu recept w jednym żądaniu.
+        """
+        serializer = PrescriptionBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        prescriptions = serializer.save()
+
+        queryset = Prescription.objects.with_read_relations().filter(
+            pk__in=[prescription.pk for prescription in prescriptions]
+        )
+        return Response(
+            PrescriptionReadSerializer(
+                queryset.order_by("readable_id"), many=True
+            ).data,
+            status=status.HTTP_201_CREATED,
+        )
+
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
         if (
-            request.user.role == Role.DOCTOR
-            and instance.doctor.user != request.user
+            self.principal.role == Role.DOCTOR
+            and instance.doctor_id != self.principal.doctor_id
         ):
             raise PermissionDenied
         return super().destroy(request, *args, **kwargs)
@@ -35,6 +35,37 @@ oeg = os.environ.get
 SECRET_KEY = oeg("DJANGO_SECRET_KEY")
 RECAPTCHA_SECRET_KEY = oeg("RECAPTCHA_SECRET_KEY")
 RECAPTCHA_VERIFY_URL = oeg("RECAPTCHA_VERIFY_URL")
+RECAPTCHA_VERIFIER = oeg(
+    "RECAPTCHA_VERIFIER", "clinic.auth.recaptcha.GoogleRecaptchaVerifier"
+)
+RECAPTCHA_TIMEOUT = (
+    float(oeg("RECAPTCHA_CONNECT_TIMEOUT", 2)),
+    float(oeg("RECAPTCHA_READ_TIMEOUT", 3)),
+)
+RECAPTCHA_FAIL_OPEN = oeg("RECAPTCHA_FAIL_OPEN", "False") == "True"
+RECAPTCHA_FAILURE_THRESHOLD = 5
+RECAPTCHA_RESET_TIMEOUT = 30
+
+# Czas, przez który zapamiętany jest stan użytkownika sprawdzany przy
+# uwierzytelnianiu tokenem dostępu. Unieważnienie tokenów i zapis użytkownika
+# usuwają wpis, ale przy pamięci podręcznej lokalnej dla procesu pozostałe
+# procesy mogą akceptować unieważniony token jeszcze przez ten czas.
+TOKEN_STATE_CACHE_TIMEOUT = int(oeg("TOKEN_STATE_CACHE_TIMEOUT", 30))
+
+# Pamięć podręczna słowników: czas świeżości i maksymalny wiek odpowiedzi
+# zwracanej, gdy baza danych nie odpowiada w DICTIONARY_CACHE_QUERY_TIMEOUT ms
+DICTIONARY_CACHE_TIMEOUT = int(oeg("DICTIONARY_CACHE_TIMEOUT", 300))
+DICTIONARY_CACHE_STALE_TIMEOUT = int(
+    oeg("DICTIONARY_CACHE_STALE_TIMEOUT", 3600)
+)
+DICTIONARY_CACHE_QUERY_TIMEOUT = int(
+    oeg("DICTIONARY_CACHE_QUERY_TIMEOUT", 2000)
+)
+# Co ile sekund proces sprawdza wersję słowników w bazie danych; zmiany
+# z innych procesów mogą być przez ten czas niewidoczne
+DICTIONARY_VERSION_CHECK_INTERVAL = float(
+    oeg("DICTIONARY_VERSION_CHECK_INTERVAL", 5)
+)
 
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
@@ -55,6 +86,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "django_countries",
     "django_extensions",
     "rest_framework",
@@ -169,6 +201,7 @@ CORS_ALLOWED_ORIGINS = [
 TESTING = "pytest" in sys.argv[0]
 
 if TESTING:
+    RECAPTCHA_VERIFIER = "clinic.auth.recaptcha.StubRecaptchaVerifier"
     DEFAULT_THROTTLE_CLASSES = []
     DEFAULT_THROTTLE_RATES = {
         "anon": None,
@@ -179,11 +212,7 @@ if TESTING:
     }
 else:
     DEFAULT_THROTTLE_CLASSES = [
-        "clinic.throttling.DoctorRateThrottle",
-        "clinic.throttling.NurseRateThrottle",
-        "clinic.throttling.PatientRateThrottle",
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "clinic.throttling.RoleRateThrottle",
     ]
     DEFAULT_THROTTLE_RATES = {
         "anon": "100/hour",
@@ -196,7 +225,7 @@ else:
 REST_FRAMEWORK = {
     "NON_FIELD_ERRORS_KEY": "non_field_errors",
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "clinic.auth.authentication.ClaimsJWTAuthentication",
     ],
     "DEFAULT_FILTER_BACKENDS": [
         "django_filters.rest_framework.DjangoFilterBackend",
@@ -214,6 +243,7 @@ SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=15),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=30),
     "ROTATE_REFRESH_TOKENS": True,
+    "TOKEN_REFRESH_SERIALIZER": "clinic.auth.serializers.RevocableTokenRefreshSerializer",
 }
 
 AUTH_USER_MODEL = "clinic.User"
@@ -222,6 +252,10 @@ AUTHENTICATION_BACKENDS = [
     "clinic.auth.backends.EmailBackend",
 ]
 
+# Unikalność adresu e-mail zapewnia indeks na LOWER(email), którego Django
+# nie rozpoznaje jako unikalności pola USERNAME_FIELD.
+SILENCED_SYSTEM_CHECKS = ["auth.W004"]
+
 EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
 EMAIL_HOST = oeg("EMAIL_HOST", "smtp.gmail.com")
 EMAIL_PORT = oeg("EMAIL_PORT", 587)
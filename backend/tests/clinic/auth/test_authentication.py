@@ -0,0 +1,208 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+
+from clinic.auth.authentication import (
+    ClaimsJWTAuthentication,
+    VerifiedTokenCache,
+)
+from clinic.auth.choices import Role
+from clinic.auth.tokens import ClinicRefreshToken, revoke_user_tokens
+
+TOKEN_REFRESH_URL = "/auth/token/refresh/"
+
+
+def authenticate(token):
+    request = APIRequestFactory().get(
+        "/", HTTP_AUTHORIZATION=f"Bearer {token}"
+    )
+    return ClaimsJWTAuthentication().authenticate(request)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "instances",
+    ("patient_instances", "doctor_instances", "nurse_instances"),
+)
+def test_authentication_uses_token_claims(
+    request, instances, django_assert_num_queries
+):
+    profile = request.getfixturevalue(instances)[0]
+    token = ClinicRefreshToken.for_user(profile.user).access_token
+
+    # Stan użytkownika pobierany jest jednym zapytaniem, bez zapytania o profil
+    with django_assert_num_queries(1):
+        authenticate(token)
+
+    # Kolejne żądania korzystają z zapamiętanego stanu
+    with django_assert_num_queries(0):
+        user, _ = authenticate(token)
+        principal = (user.pk, user.role, user.profile_id)
+
+    assert principal == (profile.user.pk, profile.user.role, profile.id)
+
+
+@pytest.mark.django_db
+def test_authenticated_reads_do_not_query_user(api_client, patient_instances):
+    token = ClinicRefreshToken.for_user(patient_instances[0].user).access_token
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    url = reverse("visit-list")
+    api_client.get(url)
+
+    with CaptureQueriesContext(connection) as context:
+        response = api_client.get(url)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert not any(
+        'FROM "clinic_user" WHERE "clinic_user"."id" =' in query["sql"]
+        for query in context.captured_queries
+    )
+
+
+@pytest.mark.django_db
+def test_authenticated_user_loads_remaining_fields_once(
+    patient_instances, django_assert_num_queries
+):
+    patient_user = patient_instances[0].user
+    user, _ = authenticate(
+        ClinicRefreshToken.for_user(patient_user).access_token
+    )
+
+    with django_assert_num_queries(1):
+        details = (user.email, user.first_name, user.last_name)
+
+    assert details == (
+        patient_user.email,
+        patient_user.first_name,
+        patient_user.last_name,
+    )
+
+
+@pytest.mark.django_db
+def test_authentication_without_claims_loads_user(patient_instances):
+    patient_user = patient_instances[0].user
+
+    user, _ = authenticate(AccessToken.for_user(patient_user))
+
+    assert (user.pk, user.email) == (patient_user.pk, patient_user.email)
+
+
+@pytest.mark.django_db
+def test_revoked_token_is_rejected(patient_instances):
+    token = ClinicRefreshToken.for_user(patient_instances[0].user).access_token
+    authenticate(token)
+
+    revoke_user_tokens(patient_instances[0].user.pk)
+
+    with pytest.raises(AuthenticationFailed):
+        authenticate(token)
+
+
+@pytest.mark.django_db
+def test_tokens_issued_after_revocation_are_accepted(patient_instances):
+    user = patient_instances[0].user
+    revoke_user_tokens(user.pk)
+    user.refresh_from_db()
+
+    authenticated_user, _ = authenticate(
+        ClinicRefreshToken.for_user(user).access_token
+    )
+
+    assert authenticated_user.pk == user.pk
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "change",
+    (
+        {"is_active": False},
+        {"role": Role.DOCTOR},
+    ),
+)
+def test_token_is_rejected_after_user_change(patient_instances, change):
+    user = patient_instances[0].user
+    token = ClinicRefreshToken.for_user(user).access_token
+
+    get_user_model().objects.filter(pk=user.pk).update(**change)
+
+    with pytest.raises(AuthenticationFailed):
+        authenticate(token)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "change",
+    (
+        {"is_active": False},
+        {"role": Role.DOCTOR},
+    ),
+)
+def test_user_save_clears_cached_token_state(patient_instances, change):
+    user = patient_instances[0].user
+    token = ClinicRefreshToken.for_user(user).access_token
+    authenticate(token)
+
+    for field, value in change.items():
+        setattr(user, field, value)
+    user.save()
+
+    with pytest.raises(AuthenticationFailed):
+        authenticate(token)
+
+
+@pytest.mark.django_db
+def test_token_of_deleted_user_is_rejected(user_factory):
+    user = user_factory(role=Role.ADMIN)
+    token = ClinicRefreshToken.for_user(user).access_token
+    authenticate(token)
+
+    user.delete()
+
+    with pytest.raises(AuthenticationFailed):
+        authenticate(token)
+
+
+@pytest.mark.django_db
+def test_logout_revokes_tokens(api_client, patient_instances):
+    user = patient_instances[0].user
+    refresh = ClinicRefreshToken.for_user(user)
+
+    user.is_logged_in = False
+    user.save(update_fields=["is_logged_in"])
+
+    with pytest.raises(AuthenticationFailed):
+        authenticate(refresh.access_token)
+
+    response = api_client.post(
+        TOKEN_REFRESH_URL, data={"refresh": str(refresh)}, format="json"
+    )
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_verified_token_cache_evicts_least_recently_used():
+    cache = VerifiedTokenCache(maxsize=2)
+    tokens = {key: {"exp": float("inf")} for key in (b"a", b"b", b"c")}
+
+    cache.set(b"a", tokens[b"a"])
+    cache.set(b"b", tokens[b"b"])
+    cache.get(b"a")
+    cache.set(b"c", tokens[b"c"])
+
+    assert (cache.get(b"a"), cache.get(b"b"), cache.get(b"c")) == (
+        tokens[b"a"],
+        None,
+        tokens[b"c"],
+    )
+
+
+def test_verified_token_cache_drops_expired_tokens():
+    cache = VerifiedTokenCache()
+    cache.set(b"a", {"exp": 0})
+
+    assert cache.get(b"a") is None
@@ -1,4 +1,7 @@
 import pytest
+from django.contrib.auth.hashers import check_password
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.exceptions import ErrorDetail
 
@@ -179,6 +182,49 @@ def test_multiple_login(api_client, user):
     )
 
 
+@pytest.mark.django_db
+def test_login_email_is_case_insensitive(api_client, user):
+    with CaptureQueriesContext(connection) as context:
+        response = api_client.post(
+            LOGIN_URL,
+            data={"email": "Test@Example.COM", "password": "testpassword"},
+            format="json",
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert 'LOWER("clinic_user"."email")' in context.captured_queries[0]["sql"]
+
+
+@pytest.mark.django_db
+def test_login_checks_password_once(api_client, patient_instances, mocker):
+    hasher = mocker.patch(
+        "django.contrib.auth.base_user.check_password",
+        side_effect=check_password,
+    )
+
+    with CaptureQueriesContext(connection) as context:
+        response = api_client.post(
+            LOGIN_URL,
+            data={
+                "email": patient_instances[0].user.email,
+                "password": "testpassword",
+            },
+            format="json",
+        )
+
+    updates = [
+        query["sql"]
+        for query in context.captured_queries
+        if query["sql"].startswith("UPDATE")
+    ]
+    assert (response.status_code, hasher.call_count, len(updates)) == (
+        status.HTTP_200_OK,
+        1,
+        1,
+    )
+    assert '"is_logged_in"' in updates[0] and '"password"' not in updates[0]
+
+
 @pytest.mark.django_db
 @pytest.mark.parametrize("http_method", ("get", "patch", "delete", "put"))
 def test_login_user_http_methods_not_allowed(api_client, http_method):
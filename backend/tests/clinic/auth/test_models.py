@@ -1,10 +1,43 @@
+from importlib import import_module
+
 import pytest
+from django.apps import apps
+from django.db import IntegrityError, connection
+
+from clinic.auth.models import User
+
+email_lower_unique_migration = import_module(
+    "clinic.migrations.0011_user_email_lower_unique"
+)
 
 
 def test_user_str_representation(user):
     assert str(user) == "Test User (test@example.com)"
 
 
+@pytest.mark.django_db
+def test_user_email_is_unique_regardless_of_case(user):
+    with pytest.raises(IntegrityError):
+        User.objects.create(
+            email="TEST@example.com", first_name="Jan", last_name="Nowak"
+        )
+
+
+@pytest.mark.django_db
+def test_email_migration_rejects_case_insensitive_duplicates(user):
+    (constraint,) = User._meta.constraints
+    with connection.schema_editor() as schema_editor:
+        schema_editor.remove_constraint(User, constraint)
+    User.objects.create(
+        email="TEST@example.com", first_name="Jan", last_name="Nowak"
+    )
+
+    with pytest.raises(RuntimeError, match="test@example.com"):
+        email_lower_unique_migration.normalize_emails(apps, None)
+
+    assert User.objects.filter(email="TEST@example.com").exists()
+
+
 @pytest.mark.parametrize(
     "index, expected_str",
     (
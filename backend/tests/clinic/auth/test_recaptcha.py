@@ -0,0 +1,97 @@
+import pytest
+import requests
+
+from clinic.auth.recaptcha import (
+    CircuitBreaker,
+    GoogleRecaptchaVerifier,
+    StubRecaptchaVerifier,
+    verify_recaptcha,
+)
+
+VERIFY_URL = "https://recaptcha.example.com/siteverify"
+
+
+@pytest.fixture
+def verifier():
+    return GoogleRecaptchaVerifier(
+        verify_url=VERIFY_URL,
+        secret_key="secret",
+        timeout=(1, 2),
+        fail_open=False,
+        breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60),
+    )
+
+
+def mock_post(mocker, verifier, **kwargs):
+    return mocker.patch.object(verifier.session, "post", **kwargs)
+
+
+def recaptcha_response(mocker, success):
+    response = mocker.Mock()
+    response.json.return_value = {"success": success}
+    return response
+
+
+def test_verify_uses_session_with_timeout(mocker, verifier):
+    post = mock_post(
+        mocker, verifier, return_value=recaptcha_response(mocker, True)
+    )
+
+    assert verifier.verify("token") is True
+    post.assert_called_once_with(
+        VERIFY_URL,
+        data={"secret": "secret", "response": "token"},
+        timeout=(1, 2),
+    )
+
+
+def test_verify_does_not_accept_replayed_tokens(mocker, verifier):
+    post = mock_post(
+        mocker, verifier, return_value=recaptcha_response(mocker, True)
+    )
+    verifier.verify("token")
+
+    # Usługa Google odrzuca ponownie użyty token
+    post.return_value = recaptcha_response(mocker, False)
+
+    assert verifier.verify("token") is False
+    assert post.call_count == 2
+
+
+@pytest.mark.parametrize("fail_open", (False, True))
+def test_verify_applies_failure_policy(mocker, verifier, fail_open):
+    verifier.fail_open = fail_open
+    mock_post(mocker, verifier, side_effect=requests.Timeout())
+
+    assert verifier.verify("token") is fail_open
+
+
+def test_circuit_breaker_stops_requests_after_failures(mocker, verifier):
+    post = mock_post(mocker, verifier, side_effect=requests.ConnectionError())
+
+    results = [verifier.verify(f"token{i}") for i in range(4)]
+
+    assert (results, post.call_count) == ([False] * 4, 2)
+
+
+def test_circuit_breaker_closes_after_successful_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+
+    assert breaker.allow() is True
+    breaker.record_success()
+    assert (breaker.failures, breaker.opened_at) == (0, None)
+
+
+@pytest.mark.parametrize("token, expected", (("token", True), ("", False)))
+def test_stub_verifier_is_used_in_tests(mocker, token, expected):
+    post = mocker.patch("requests.Session.post")
+
+    assert (
+        StubRecaptchaVerifier().verify(token),
+        verify_recaptcha(token),
+    ) == (
+        expected,
+        expected,
+    )
+    post.assert_not_called()
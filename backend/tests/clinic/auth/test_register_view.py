@@ -3,6 +3,7 @@ from rest_framework import status
 from rest_framework.exceptions import ErrorDetail
 
 from clinic.auth.models import User
+from clinic.models import OutboxEmail
 
 REGISTER_URL = "/auth/register/"
 
@@ -33,6 +34,23 @@ def test_register_user_successful(
         mocked_send_email.assert_called_once()
 
 
+@pytest.mark.django_db
+def test_register_user_queues_verification_email(
+    api_client, mocker, user_data, mailoutbox
+):
+    mocker.patch("clinic.auth.serializers.verify_recaptcha", return_value=True)
+
+    response = api_client.post(REGISTER_URL, data=user_data, format="json")
+
+    email = OutboxEmail.objects.get()
+    assert (response.status_code, email.to_email, email.template_name) == (
+        status.HTTP_201_CREATED,
+        user_data["email"],
+        "emails/email_verification.html",
+    )
+    assert mailoutbox == []
+
+
 @pytest.mark.django_db
 def test_register_user_email_send_failure(api_client, mocker, user_data):
     mocker.patch("clinic.auth.serializers.verify_recaptcha", return_value=True)
@@ -987,3 +1005,21 @@ def test_register_user_http_methods_not_allowed(api_client, http_method):
     method = getattr(api_client, http_method)
     response = method(REGISTER_URL)
     assert response.status_code == status.HTTP_405_METHOD_NOT_ALLOWED
+
+
+@pytest.mark.django_db
+def test_register_user_normalizes_email(api_client, user, user_data):
+    user_data["email"] = "New.User@Example.COM"
+
+    response = api_client.post(REGISTER_URL, data=user_data, format="json")
+    duplicate = api_client.post(
+        REGISTER_URL,
+        data={**user_data, "email": "new.user@example.com"},
+        format="json",
+    )
+
+    assert (response.status_code, duplicate.data["email"]) == (
+        status.HTTP_201_CREATED,
+        ["Ten adres e-mail jest już używany."],
+    )
+    assert User.objects.filter(email="new.user@example.com").exists()
@@ -2,10 +2,11 @@ import uuid
 
 import pytest
 from django.contrib.auth import get_user_model
-from django.db import connections
+from django.core.cache import cache
 from rest_framework.test import APIClient
 
 from clinic.auth.choices import Role
+from clinic.dictionaries.cache import dictionary_version
 from clinic.dictionaries.models import (
     Country,
     Disease,
@@ -22,6 +23,16 @@ from clinic.models import Address
 from clinic.roles.models import Doctor, Nurse, Patient
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # Dane tworzone przez `bulk_create` nie unieważniają zapamiętanych odpowiedzi
+    cache.clear()
+    dictionary_version.clear()
+    yield
+    cache.clear()
+    dictionary_version.clear()
+
+
 @pytest.fixture
 def api_client():
     return APIClient()
@@ -32,33 +43,6 @@ def random_uuid():
     return uuid.uuid4()
 
 
-SEQUENCES = (
-    "clinic_user_readable_id_seq",
-    "clinic_doctor_readable_id_seq",
-    "clinic_nurse_readable_id_seq",
-    "clinic_patient_readable_id_seq",
-    "clinic_country_readable_id_seq",
-    "clinic_disease_readable_id_seq",
-    "clinic_ingredient_readable_id_seq",
-    "clinic_medicine_readable_id_seq",
-    "clinic_office_readable_id_seq",
-    "clinic_specialization_readable_id_seq",
-    "clinic_prescription_readable_id_seq",
-    "clinic_visit_readable_id_seq",
-)
-
-
-@pytest.fixture(autouse=True)
-def create_sequences(django_db_setup, django_db_blocker):
-    with django_db_blocker.unblock():
-        with connections["default"].cursor() as cursor:
-            for seq in SEQUENCES:
-                cursor.execute(
-                    f"CREATE SEQUENCE IF NOT EXISTS {seq} "
-                    "START WITH 1 INCREMENT BY 1;"
-                )
-
-
 @pytest.fixture
 def user_factory(db):
     def create_user(role, email=None, **kwargs):
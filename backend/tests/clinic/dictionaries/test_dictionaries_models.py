@@ -1,5 +1,7 @@
 import pytest
 
+from clinic.dictionaries.models import Disease
+
 
 @pytest.mark.parametrize(
     "instances, expected_str",
@@ -19,3 +21,34 @@ def test_clinic_models_str_representation(request, instances, expected_str):
     instance_list = request.getfixturevalue(instances)
     instance = instance_list[0]
     assert str(instance) == expected_str
+
+
+@pytest.mark.django_db
+def test_bulk_create_assigns_readable_ids_in_single_statement(
+    django_assert_num_queries,
+):
+    diseases = [Disease(name=f"Choroba {i}") for i in range(5)]
+
+    with django_assert_num_queries(1):
+        Disease.objects.bulk_create(diseases)
+
+    readable_ids = [disease.readable_id for disease in diseases]
+
+    assert readable_ids == sorted(set(readable_ids))
+    assert (
+        list(
+            Disease.objects.order_by("readable_id").values_list(
+                "readable_id", flat=True
+            )
+        )
+        == readable_ids
+    )
+
+
+@pytest.mark.django_db
+def test_save_keeps_explicit_readable_id():
+    disease = Disease.objects.create(name="Choroba", readable_id=1000)
+
+    disease.refresh_from_db()
+
+    assert disease.readable_id == 1000
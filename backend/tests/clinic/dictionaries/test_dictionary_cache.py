@@ -0,0 +1,166 @@
+import pytest
+from django.db import OperationalError, connection
+from django.urls import reverse
+from rest_framework import status
+
+from clinic.dictionaries.cache import (
+    bump_dictionary_version,
+    increment_dictionary_version,
+)
+from clinic.dictionaries.models import Country, DictionaryVersion, Disease
+from clinic.dictionaries.views import CountryViewSet
+
+
+@pytest.mark.django_db
+def test_dictionary_list_is_served_from_cache(
+    api_client, country_instances, django_assert_num_queries
+):
+    url = reverse("country-list")
+    params = {"ordering": "name", "limit": 2}
+    expected = api_client.get(url, params).data
+
+    with django_assert_num_queries(0):
+        response = api_client.get(url, params)
+
+    assert (response.status_code, response.data) == (
+        status.HTTP_200_OK,
+        expected,
+    )
+
+
+@pytest.mark.django_db
+def test_dictionary_cache_is_keyed_by_query_params(
+    api_client, country_instances
+):
+    url = reverse("country-list")
+    api_client.get(url, {"ordering": "readable_id"})
+
+    response = api_client.get(url, {"code": "DE"})
+
+    assert [country["code"] for country in response.data] == ["DE"]
+
+
+@pytest.mark.django_db
+def test_dictionary_save_invalidates_cached_responses(
+    authenticated_doctor, disease_instances, django_capture_on_commit_callbacks
+):
+    api_client, _ = authenticated_doctor
+    url = reverse("disease-list")
+    api_client.get(url)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Disease.objects.create(name="Nowa choroba")
+    response = api_client.get(url)
+
+    assert "Nowa choroba" in [disease["name"] for disease in response.data]
+
+
+@pytest.mark.django_db
+def test_dictionary_delete_invalidates_cached_responses(
+    api_client, country_instances, django_capture_on_commit_callbacks
+):
+    url = reverse("country-detail", args=(country_instances[0].pk,))
+    api_client.get(url)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        country_instances[0].delete()
+    response = api_client.get(url)
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_dictionary_version_is_bumped_after_commit(
+    django_capture_on_commit_callbacks,
+):
+    with django_capture_on_commit_callbacks() as callbacks:
+        bump_dictionary_version()
+
+        assert DictionaryVersion.objects.get_version() == 0
+
+    for callback in callbacks:
+        callback()
+    assert DictionaryVersion.objects.get_version() == 1
+
+
+@pytest.mark.django_db
+def test_dictionary_version_bump_invalidates_responses_of_all_processes(
+    mocker, settings, api_client, country_instances
+):
+    settings.DICTIONARY_VERSION_CHECK_INTERVAL = 5
+    monotonic = mocker.patch(
+        "clinic.dictionaries.cache.time.monotonic", return_value=100.0
+    )
+    url = reverse("country-list")
+    api_client.get(url)
+    Country.objects.filter(pk=country_instances[0].pk).update(name="Zmiana")
+
+    # Zmiana wersji bezpośrednio w bazie danych, np. przez inny proces
+    DictionaryVersion.objects.bump()
+    cached = api_client.get(url)
+    monotonic.return_value = 105.0
+    response = api_client.get(url)
+
+    assert "Zmiana" not in [country["name"] for country in cached.data]
+    assert "Zmiana" in [country["name"] for country in response.data]
+
+
+@pytest.mark.django_db
+def test_stale_dictionary_response_is_served_when_database_fails(
+    mocker, api_client, country_instances
+):
+    url = reverse("country-list")
+    expected = api_client.get(url).data
+    increment_dictionary_version()
+    mocker.patch.object(
+        CountryViewSet,
+        "get_queryset",
+        side_effect=OperationalError("canceling statement due to timeout"),
+    )
+
+    response = api_client.get(url)
+
+    assert (response.status_code, response.data) == (
+        status.HTTP_200_OK,
+        expected,
+    )
+
+
+@pytest.mark.django_db
+def test_dictionary_database_error_without_cached_response_is_raised(
+    mocker, api_client, country_instances
+):
+    mocker.patch.object(
+        CountryViewSet,
+        "get_queryset",
+        side_effect=OperationalError("canceling statement due to timeout"),
+    )
+
+    with pytest.raises(OperationalError):
+        api_client.get(reverse("country-list"))
+
+
+@pytest.mark.django_db
+def test_slow_dictionary_query_falls_back_to_stale_response(
+    mocker, settings, api_client, country_instances
+):
+    url = reverse("country-list")
+    expected = api_client.get(url).data
+    Country.objects.filter(pk=country_instances[0].pk).update(name="Zmiana")
+    increment_dictionary_version()
+    settings.DICTIONARY_CACHE_QUERY_TIMEOUT = 1
+    get_queryset = CountryViewSet.get_queryset
+
+    def slow_get_queryset(view):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_sleep(0.1)")
+        return get_queryset(view)
+
+    mocker.patch.object(CountryViewSet, "get_queryset", slow_get_queryset)
+
+    response = api_client.get(url)
+
+    assert (response.status_code, response.data) == (
+        status.HTTP_200_OK,
+        expected,
+    )
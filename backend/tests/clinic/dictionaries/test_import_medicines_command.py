@@ -0,0 +1,206 @@
+import json
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from clinic.dictionaries.importers import iter_json_records
+from clinic.dictionaries.models import Medicine, MedicineIngredient
+
+RECORDS = [
+    {
+        "name": "Ibuprofen Forte",
+        "type_of_medicine": "Lek przeciwzapalny",
+        "form": "Tabletka",
+        "active_ingredients": [
+            {"name": "Ibuprofen", "quantity": 400, "unit": "mg"},
+        ],
+    },
+    {
+        "name": "Gripex",
+        "type_of_medicine": "Lek przeciwgrypowy",
+        "form": "Tabletka",
+        "active_ingredients": [
+            {"name": "Paracetamol", "quantity": 325, "unit": "mg"},
+            {"name": "Pseudoefedryna", "quantity": 30, "unit": "mg"},
+        ],
+    },
+    {
+        "name": "Sól fizjologiczna",
+        "type_of_medicine": "Płyn",
+        "form": "Roztwór",
+        "active_ingredients": [],
+    },
+]
+
+
+def import_medicines(path, *args):
+    call_command("import_medicines", str(path), *args, stdout=StringIO())
+
+
+@pytest.fixture
+def json_registry(tmp_path):
+    path = tmp_path / "registry.json"
+    path.write_text(json.dumps(RECORDS), encoding="utf-8")
+    return path
+
+
+def test_iter_json_records_reads_records_across_chunks():
+    data = json.dumps(RECORDS, indent=2)
+
+    records = list(iter_json_records(StringIO(data), chunk_size=7))
+
+    assert records == RECORDS
+
+
+@pytest.mark.parametrize("data", ('{"name": "x"}', '[{"name": "x"},'))
+def test_iter_json_records_rejects_invalid_data(data):
+    with pytest.raises(ValueError):
+        list(iter_json_records(StringIO(data)))
+
+
+@pytest.mark.django_db
+def test_import_medicines_from_json(json_registry):
+    import_medicines(json_registry, "--batch-size", "2")
+
+    gripex = Medicine.objects.get(name="Gripex")
+    assert gripex.type_of_medicine.name == "Lek przeciwgrypowy"
+    assert set(
+        gripex.medicine_ingredients.values_list("ingredient__name", "quantity")
+    ) == {("Paracetamol", Decimal("325")), ("Pseudoefedryna", Decimal("30"))}
+    assert Medicine.objects.filter(name="Sól fizjologiczna").exists()
+
+
+@pytest.mark.django_db
+def test_import_medicines_from_csv(tmp_path):
+    path = tmp_path / "registry.csv"
+    path.write_text(
+        "name,type_of_medicine,form,ingredient,quantity,unit\n"
+        "Gripex,Lek przeciwgrypowy,Tabletka,Paracetamol,325,mg\n"
+        "Gripex,Lek przeciwgrypowy,Tabletka,Pseudoefedryna,30,mg\n"
+        "Gripex,Lek przeciwgrypowy,Tabletka,Paracetamol,300,mg\n",
+        encoding="utf-8",
+    )
+
+    import_medicines(path)
+
+    assert dict(
+        MedicineIngredient.objects.filter(medicine__name="Gripex").values_list(
+            "ingredient__name", "quantity"
+        )
+    ) == {"Paracetamol": Decimal("300"), "Pseudoefedryna": Decimal("30")}
+
+
+@pytest.mark.django_db
+def test_import_medicines_is_idempotent(json_registry):
+    import_medicines(json_registry)
+    medicine_ids = set(Medicine.objects.values_list("id", flat=True))
+    ingredients_count = MedicineIngredient.objects.count()
+
+    import_medicines(json_registry, "--batch-size", "1")
+
+    assert set(Medicine.objects.values_list("id", flat=True)) == medicine_ids
+    assert MedicineIngredient.objects.count() == ingredients_count
+
+
+@pytest.mark.django_db
+def test_import_medicines_requires_known_format(tmp_path):
+    path = tmp_path / "registry.txt"
+    path.write_text("", encoding="utf-8")
+
+    with pytest.raises(CommandError):
+        import_medicines(path)
+
+
+@pytest.mark.django_db
+def test_import_medicines_deletes_removed_ingredients(tmp_path, json_registry):
+    import_medicines(json_registry)
+    records = json.loads(json_registry.read_text(encoding="utf-8"))
+    records[1]["active_ingredients"] = records[1]["active_ingredients"][:1]
+    updated_registry = tmp_path / "updated.json"
+    updated_registry.write_text(json.dumps(records), encoding="utf-8")
+
+    import_medicines(updated_registry, "--batch-size", "1")
+
+    assert list(
+        MedicineIngredient.objects.filter(medicine__name="Gripex").values_list(
+            "ingredient__name", flat=True
+        )
+    ) == ["Paracetamol"]
+    assert MedicineIngredient.objects.filter(
+        medicine__name="Ibuprofen Forte"
+    ).exists()
+
+
+@pytest.mark.django_db
+def test_import_medicines_skips_rows_with_too_long_values(tmp_path):
+    path = tmp_path / "registry.csv"
+    path.write_text(
+        "name,type_of_medicine,form,ingredient,quantity,unit\n"
+        f"{'X' * 101},Lek przeciwgrypowy,Tabletka,Paracetamol,325,mg\n"
+        "Gripex,Lek przeciwgrypowy,Tabletka,Paracetamol,325,miligramowa\n"
+        "Gripex,Lek przeciwgrypowy,Tabletka,Pseudoefedryna,30,mg\n",
+        encoding="utf-8",
+    )
+    stdout = StringIO()
+
+    call_command("import_medicines", str(path), stdout=stdout)
+
+    assert list(Medicine.objects.values_list("name", flat=True)) == ["Gripex"]
+    assert list(
+        MedicineIngredient.objects.values_list("ingredient__name", flat=True)
+    ) == ["Pseudoefedryna"]
+    assert "Skipped 2 rows" in stdout.getvalue()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "invalid_record",
+    (
+        {"name": 123},
+        {"form": True},
+        {"form": None},
+        {
+            "active_ingredients": [
+                {"name": "Kofeina", "quantity": 1, "unit": 5}
+            ]
+        },
+        {
+            "active_ingredients": [
+                {"name": "Kofeina", "quantity": 1234567, "unit": "mg"}
+            ]
+        },
+        {
+            "active_ingredients": [
+                {"name": "Kofeina", "quantity": "0.0001", "unit": "mg"}
+            ]
+        },
+        {
+            "active_ingredients": [
+                {"name": "Kofeina", "quantity": "dużo", "unit": "mg"}
+            ]
+        },
+        {
+            "active_ingredients": [
+                {"name": "Kofeina", "quantity": None, "unit": "mg"}
+            ]
+        },
+    ),
+)
+def test_import_medicines_skips_rows_with_invalid_values(
+    tmp_path, invalid_record
+):
+    path = tmp_path / "registry.json"
+    path.write_text(
+        json.dumps(
+            [*RECORDS, {**RECORDS[0], "name": "Kofepar", **invalid_record}]
+        ),
+        encoding="utf-8",
+    )
+    stdout = StringIO()
+
+    call_command("import_medicines", str(path), stdout=stdout)
+
+    assert Medicine.objects.count() == len(RECORDS)
+    assert "Skipped 1 rows" in stdout.getvalue()
@@ -0,0 +1,104 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from clinic.dictionaries.models import (
+    Country,
+    DataImport,
+    Disease,
+    Medicine,
+    MedicineIngredient,
+    Office,
+    Specialization,
+)
+
+MODELS = (
+    Country,
+    Disease,
+    Medicine,
+    MedicineIngredient,
+    Office,
+    Specialization,
+)
+
+
+def load_data(*args):
+    call_command("load_data", *args, stdout=StringIO(), stderr=StringIO())
+
+
+def count_objects():
+    return {model: model.objects.count() for model in MODELS}
+
+
+@pytest.mark.django_db
+def test_load_data_loads_dictionaries():
+    load_data()
+
+    assert all(count_objects().values())
+    assert DataImport.objects.count() == 5
+
+
+@pytest.mark.django_db
+def test_load_data_skips_unchanged_sources():
+    load_data()
+    counts = count_objects()
+
+    with CaptureQueriesContext(connection) as context:
+        load_data()
+
+    assert len(context.captured_queries) == 1
+    assert count_objects() == counts
+
+
+@pytest.mark.django_db
+def test_load_data_force_does_not_duplicate_objects():
+    load_data()
+    counts = count_objects()
+
+    load_data("--force")
+
+    assert count_objects() == counts
+
+
+@pytest.mark.django_db
+def test_load_data_updates_changed_rows():
+    load_data()
+    MedicineIngredient.objects.update(quantity=0)
+    Country.objects.filter(code="PL").update(name="Changed")
+
+    load_data("--force")
+
+    assert not MedicineIngredient.objects.filter(quantity=0).exists()
+    assert Country.objects.get(code="PL").name != "Changed"
+
+
+@pytest.mark.django_db
+def test_load_data_keeps_primary_keys_of_changed_medicines():
+    load_data()
+    medicine = Medicine.objects.first()
+    other = Medicine.objects.exclude(
+        form=medicine.form, type_of_medicine=medicine.type_of_medicine
+    ).first()
+    Medicine.objects.filter(pk=medicine.pk).update(
+        form=other.form, type_of_medicine=other.type_of_medicine
+    )
+    ingredient_ids = set(
+        medicine.medicine_ingredients.values_list("pk", flat=True)
+    )
+    counts = count_objects()
+
+    load_data("--force")
+
+    medicine.refresh_from_db()
+    assert (medicine.form, medicine.type_of_medicine) != (
+        other.form,
+        other.type_of_medicine,
+    )
+    assert count_objects() == counts
+    assert (
+        set(medicine.medicine_ingredients.values_list("pk", flat=True))
+        == ingredient_ids
+    )
@@ -3,6 +3,8 @@ from django.urls import reverse
 from rest_framework import status
 from rest_framework.exceptions import ErrorDetail
 
+from clinic.dictionaries.models import MedicineIngredient
+
 
 @pytest.mark.django_db
 def test_doctor_can_list_medicines(authenticated_doctor, medicine_instances):
@@ -25,6 +27,7 @@ def test_doctor_can_list_medicines(authenticated_doctor, medicine_instances):
         ("type_of_medicine__name", "Lek przeciwzapalny niesteroidowy", 2),
         ("form__name", "Kapsułka", 0),
         ("active_ingredients__name", "Kwas acetylosalicylowy", 1),
+        ("active_ingredients__name", "Ibuprofen, Kwas acetylosalicylowy", 3),
     ),
 )
 def test_filter_medicine(
@@ -47,6 +50,41 @@ def test_filter_medicine(
     )
 
 
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "match_mode, expected_names",
+    (
+        ("any", ["Aspiryna", "Ibuprofen", "Ibuprofen Kids"]),
+        ("all", ["Aspiryna"]),
+    ),
+)
+def test_filter_medicine_by_active_ingredients_match_mode(
+    authenticated_doctor,
+    medicine_instances,
+    ingredient_instances,
+    match_mode,
+    expected_names,
+):
+    api_client, _ = authenticated_doctor
+    MedicineIngredient.objects.create(
+        medicine=medicine_instances[3],
+        ingredient=ingredient_instances[1],
+        quantity=100,
+        unit="mg",
+    )
+
+    response = api_client.get(
+        reverse("medicine-list"),
+        data={
+            "active_ingredients__name": "Ibuprofen,Kwas acetylosalicylowy",
+            "active_ingredients__name_match": match_mode,
+            "ordering": "name",
+        },
+    )
+
+    assert [medicine["name"] for medicine in response.data] == expected_names
+
+
 @pytest.mark.django_db
 def test_doctor_can_retrieve_specific_medicine_details(
     authenticated_doctor, medicine_instances
@@ -80,6 +80,38 @@ def test_filter_doctor_by_multiple_specializations(
     assert len(response.data) == expected_count
 
 
+@pytest.mark.parametrize(
+    "match_mode, expected_count",
+    (("any", 2), ("all", 1)),
+)
+@pytest.mark.django_db
+def test_filter_doctor_by_specializations_match_mode(
+    authenticated_doctor,
+    doctor_instances,
+    specialization_instances,
+    match_mode,
+    expected_count,
+):
+    api_client, _ = authenticated_doctor
+    doctor_instances[0].specializations.add(specialization_instances[1])
+
+    response = api_client.get(
+        reverse("doctor-list"),
+        data={
+            "specializations__name": "Kardiologia,Neurologia",
+            "specializations__name_match": match_mode,
+            "ordering": "user__last_name",
+        },
+    )
+
+    ids = [doctor["id"] for doctor in response.data]
+    assert (response.status_code, len(ids), len(set(ids))) == (
+        status.HTTP_200_OK,
+        expected_count,
+        expected_count,
+    )
+
+
 @pytest.mark.django_db
 @pytest.mark.parametrize(
     "user_fixture, url_name",
@@ -868,3 +868,26 @@ def test_edit_nonexistent_patient(
         status.HTTP_404_NOT_FOUND,
         expected_response,
     )
+
+
+@pytest.mark.django_db
+def test_nurse_can_page_through_patients_with_cursor(
+    authenticated_nurse, patient_instances
+):
+    api_client, _ = authenticated_nurse
+    url = reverse("patient-list")
+    expected_ids = [patient.readable_id for patient in patient_instances]
+
+    readable_ids = []
+    response = api_client.get(url, {"pagination": "cursor", "limit": 2})
+    while True:
+        assert response.status_code == status.HTTP_200_OK
+        assert "count" not in response.data
+        readable_ids += [
+            patient["readable_id"] for patient in response.data["results"]
+        ]
+        if not response.data["next"]:
+            break
+        response = api_client.get(response.data["next"])
+
+    assert readable_ids == sorted(expected_ids)
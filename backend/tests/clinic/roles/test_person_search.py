@@ -0,0 +1,151 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+
+from clinic.auth.choices import Role
+from clinic.roles.models import PersonSearchDocument
+
+SEARCH_URL = reverse("person-search-list")
+
+
+@pytest.fixture
+def search_documents(patient_instances, doctor_instances, nurse_instances):
+    # Lekarze i pielęgniarki tworzeni są w fixture'ach przez bulk_create,
+    # który pomija sygnały
+    call_command("rebuild_search_documents", stdout=StringIO())
+
+
+def search(api_client, **params):
+    return api_client.get(SEARCH_URL, data=params)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "user_fixture", ("authenticated_doctor", "authenticated_nurse")
+)
+def test_staff_search_covers_all_roles(
+    request, user_fixture, search_documents
+):
+    api_client, _ = request.getfixturevalue(user_fixture)
+
+    response = search(api_client, q="test")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert {result["role"] for result in response.data} == {
+        Role.PATIENT,
+        Role.DOCTOR,
+        Role.NURSE,
+    }
+    assert len(response.data) == 11
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "params, expected_emails",
+    (
+        ({"q": "91011112314"}, {"pacjent1@example.com"}),
+        ({"q": "1000041"}, {"lekarz1@example.com"}),
+        ({"q": "lekarz2 Test"}, {"lekarz2@example.com"}),
+        (
+            {"q": "inne miasto", "role": Role.PATIENT},
+            {
+                "pacjent1@example.com",
+                "pacjent3@example.com",
+                "pacjent5@example.com",
+            },
+        ),
+        ({"q": "inne miasto", "role": Role.DOCTOR}, set()),
+    ),
+)
+def test_search_matches_document_fields(
+    authenticated_doctor, search_documents, params, expected_emails
+):
+    api_client, _ = authenticated_doctor
+
+    response = search(api_client, **params)
+
+    assert {result["email"] for result in response.data} == expected_emails
+
+
+@pytest.mark.django_db
+def test_search_results_are_ranked(authenticated_doctor, search_documents):
+    api_client, _ = authenticated_doctor
+
+    response = search(api_client, q="pacjent1")
+
+    assert response.data[0]["email"] == "pacjent1@example.com"
+
+
+@pytest.mark.django_db
+def test_patient_search_is_limited_to_own_document(
+    authenticated_patient, search_documents
+):
+    api_client, patient = authenticated_patient
+
+    response = search(api_client, q="test")
+
+    assert [result["id"] for result in response.data] == [str(patient.id)]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("params", ({}, {"q": "ab"}))
+def test_search_requires_query(authenticated_doctor, params):
+    api_client, _ = authenticated_doctor
+
+    response = search(api_client, **params)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_search_document_follows_user_and_address_changes(patient_instances):
+    patient = patient_instances[0]
+
+    patient.user.last_name = "Kowalska"
+    patient.user.save()
+    patient.address.city = "Toruń"
+    patient.address.save()
+
+    document = PersonSearchDocument.objects.get(pk=patient.pk)
+    assert (document.full_name, document.city) == ("Test Kowalska", "Toruń")
+    assert "Test Kowalska" in document.document
+    assert "Toruń" in document.document
+
+
+@pytest.mark.django_db
+def test_search_document_follows_new_address(
+    patient_instances, address_factory
+):
+    patient = patient_instances[0]
+
+    patient.address = address_factory(
+        "Nowa Ulica", "3", None, "Gdańsk", "80-001"
+    )
+    patient.save()
+
+    document = PersonSearchDocument.objects.get(pk=patient.pk)
+    assert document.city == "Gdańsk"
+    assert "Gdańsk" in document.document
+
+
+@pytest.mark.django_db
+def test_search_document_is_kept_on_login_field_updates(
+    patient_instances, django_assert_num_queries
+):
+    user = patient_instances[0].user
+    user.is_logged_in = True
+
+    with django_assert_num_queries(1):
+        user.save(update_fields=("is_logged_in",))
+
+
+@pytest.mark.django_db
+def test_search_document_is_removed_with_profile(patient_instances):
+    patient = patient_instances[0]
+
+    patient.delete()
+
+    assert not PersonSearchDocument.objects.filter(pk=patient.pk).exists()
@@ -0,0 +1,74 @@
+import pytest
+from django.db import connection
+
+from clinic.auth.models import User
+from clinic.lookups import FullName
+from clinic.roles.filters import PatientFilterSet
+from clinic.roles.models import Patient
+
+
+def filter_patients(**params):
+    return PatientFilterSet(params, queryset=Patient.objects.all()).qs
+
+
+def explain(queryset):
+    # Bez skanowania sekwencyjnego i zwykłego skanu indeksu warunek może zostać
+    # obsłużony wyłącznie przez skan bitmapowy indeksu GIN
+    with connection.cursor() as cursor:
+        cursor.execute("SET LOCAL enable_seqscan = off")
+        cursor.execute("SET LOCAL enable_indexscan = off")
+    return queryset.explain()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "params, expected_count",
+    (
+        ({"user__full_name": "tEST pATIENT"}, 5),
+        ({"user__full_name": "est Pat"}, 5),
+        ({"user__last_name": "%"}, 0),
+        ({"user__email": "PACJENT2@"}, 1),
+        ({"pesel": "1112314"}, 1),
+    ),
+)
+def test_search_filters_are_case_insensitive_substring_matches(
+    patient_instances, params, expected_count
+):
+    assert filter_patients(**params).count() == expected_count
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "queryset, index_name",
+    (
+        (
+            User.objects.alias(full_name=FullName()).filter(
+                full_name__ilike="Test Pat"
+            ),
+            "clinic_user_full_name_trgm",
+        ),
+        (
+            User.objects.filter(last_name__ilike="Patient"),
+            "clinic_user_last_name_trgm",
+        ),
+        (
+            Patient.objects.filter(pesel__ilike="91011112314"),
+            "clinic_patient_pesel_trgm",
+        ),
+    ),
+)
+def test_search_lookups_use_trigram_indexes(
+    patient_instances, queryset, index_name
+):
+    assert index_name in explain(queryset)
+
+
+@pytest.mark.django_db
+def test_full_name_filter_matches_indexed_expression(patient_instances):
+    queryset = filter_patients(user__full_name="Test Pat")
+
+    assert (
+        """("clinic_user"."first_name" || ' ' || "clinic_user"."last_name")"""
+        " ILIKE"
+    ) in str(queryset.query)
+    assert "clinic_user_full_name_trgm" in explain(queryset)
@@ -0,0 +1,35 @@
+import pytest
+from django.apps import apps
+from django.db import connection
+
+from clinic.fields import AutoIncrementField, NextVal
+
+
+@pytest.mark.django_db
+def test_migrations_create_sequences_for_all_auto_increment_fields():
+    sequence_names = {
+        field.get_sequence_name()
+        for model in apps.get_models()
+        for field in model._meta.concrete_fields
+        if isinstance(field, AutoIncrementField)
+    }
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT sequencename FROM pg_sequences WHERE sequencename = ANY(%s)",
+            (list(sequence_names),),
+        )
+        existing_sequences = {row[0] for row in cursor}
+
+    assert sequence_names
+    assert existing_sequences == sequence_names
+
+
+def test_auto_increment_field_deconstructs_sequence_default():
+    field = apps.get_model("clinic", "Country")._meta.get_field("readable_id")
+    _, _, _, kwargs = field.deconstruct()
+    historical_field = AutoIncrementField(sequence_default=False, unique=True)
+
+    assert kwargs["db_default"] == NextVal("clinic_country_readable_id_seq")
+    assert "sequence_default" not in kwargs
+    assert historical_field.deconstruct()[3]["sequence_default"] is False
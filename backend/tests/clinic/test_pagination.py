@@ -0,0 +1,93 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from clinic.pagination import (
+    CachedCount,
+    EstimatedCount,
+    StandardResultsSetPagination,
+)
+from clinic.roles.models import Patient
+
+
+def make_paginator(params):
+    paginator = StandardResultsSetPagination()
+    paginator.request = Request(APIRequestFactory().get("/patients/", params))
+    return paginator
+
+
+@pytest.mark.django_db
+def test_nurse_can_page_through_patients_without_count(
+    authenticated_nurse, patient_instances
+):
+    api_client, _ = authenticated_nurse
+    url = reverse("patient-list")
+    expected_ids = sorted(patient.readable_id for patient in patient_instances)
+
+    readable_ids = []
+    response = api_client.get(url, {"count": "false", "limit": 2})
+    while True:
+        assert response.status_code == status.HTTP_200_OK
+        assert "count" not in response.data
+        readable_ids += [
+            patient["readable_id"] for patient in response.data["results"]
+        ]
+        if not response.data["next"]:
+            break
+        response = api_client.get(response.data["next"])
+
+    assert readable_ids == expected_ids
+
+
+@pytest.mark.django_db
+def test_estimated_count_is_exact_below_threshold(patient_instances):
+    queryset = Patient.objects.filter(pesel=patient_instances[0].pesel)
+    strategy = EstimatedCount(threshold=10000)
+
+    assert strategy.get_count(queryset, make_paginator({})) == 1
+
+
+@pytest.mark.django_db
+def test_estimated_count_uses_planner_estimate_above_threshold(
+    patient_instances, django_assert_num_queries
+):
+    queryset = Patient.objects.filter(pesel__startswith="0")
+    strategy = EstimatedCount(threshold=-1)
+
+    # Jedno zapytanie EXPLAIN, bez COUNT(*)
+    with django_assert_num_queries(1) as context:
+        count = strategy.get_count(queryset, make_paginator({}))
+
+    assert context.captured_queries[0]["sql"].startswith("EXPLAIN")
+    assert count >= 0
+
+
+@pytest.mark.django_db
+def test_cached_count_is_shared_between_pages(
+    patient_instances, django_assert_num_queries
+):
+    queryset = Patient.objects.all()
+    strategy = CachedCount(timeout=30)
+    strategy.get_count(queryset, make_paginator({"limit": 2, "offset": 0}))
+
+    with django_assert_num_queries(0):
+        count = strategy.get_count(
+            queryset, make_paginator({"limit": 2, "offset": 2})
+        )
+
+    assert count == len(patient_instances)
+
+
+@pytest.mark.django_db
+def test_cached_count_is_keyed_by_filters(patient_instances):
+    strategy = CachedCount(timeout=30)
+    strategy.get_count(Patient.objects.all(), make_paginator({}))
+
+    count = strategy.get_count(
+        Patient.objects.filter(pk=patient_instances[0].pk),
+        make_paginator({"pesel": patient_instances[0].pesel}),
+    )
+
+    assert count == 1
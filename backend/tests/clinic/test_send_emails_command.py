@@ -0,0 +1,131 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from django.utils import timezone
+
+from clinic.choices import EmailStatus
+from clinic.models import EMAIL_MAX_ATTEMPTS, OutboxEmail
+
+TEMPLATE_NAME = "emails/reset_password.html"
+
+
+def send_emails(*args):
+    call_command("send_emails", *args, stdout=StringIO())
+
+
+@pytest.fixture
+def queued_emails():
+    return OutboxEmail.objects.bulk_create(
+        OutboxEmail(
+            subject=f"Subject {i}",
+            template_name=TEMPLATE_NAME,
+            context={"reset_password_url": f"https://example.com/{i}"},
+            to_email=f"user{i}@example.com",
+        )
+        for i in range(3)
+    )
+
+
+@pytest.mark.django_db
+def test_send_emails_renders_and_sends_queued_emails(
+    queued_emails, mailoutbox
+):
+    send_emails()
+
+    assert [(m.to, m.content_subtype) for m in mailoutbox] == [
+        ([f"user{i}@example.com"], "html") for i in range(3)
+    ]
+    assert "https://example.com/0" in mailoutbox[0].body
+    assert set(OutboxEmail.objects.values_list("status", flat=True)) == {
+        EmailStatus.SENT
+    }
+
+
+@pytest.mark.django_db
+def test_send_emails_reuses_connection(queued_emails, mocker, mailoutbox):
+    open_connection = mocker.spy(mail.backends.locmem.EmailBackend, "open")
+
+    send_emails("--batch-size", "10")
+
+    assert (open_connection.call_count, len(mailoutbox)) == (1, 3)
+
+
+@pytest.mark.django_db
+def test_send_emails_skips_emails_not_due(queued_emails, mailoutbox):
+    OutboxEmail.objects.filter(pk=queued_emails[0].pk).update(
+        next_attempt_at=timezone.now() + timedelta(minutes=5)
+    )
+
+    send_emails("--batch-size", "1")
+
+    assert len(mailoutbox) == 2
+
+
+@pytest.mark.django_db
+def test_send_emails_retries_with_backoff(queued_emails, mocker, mailoutbox):
+    mocker.patch(
+        "django.core.mail.backends.locmem.EmailBackend.send_messages",
+        side_effect=OSError("SMTP server error"),
+    )
+
+    send_emails()
+    send_emails()
+
+    email = OutboxEmail.objects.get(pk=queued_emails[0].pk)
+    assert (email.status, email.attempts, email.last_error) == (
+        EmailStatus.PENDING,
+        1,
+        "SMTP server error",
+    )
+    assert email.next_attempt_at > timezone.now() + timedelta(seconds=30)
+
+
+@pytest.mark.django_db
+def test_send_emails_marks_email_failed_after_max_attempts(
+    queued_emails, mocker
+):
+    mocker.patch(
+        "django.core.mail.backends.locmem.EmailBackend.send_messages",
+        side_effect=OSError("SMTP server error"),
+    )
+    OutboxEmail.objects.update(attempts=EMAIL_MAX_ATTEMPTS - 1)
+
+    send_emails()
+
+    assert set(OutboxEmail.objects.values_list("status", flat=True)) == {
+        EmailStatus.FAILED
+    }
+
+
+@pytest.mark.django_db
+def test_send_emails_records_result_of_each_email(
+    queued_emails, mocker, mailoutbox
+):
+    send_messages = mail.backends.locmem.EmailBackend.send_messages
+    calls = []
+
+    def send_then_crash(backend, messages):
+        calls.append(messages)
+        if len(calls) == 2:
+            raise KeyboardInterrupt
+        return send_messages(backend, messages)
+
+    mocker.patch(
+        "django.core.mail.backends.locmem.EmailBackend.send_messages",
+        send_then_crash,
+    )
+
+    with pytest.raises(KeyboardInterrupt):
+        send_emails()
+
+    # Wiadomość wysłana przed przerwaniem nie zostanie wysłana ponownie,
+    # a pozostałe są zajęte do upływu czasu zajęcia
+    assert list(
+        OutboxEmail.objects.order_by("to_email").values_list(
+            "status", flat=True
+        )
+    ) == [EmailStatus.SENT, EmailStatus.PENDING, EmailStatus.PENDING]
+    assert not OutboxEmail.objects.due().exists()
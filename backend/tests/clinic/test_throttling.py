@@ -0,0 +1,111 @@
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from rest_framework.test import APIRequestFactory
+
+from clinic.models import ThrottleCounter
+from clinic.throttling import DoctorRateThrottle, RoleRateThrottle
+
+RATES = {
+    "anon": "2/minute",
+    "user": "10/minute",
+    "doctor": "4/minute",
+    "nurse": "4/minute",
+    "patient": "3/minute",
+}
+
+
+@pytest.fixture(autouse=True)
+def throttle_rates(mocker):
+    mocker.patch.object(RoleRateThrottle, "THROTTLE_RATES", RATES)
+
+
+@pytest.fixture(autouse=True)
+def cleanup_draw(mocker):
+    # Domyślnie bez okresowego usuwania liczników
+    return mocker.patch("clinic.throttling.random.randrange", return_value=1)
+
+
+def make_request(user):
+    request = APIRequestFactory().get("/")
+    request.user = user
+    return request
+
+
+def count_allowed(throttle_class, user, attempts=10):
+    request = make_request(user)
+    return sum(
+        throttle_class().allow_request(request, None) for _ in range(attempts)
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "instances, expected_allowed",
+    (
+        ("patient_instances", 3),
+        ("doctor_instances", 4),
+        ("nurse_instances", 4),
+    ),
+)
+def test_role_rate_throttle_uses_role_rate(
+    request, instances, expected_allowed
+):
+    user = request.getfixturevalue(instances)[0].user
+
+    assert count_allowed(RoleRateThrottle, user) == expected_allowed
+
+
+@pytest.mark.django_db
+def test_role_rate_throttle_limits_anonymous_users():
+    assert count_allowed(RoleRateThrottle, AnonymousUser()) == 2
+
+
+@pytest.mark.django_db
+def test_scoped_throttle_ignores_role(patient_instances):
+    user = patient_instances[0].user
+
+    assert count_allowed(DoctorRateThrottle, user) == 4
+
+
+@pytest.mark.django_db
+def test_role_rate_throttle_counts_in_single_query(
+    patient_instances, django_assert_num_queries
+):
+    request = make_request(patient_instances[0].user)
+
+    with django_assert_num_queries(1):
+        RoleRateThrottle().allow_request(request, None)
+
+
+@pytest.mark.django_db
+def test_role_rate_throttle_resets_in_new_window(patient_instances, mocker):
+    request = make_request(patient_instances[0].user)
+    timer = mocker.patch.object(RoleRateThrottle, "timer", return_value=60.0)
+    for _ in range(3):
+        RoleRateThrottle().allow_request(request, None)
+
+    throttle = RoleRateThrottle()
+    assert not throttle.allow_request(request, None)
+    assert throttle.wait() == 60
+
+    timer.return_value = 120.0
+    assert RoleRateThrottle().allow_request(request, None)
+
+
+@pytest.mark.django_db
+def test_role_rate_throttle_deletes_expired_counters(
+    patient_instances, mocker, cleanup_draw
+):
+    ThrottleCounter.objects.create(key="throttle:anon:1", window_start=0)
+    ThrottleCounter.objects.create(key="throttle:anon:2", window_start=120)
+    mocker.patch.object(RoleRateThrottle, "timer", return_value=125.0)
+    cleanup_draw.return_value = 0
+
+    RoleRateThrottle().allow_request(
+        make_request(patient_instances[0].user), None
+    )
+
+    assert set(ThrottleCounter.objects.values_list("key", flat=True)) == {
+        "throttle:anon:2",
+        f"throttle:patient:{patient_instances[0].user.pk}",
+    }
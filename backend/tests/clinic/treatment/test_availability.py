@@ -0,0 +1,69 @@
+from datetime import datetime, time, timedelta, timezone
+
+import pytest
+
+from clinic.treatment.availability import (
+    build_windows,
+    intersect_intervals,
+    merge_intervals,
+    subtract_intervals,
+)
+
+
+def at(hour, minute=0):
+    return datetime(2030, 1, 7, hour, minute, tzinfo=timezone.utc)
+
+
+def test_merge_intervals_joins_overlapping_and_adjacent_intervals():
+    intervals = (
+        (at(11), at(12)),
+        (at(8), at(9)),
+        (at(9), at(10)),
+        (at(11, 30), at(11, 45)),
+    )
+
+    assert merge_intervals(intervals) == [
+        (at(8), at(10)),
+        (at(11), at(12)),
+    ]
+
+
+@pytest.mark.parametrize(
+    "busy, expected_free",
+    (
+        ((), [(at(8), at(16))]),
+        (((at(7), at(9)),), [(at(9), at(16))]),
+        (
+            ((at(10), at(11)), (at(12), at(13))),
+            [(at(8), at(10)), (at(11), at(12)), (at(13), at(16))],
+        ),
+        (((at(7), at(17)),), []),
+    ),
+)
+def test_subtract_intervals(busy, expected_free):
+    assert subtract_intervals([(at(8), at(16))], list(busy)) == expected_free
+
+
+def test_intersect_intervals():
+    first = [(at(8), at(10)), (at(12), at(16))]
+    second = [(at(9), at(13)), (at(15), at(17))]
+
+    assert intersect_intervals(first, second) == [
+        (at(9), at(10)),
+        (at(12), at(13)),
+        (at(15), at(16)),
+    ]
+
+
+def test_build_windows_splits_range_by_opening_hours(settings):
+    settings.TIME_ZONE = "UTC"
+    date_from = at(12)
+    date_to = at(12) + timedelta(days=2)
+
+    windows = build_windows(date_from, date_to, time(8), time(16))
+
+    assert windows == [
+        (at(12), at(16)),
+        (at(8) + timedelta(days=1), at(16) + timedelta(days=1)),
+        (at(8) + timedelta(days=2), at(12) + timedelta(days=2)),
+    ]
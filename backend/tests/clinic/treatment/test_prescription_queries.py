@@ -0,0 +1,62 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+
+@pytest.fixture
+def many_prescriptions(
+    prescription_factory,
+    prescription_instances,
+    visit_instances,
+    medicine_instances,
+):
+    return [
+        prescription_factory(
+            code=f"{2000 + i}",
+            visit=visit_instances[0],
+            description=f"Prescription {i}",
+            dosages=[
+                (medicine, 1.0, "1 raz dziennie")
+                for medicine in medicine_instances
+            ],
+        )
+        for i in range(5)
+    ]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "user_fixture", ("authenticated_doctor", "authenticated_patient")
+)
+def test_prescription_list_query_count_does_not_depend_on_dosages(
+    request, django_assert_num_queries, many_prescriptions, user_fixture
+):
+    api_client, _ = request.getfixturevalue(user_fixture)
+    url = reverse("prescription-list")
+
+    # COUNT, recepty ze złączonymi relacjami, specjalizacje lekarzy
+    # (bezpośrednio i przez wizytę), dawkowania z lekami, składniki leków
+    with django_assert_num_queries(6):
+        response = api_client.get(url, {"limit": 100})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data["results"]) > len(many_prescriptions)
+
+
+@pytest.mark.django_db
+def test_prescription_with_visit_is_represented_with_visit_participants(
+    authenticated_doctor,
+    many_prescriptions,
+    visit_instances,
+    medicine_instances,
+):
+    api_client, _ = authenticated_doctor
+    visit = visit_instances[0]
+    url = reverse("prescription-detail", args=(many_prescriptions[0].pk,))
+
+    response = api_client.get(url)
+
+    assert response.data["patient"]["id"] == str(visit.patient.pk)
+    assert response.data["doctor"]["id"] == str(visit.doctor.pk)
+    assert len(response.data["dosages"]) == len(medicine_instances)
+    assert {"name"} == set(response.data["dosages"][0]["form"])
@@ -1,6 +1,8 @@
 import uuid
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.exceptions import ErrorDetail
@@ -195,6 +197,27 @@ def test_filter_prescription(
     )
 
 
+@pytest.mark.django_db
+def test_filter_prescription_by_medicine_returns_each_prescription_once(
+    authenticated_doctor, prescription_instances, medicine_instances
+):
+    api_client, _ = authenticated_doctor
+    prescription_instances[1].dosages.create(
+        medicine=medicine_instances[2], amount=1.0, frequency="2 razy dziennie"
+    )
+
+    response = api_client.get(
+        reverse("prescription-list"),
+        data={"medicine": "ibuprofen", "ordering": "readable_id"},
+    )
+
+    ids = [prescription["id"] for prescription in response.data]
+    expected_ids = Prescription.objects.filter(
+        dosages__medicine__name__icontains="ibuprofen"
+    ).values_list("id", flat=True)
+    assert len(ids) == len(set(ids)) == len({str(pk) for pk in expected_ids})
+
+
 def test_filter_prescription_by_visit(
     authenticated_doctor, visit_instances, prescription_instances
 ):
@@ -931,3 +954,83 @@ def test_doctor_cannot_create_prescription_with_no_patient_and_doctor_data(
         status.HTTP_400_BAD_REQUEST,
         expected_response,
     )
+
+
+@pytest.mark.django_db
+def test_doctor_can_issue_prescriptions_in_batch(
+    authenticated_doctor,
+    prescription_data,
+    prescription_data_with_visit,
+    visit_instances,
+):
+    api_client, _ = authenticated_doctor
+    url = reverse("prescription-batch")
+    data = {
+        "prescriptions": [prescription_data] * 5
+        + [prescription_data_with_visit]
+    }
+
+    with CaptureQueriesContext(connection) as context:
+        response = api_client.post(url, data=data, format="json")
+
+    inserts = [
+        query["sql"]
+        for query in context.captured_queries
+        if query["sql"].startswith("INSERT")
+    ]
+
+    codes = [
+        prescription["prescription_code"] for prescription in response.data
+    ]
+    readable_ids = [
+        prescription["readable_id"] for prescription in response.data
+    ]
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert len(response.data) == 6
+    # Jedno zapytanie INSERT dla recept i jedno dla dawkowań
+    assert len(inserts) == 2
+    assert len(set(codes)) == 6
+    assert readable_ids == sorted(readable_ids)
+    assert response.data[-1]["patient"]["id"] == str(
+        visit_instances[0].patient.pk
+    )
+    assert Prescription.objects.count() == 6
+    assert all(
+        prescription["expiry_date"] is not None
+        for prescription in response.data
+    )
+
+
+@pytest.mark.django_db
+def test_batch_prescription_issuance_returns_per_item_errors(
+    authenticated_doctor, prescription_data
+):
+    api_client, _ = authenticated_doctor
+    url = reverse("prescription-batch")
+    invalid_prescription = {**prescription_data, "patient": None}
+    data = {"prescriptions": [prescription_data, invalid_prescription]}
+
+    response = api_client.post(url, data=data, format="json")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data["prescriptions"][0] == {}
+    assert response.data["prescriptions"][1]["non_field_errors"] == [
+        "Należy podać albo wizytę, albo zarówno pacjenta, jak i lekarza."
+    ]
+    assert not Prescription.objects.exists()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "user_fixture", ("authenticated_patient", "authenticated_nurse")
+)
+def test_patient_or_nurse_cannot_issue_prescriptions_in_batch(
+    request, user_fixture
+):
+    api_client, _ = request.getfixturevalue(user_fixture)
+    url = reverse("prescription-batch")
+
+    response = api_client.post(url, data={}, format="json")
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
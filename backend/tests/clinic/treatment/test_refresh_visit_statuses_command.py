@@ -0,0 +1,35 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from django.core.management import call_command
+
+from clinic.treatment.choices import VisitStatus
+from clinic.treatment.models import Visit
+
+
+@pytest.mark.django_db
+def test_refresh_visit_statuses_moves_visits_forward(visit_instances):
+    Visit.objects.update(visit_status=VisitStatus.SCHEDULED)
+
+    call_command("refresh_visit_statuses")
+
+    statuses = tuple(
+        Visit.objects.get(pk=visit.pk).visit_status
+        for visit in visit_instances
+    )
+
+    assert statuses == (
+        VisitStatus.COMPLETED,
+        VisitStatus.COMPLETED,
+        VisitStatus.IN_PROGRESS,
+        VisitStatus.COMPLETED,
+        VisitStatus.SCHEDULED,
+    )
+
+
+@pytest.mark.django_db
+def test_refresh_visit_statuses_only_touches_stale_visits(visit_instances):
+    now = datetime.now(timezone.utc)
+
+    assert Visit.objects.refresh_visit_statuses(now) == 0
+    assert Visit.objects.refresh_visit_statuses(now + timedelta(days=1)) == 2
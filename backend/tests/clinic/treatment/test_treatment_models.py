@@ -1,4 +1,13 @@
+from datetime import datetime, timedelta, timezone
+
 import pytest
+from django.db import IntegrityError, connection, transaction
+
+from clinic.treatment.managers import (
+    PRESCRIPTION_CODE_SEQUENCE,
+    PRESCRIPTION_CODE_SPACE,
+)
+from clinic.treatment.models import Prescription
 
 
 @pytest.mark.parametrize(
@@ -26,3 +35,129 @@ def test_treatment_models_str_representation(request, instances, expected_str):
         ).replace("[expiry_date]", expiry_date)
 
     assert str(instance) == expected_str
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("overlap_field", ("doctor", "office", "patient"))
+def test_database_rejects_overlapping_visits(
+    visit_factory,
+    doctor_instances,
+    patient_instances,
+    office_instances,
+    overlap_field,
+):
+    date = datetime.now(timezone.utc) + timedelta(days=3)
+    visit_factory(
+        date=date,
+        duration_in_minutes=30,
+        doctor=doctor_instances[0],
+        patient=patient_instances[0],
+        office=office_instances[0],
+    )
+
+    overlapping_visit = {
+        "doctor": doctor_instances[1],
+        "patient": patient_instances[1],
+        "office": office_instances[1],
+    }
+    overlapping_visit[overlap_field] = {
+        "doctor": doctor_instances[0],
+        "patient": patient_instances[0],
+        "office": office_instances[0],
+    }[overlap_field]
+
+    with pytest.raises(IntegrityError), transaction.atomic():
+        visit_factory(
+            date=date + timedelta(minutes=15),
+            duration_in_minutes=30,
+            **overlapping_visit,
+        )
+
+    # Wizyta zaczynająca się dokładnie w chwili zakończenia poprzedniej nie koliduje
+    visit_factory(
+        date=date + timedelta(minutes=30),
+        duration_in_minutes=30,
+        **overlapping_visit,
+    )
+
+
+@pytest.mark.django_db
+def test_allocated_prescription_codes_are_unique():
+    codes = Prescription.objects.allocate_codes(PRESCRIPTION_CODE_SPACE)
+
+    assert len(set(codes)) == PRESCRIPTION_CODE_SPACE
+    assert all(len(code) == 4 and code.isdigit() for code in codes)
+
+
+@pytest.mark.django_db
+def test_prescription_code_is_unique_only_among_active_prescriptions(
+    prescription_factory, doctor_instances, patient_instances
+):
+    prescription = prescription_factory(
+        code="1234",
+        doctor=doctor_instances[0],
+        patient=patient_instances[0],
+    )
+
+    with pytest.raises(IntegrityError), transaction.atomic():
+        prescription_factory(
+            code="1234",
+            doctor=doctor_instances[1],
+            patient=patient_instances[1],
+        )
+
+    # Po wygaśnięciu recepty jej kod może zostać ponownie wykorzystany
+    expired_on = prescription.issue_date - timedelta(days=1)
+    Prescription.objects.filter(pk=prescription.pk).update(
+        issue_date=expired_on - timedelta(days=30), expiry_date=expired_on
+    )
+    prescription_factory(
+        code="1234",
+        doctor=doctor_instances[1],
+        patient=patient_instances[1],
+    )
+
+
+@pytest.mark.django_db
+def test_prescription_skips_code_used_by_active_prescription(
+    mocker, prescription_factory, doctor_instances, patient_instances
+):
+    prescription_factory(
+        code="1234",
+        doctor=doctor_instances[0],
+        patient=patient_instances[0],
+    )
+    allocate_codes = mocker.patch.object(
+        Prescription.objects,
+        "allocate_codes",
+        side_effect=(["1234"], ["5678"]),
+    )
+
+    prescription = Prescription.objects.create(
+        doctor=doctor_instances[1], patient=patient_instances[1]
+    )
+
+    assert prescription.prescription_code == "5678"
+    assert allocate_codes.call_count == 2
+
+
+def get_prescription_code_sequence_value():
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT last_value FROM {PRESCRIPTION_CODE_SEQUENCE}")
+        return cursor.fetchone()[0]
+
+
+@pytest.mark.django_db
+def test_prescription_save_allocates_single_code(
+    doctor_instances, patient_instances
+):
+    Prescription.objects.allocate_codes()
+    last_value = get_prescription_code_sequence_value()
+
+    Prescription.objects.create(
+        doctor=doctor_instances[0], patient=patient_instances[0]
+    )
+
+    assert get_prescription_code_sequence_value() == (
+        (last_value + 1) % PRESCRIPTION_CODE_SPACE
+    )
@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+
+@pytest.fixture
+def many_visits(
+    visit_factory,
+    visit_instances,
+    disease_instances,
+    doctor_instances,
+    patient_instances,
+    office_instances,
+):
+    start = datetime.now(timezone.utc) + timedelta(days=3)
+    return [
+        visit_factory(
+            date=start + timedelta(hours=i),
+            duration_in_minutes=30,
+            doctor=doctor_instances[0],
+            patient=patient_instances[0],
+            office=office_instances[i % len(office_instances)],
+            disease=disease_instances[i % len(disease_instances)],
+        )
+        for i in range(10)
+    ]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "user_fixture",
+    ("authenticated_nurse", "authenticated_doctor", "authenticated_patient"),
+)
+def test_visit_list_query_count_does_not_depend_on_page_size(
+    request, django_assert_num_queries, many_visits, user_fixture
+):
+    api_client, _ = request.getfixturevalue(user_fixture)
+    url = reverse("visit-list")
+
+    # EXPLAIN (szacunek liczby wizyt poniżej progu), COUNT, wizyty
+    # ze złączonymi relacjami, specjalizacje lekarzy
+    with django_assert_num_queries(4):
+        response = api_client.get(url, {"limit": 100})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data["results"]) >= len(many_visits)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "user_fixture",
+    ("authenticated_nurse", "authenticated_doctor", "authenticated_patient"),
+)
+def test_visit_retrieve_query_count(
+    request, django_assert_num_queries, many_visits, user_fixture
+):
+    api_client, _ = request.getfixturevalue(user_fixture)
+    url = reverse("visit-detail", args=(many_visits[0].pk,))
+
+    with django_assert_num_queries(2):
+        response = api_client.get(url)
+
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "user_fixture, scope_column",
+    (
+        ("authenticated_doctor", "doctor_id"),
+        ("authenticated_patient", "patient_id"),
+    ),
+)
+def test_visit_list_is_scoped_by_profile_foreign_key(
+    request, many_visits, user_fixture, scope_column
+):
+    api_client, profile = request.getfixturevalue(user_fixture)
+
+    with CaptureQueriesContext(connection) as context:
+        response = api_client.get(reverse("visit-list"))
+
+    visits_query = context.captured_queries[0]["sql"]
+    assert response.status_code == status.HTTP_200_OK
+    assert (
+        f'WHERE "clinic_visit"."{scope_column}" = \'{profile.pk}\''
+        in visits_query
+    )
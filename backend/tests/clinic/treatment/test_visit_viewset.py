@@ -1,3 +1,5 @@
+import base64
+import json
 import uuid
 from datetime import datetime, timedelta, timezone
 from urllib.parse import parse_qsl
@@ -8,6 +10,11 @@ from django.utils.translation import gettext as _
 from rest_framework import status
 from rest_framework.exceptions import ErrorDetail
 
+from clinic.roles.models import Doctor
+from clinic.treatment.choices import VisitStatus
+from clinic.treatment.models import Visit
+from clinic.treatment.serializers import VisitWriteSerializer
+
 FIELD_TRANSLATIONS = {
     "doctor": _("Lekarz"),
     "patient": _("Pacjent"),
@@ -851,3 +858,285 @@ def test_nurse_cannot_create_or_update_visit_with_too_long_notes(
         status.HTTP_400_BAD_REQUEST,
         expected_response,
     )
+
+
+@pytest.mark.django_db
+def test_visit_status_is_computed_from_time_when_stored_status_is_stale(
+    authenticated_nurse, visit_instances
+):
+    api_client, _ = authenticated_nurse
+    Visit.objects.update(visit_status=VisitStatus.SCHEDULED)
+
+    url = reverse("visit-list")
+    response = api_client.get(
+        f"{url}?visit_status={VisitStatus.COMPLETED}&ordering=readable_id"
+    )
+
+    assert (
+        response.status_code,
+        [visit["id"] for visit in response.data],
+        {visit["visit_status"] for visit in response.data},
+    ) == (
+        status.HTTP_200_OK,
+        [str(visit_instances[i].pk) for i in (0, 1, 3)],
+        {VisitStatus.COMPLETED},
+    )
+
+
+@pytest.mark.django_db
+def test_nurse_can_order_visits_by_computed_status(
+    authenticated_nurse, visit_instances
+):
+    api_client, _ = authenticated_nurse
+    Visit.objects.update(visit_status=VisitStatus.SCHEDULED)
+
+    url = reverse("visit-list")
+    response = api_client.get(f"{url}?ordering=-visit_status,readable_id")
+
+    assert (
+        response.status_code,
+        [visit["visit_status"] for visit in response.data],
+    ) == (
+        status.HTTP_200_OK,
+        [
+            VisitStatus.SCHEDULED,
+            VisitStatus.IN_PROGRESS,
+            VisitStatus.COMPLETED,
+            VisitStatus.COMPLETED,
+            VisitStatus.COMPLETED,
+        ],
+    )
+
+
+@pytest.mark.django_db
+def test_concurrent_overlapping_visit_is_rejected_by_database(
+    authenticated_nurse, visit_data, mocker
+):
+    api_client, _ = authenticated_nurse
+    url = reverse("visit-list")
+    api_client.post(url, data=visit_data, format="json")
+
+    # Symulacja wyścigu: druga rezerwacja przechodzi walidację serializera
+    mocker.patch.object(
+        VisitWriteSerializer, "validate", side_effect=lambda data: data
+    )
+    response = api_client.post(url, data=visit_data, format="json")
+
+    expected_error = ErrorDetail(
+        string="Lekarz ma nakładającą się wizytę.", code="invalid"
+    )
+    expected_response = {"non_field_errors": [expected_error]}
+
+    assert (response.status_code, response.data) == (
+        status.HTTP_400_BAD_REQUEST,
+        expected_response,
+    )
+
+
+@pytest.mark.django_db
+def test_nurse_can_find_free_visit_slots(
+    authenticated_nurse, visit_factory, patient_instances, office_instances
+):
+    api_client, _ = authenticated_nurse
+    doctor = Doctor.objects.get(specializations__name="Kardiologia")
+    office = office_instances[5]
+    day = (datetime.now(timezone.utc) + timedelta(days=2)).replace(
+        hour=8, minute=0, second=0, microsecond=0
+    )
+    visit_factory(
+        date=day + timedelta(hours=1),
+        duration_in_minutes=60,
+        doctor=doctor,
+        patient=patient_instances[0],
+        office=office_instances[0],
+    )
+
+    url = reverse("visit-availability")
+    response = api_client.get(
+        url,
+        {
+            "date_from": day.isoformat(),
+            "date_to": (day + timedelta(hours=4)).isoformat(),
+            "duration_in_minutes": 30,
+            "specialization": "Kardiologia",
+            "office_type": "Kardiologiczny",
+        },
+    )
+
+    expected_slots = [
+        (day, day + timedelta(hours=1)),
+        (day + timedelta(hours=2), day + timedelta(hours=4)),
+    ]
+    slots = [
+        (
+            datetime.fromisoformat(slot["start"]),
+            datetime.fromisoformat(slot["end"]),
+        )
+        for slot in response.data
+    ]
+
+    assert response.status_code == status.HTTP_200_OK
+    assert slots == expected_slots
+    assert {slot["doctor"] for slot in response.data} == {str(doctor.pk)}
+    assert {slot["office"] for slot in response.data} == {str(office.pk)}
+
+
+@pytest.mark.django_db
+def test_free_visit_slots_respect_duration_and_patient_visits(
+    authenticated_nurse, visit_factory, patient_instances, office_instances
+):
+    api_client, _ = authenticated_nurse
+    doctor = Doctor.objects.get(specializations__name="Kardiologia")
+    other_doctor = Doctor.objects.exclude(pk=doctor.pk).first()
+    patient = patient_instances[1]
+    day = (datetime.now(timezone.utc) + timedelta(days=2)).replace(
+        hour=8, minute=0, second=0, microsecond=0
+    )
+    visit_factory(
+        date=day + timedelta(minutes=30),
+        duration_in_minutes=60,
+        doctor=other_doctor,
+        patient=patient,
+        office=office_instances[0],
+    )
+
+    url = reverse("visit-availability")
+    response = api_client.get(
+        url,
+        {
+            "date_from": day.isoformat(),
+            "date_to": (day + timedelta(hours=4)).isoformat(),
+            "duration_in_minutes": 60,
+            "specialization": "Kardiologia",
+            "office_type": "Kardiologiczny",
+            "patient": patient.pk,
+        },
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [
+        datetime.fromisoformat(slot["start"]) for slot in response.data
+    ] == [day + timedelta(minutes=90)]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "params, expected_error",
+    (
+        (
+            {"date_from": "2030-01-02T10:00Z", "date_to": "2030-01-01T10:00Z"},
+            "Data początkowa musi być wcześniejsza niż data końcowa.",
+        ),
+        (
+            {"date_from": "2030-01-01T10:00Z", "date_to": "2030-03-01T10:00Z"},
+            "Zakres wyszukiwania nie może przekraczać 31 dni.",
+        ),
+    ),
+)
+def test_free_visit_slots_invalid_range(
+    authenticated_nurse, params, expected_error
+):
+    api_client, _ = authenticated_nurse
+    response = api_client.get(reverse("visit-availability"), params)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data["non_field_errors"] == [expected_error]
+
+
+@pytest.mark.django_db
+def test_patient_cannot_search_free_visit_slots(authenticated_patient):
+    api_client, _ = authenticated_patient
+    response = api_client.get(reverse("visit-availability"))
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("ordering", ("date", "-date", "-readable_id"))
+def test_nurse_can_page_through_visits_with_cursor(
+    authenticated_nurse, visit_instances, ordering
+):
+    api_client, _ = authenticated_nurse
+    url = reverse("visit-list")
+    expected_ids = list(
+        Visit.objects.order_by(ordering, "readable_id").values_list(
+            "readable_id", flat=True
+        )
+    )
+
+    pages = []
+    response = api_client.get(
+        url, {"pagination": "cursor", "limit": 2, "ordering": ordering}
+    )
+    while True:
+        assert response.status_code == status.HTTP_200_OK
+        pages.append(
+            [visit["readable_id"] for visit in response.data["results"]]
+        )
+        if not response.data["next"]:
+            break
+        response = api_client.get(response.data["next"])
+
+    assert sum(pages, []) == expected_ids
+
+    # Powrót do poprzedniej strony zwraca te same rekordy
+    response = api_client.get(response.data["previous"])
+    assert [visit["readable_id"] for visit in response.data["results"]] == (
+        pages[-2]
+    )
+
+
+@pytest.mark.django_db
+def test_visit_cursor_pagination_rejects_unsupported_ordering(
+    authenticated_nurse, visit_instances
+):
+    api_client, _ = authenticated_nurse
+    url = reverse("visit-list")
+    response = api_client.get(
+        url, {"pagination": "cursor", "ordering": "office__name"}
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data["ordering"] == [
+        "Paginacja kursorowa nie obsługuje sortowania po polu office__name."
+    ]
+
+
+@pytest.mark.django_db
+def test_visit_cursor_is_rejected_for_different_ordering(
+    authenticated_nurse, visit_instances
+):
+    api_client, _ = authenticated_nurse
+    url = reverse("visit-list")
+    response = api_client.get(
+        url, {"pagination": "cursor", "limit": 2, "ordering": "date"}
+    )
+
+    response = api_client.get(response.data["next"] + "&ordering=-date")
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "values",
+    (
+        ("not-a-date", 1),
+        ("2025-12-01T10:00:00+01:00", "x"),
+        ("2025-12-01T10:00:00+01:00", None),
+        (None, None),
+    ),
+)
+def test_visit_cursor_with_invalid_values_is_rejected(
+    authenticated_nurse, visit_instances, values
+):
+    api_client, _ = authenticated_nurse
+    payload = {"o": ["date", "readable_id"], "v": values, "r": False}
+    cursor = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+    response = api_client.get(
+        reverse("visit-list"),
+        {"cursor": cursor, "limit": 2, "ordering": "date"},
+    )
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND